@@ -0,0 +1,59 @@
+"""Add store sales rollup tables
+
+Revision ID: 3f1a9c2d7b10
+Revises:
+Create Date: 2025-03-01 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+order_status = postgresql.ENUM(
+    'PENDING', 'CONFIRMED', 'PREPARING', 'ON_THE_WAY', 'DELIVERED', 'CANCELLED',
+    name='orderstatus',
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    order_status.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'store_daily_sales',
+        sa.Column('store_id', sa.Uuid(), sa.ForeignKey('stores.id'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('status', order_status, nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('subtotal', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('delivery_fee', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('discount_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('total', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('store_id', 'day', 'status'),
+    )
+
+    op.create_table(
+        'store_product_daily_sales',
+        sa.Column('store_id', sa.Uuid(), sa.ForeignKey('stores.id'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_id', sa.Uuid(), sa.ForeignKey('products.id'), nullable=False),
+        sa.Column('product_name', sa.String(length=100), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('revenue', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('store_id', 'day', 'product_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('store_product_daily_sales')
+    op.drop_table('store_daily_sales')
@@ -0,0 +1,46 @@
+"""Add id to the store listing index
+
+Revision ID: a6c9e2d4b715
+Revises: f3b8d1a6c2e4
+Create Date: 2025-04-12 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c9e2d4b715'
+down_revision: Union[str, None] = 'f3b8d1a6c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The listing orders by (rating DESC, id); build the new index before
+    # dropping the old one so the listing is never left without an index.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_stores_listing_rating_id', 'stores', [sa.text('rating DESC'), 'id'],
+            postgresql_where=sa.text('is_active AND is_approved'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_stores_listing_rating', table_name='stores',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_stores_listing_rating', 'stores', [sa.text('rating DESC')],
+            postgresql_where=sa.text('is_active AND is_approved'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_stores_listing_rating_id', table_name='stores',
+            postgresql_concurrently=True, if_exists=True
+        )
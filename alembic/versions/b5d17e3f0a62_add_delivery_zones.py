@@ -0,0 +1,36 @@
+"""Add delivery_zones table
+
+Revision ID: b5d17e3f0a62
+Revises: 8c4e2b7a91d3
+Create Date: 2025-03-15 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d17e3f0a62'
+down_revision: Union[str, None] = '8c4e2b7a91d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'delivery_zones',
+        sa.Column('id', sa.Uuid(), primary_key=True),
+        sa.Column('store_id', sa.Uuid(), sa.ForeignKey('stores.id'), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('polygon', sa.JSON(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_delivery_zones_store_id', 'delivery_zones', ['store_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_delivery_zones_store_id', table_name='delivery_zones')
+    op.drop_table('delivery_zones')
@@ -0,0 +1,58 @@
+"""Add indexes for store listings, approval queue, exports and dispatch
+
+Revision ID: d41e7c9a5b28
+Revises: b5d17e3f0a62
+Create Date: 2025-03-22 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7c9a5b28'
+down_revision: Union[str, None] = 'b5d17e3f0a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Emails are lowercased on write and compared as-is, so the existing unique
+# constraints on users.email, stores.owner_email and admins.email already
+# index every login and registration lookup.
+INDEXES = [
+    dict(
+        index_name='ix_stores_listing_rating', table_name='stores',
+        columns=[sa.text('rating DESC')],
+        postgresql_where=sa.text('is_active AND is_approved'),
+    ),
+    dict(
+        index_name='ix_stores_pending_created_at', table_name='stores',
+        columns=[sa.text('created_at DESC')],
+        postgresql_where=sa.text('is_active AND NOT is_approved'),
+    ),
+    dict(index_name='ix_orders_created_at', table_name='orders', columns=['created_at']),
+    dict(index_name='ix_orders_store_id_created_at', table_name='orders', columns=['store_id', 'created_at']),
+    dict(
+        index_name='ix_orders_preparing_store_id', table_name='orders',
+        columns=['store_id'],
+        postgresql_where=sa.text("status = 'PREPARING'"),
+    ),
+    dict(index_name='ix_order_items_order_id', table_name='order_items', columns=['order_id']),
+]
+
+
+def upgrade() -> None:
+    # Build without blocking writes on live tables.
+    with op.get_context().autocommit_block():
+        for index in INDEXES:
+            op.create_index(**index, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index in reversed(INDEXES):
+            op.drop_index(
+                index['index_name'], table_name=index['table_name'],
+                postgresql_concurrently=True, if_exists=True
+            )
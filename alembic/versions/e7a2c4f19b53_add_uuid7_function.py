@@ -0,0 +1,46 @@
+"""Add uuid7() SQL function and cascade order id updates to order_items
+
+Revision ID: e7a2c4f19b53
+Revises: d41e7c9a5b28
+Create Date: 2025-03-29 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c4f19b53'
+down_revision: Union[str, None] = 'd41e7c9a5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# New rows get UUIDv7 keys from the application. Existing uuid4 keys stay
+# valid; `python -m app.cli ids-rekey` rewrites them with uuid7(created_at).
+UUID7_FUNCTION = """
+CREATE OR REPLACE FUNCTION uuid7(ts timestamptz DEFAULT clock_timestamp()) RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(set_bit(
+            overlay(uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM ts) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6),
+            52, 1), 53, 1),
+        'hex')::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+
+
+def upgrade() -> None:
+    op.execute(UUID7_FUNCTION)
+    op.drop_constraint('order_items_order_id_fkey', 'order_items', type_='foreignkey')
+    op.create_foreign_key(
+        'order_items_order_id_fkey', 'order_items', 'orders',
+        ['order_id'], ['id'], onupdate='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('order_items_order_id_fkey', 'order_items', type_='foreignkey')
+    op.create_foreign_key('order_items_order_id_fkey', 'order_items', 'orders', ['order_id'], ['id'])
+    op.execute('DROP FUNCTION IF EXISTS uuid7(timestamptz)')
@@ -0,0 +1,121 @@
+"""Partition orders and order_items by created_at month
+
+Revision ID: f3b8d1a6c2e4
+Revises: e7a2c4f19b53
+Create Date: 2025-04-05 10:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1a6c2e4'
+down_revision: Union[str, None] = 'e7a2c4f19b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('orders', 'order_items')
+MONTHS_AHEAD = 3
+
+# Unique constraints on a partitioned table must include the partition key,
+# so both primary keys become (id, created_at) and order_number is unique per
+# created_at. order_items can no longer reference orders with a foreign key.
+PARENT_DDL = [
+    'ALTER TABLE orders ADD PRIMARY KEY (id, created_at)',
+    'ALTER TABLE orders ADD CONSTRAINT orders_order_number_key UNIQUE (order_number, created_at)',
+    'ALTER TABLE orders ADD FOREIGN KEY (user_id) REFERENCES users (id)',
+    'ALTER TABLE orders ADD FOREIGN KEY (store_id) REFERENCES stores (id)',
+    'ALTER TABLE orders ADD FOREIGN KEY (address_id) REFERENCES addresses (id)',
+    'CREATE INDEX ix_orders_created_at ON orders (created_at)',
+    'CREATE INDEX ix_orders_store_id_created_at ON orders (store_id, created_at)',
+    "CREATE INDEX ix_orders_preparing_store_id ON orders (store_id) WHERE status = 'PREPARING'",
+    'ALTER TABLE order_items ADD PRIMARY KEY (id, created_at)',
+    'ALTER TABLE order_items ADD FOREIGN KEY (product_id) REFERENCES products (id)',
+    'CREATE INDEX ix_order_items_order_id ON order_items (order_id)',
+]
+
+PLAIN_DDL = [
+    'ALTER TABLE orders ADD PRIMARY KEY (id)',
+    'ALTER TABLE orders ADD CONSTRAINT orders_order_number_key UNIQUE (order_number)',
+    'ALTER TABLE orders ADD FOREIGN KEY (user_id) REFERENCES users (id)',
+    'ALTER TABLE orders ADD FOREIGN KEY (store_id) REFERENCES stores (id)',
+    'ALTER TABLE orders ADD FOREIGN KEY (address_id) REFERENCES addresses (id)',
+    'CREATE INDEX ix_orders_created_at ON orders (created_at)',
+    'CREATE INDEX ix_orders_store_id_created_at ON orders (store_id, created_at)',
+    "CREATE INDEX ix_orders_preparing_store_id ON orders (store_id) WHERE status = 'PREPARING'",
+    'ALTER TABLE order_items ADD PRIMARY KEY (id)',
+    # NOT VALID: items can outlive their order when an archived month split
+    # an order and its items across partitions.
+    'ALTER TABLE order_items ADD CONSTRAINT order_items_order_id_fkey '
+    'FOREIGN KEY (order_id) REFERENCES orders (id) ON UPDATE CASCADE NOT VALID',
+    'ALTER TABLE order_items ADD FOREIGN KEY (product_id) REFERENCES products (id)',
+    'CREATE INDEX ix_order_items_order_id ON order_items (order_id)',
+]
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    op.execute('LOCK TABLE orders, order_items IN ACCESS EXCLUSIVE MODE')
+
+    # Items inherit their order's timestamp when they lack one.
+    op.execute("""
+        UPDATE order_items AS i SET created_at = o.created_at
+        FROM orders AS o
+        WHERE i.order_id = o.id AND i.created_at IS NULL
+    """)
+    for table in TABLES:
+        op.execute(f'UPDATE {table} SET created_at = now() WHERE created_at IS NULL')
+
+    oldest = connection.execute(sa.text(
+        "SELECT min(created_at) AT TIME ZONE 'UTC' FROM "
+        "(SELECT created_at FROM orders UNION ALL SELECT created_at FROM order_items) AS t"
+    )).scalar()
+    today = date.today().replace(day=1)
+    month = (oldest.date().replace(day=1) if oldest else today)
+
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_unpartitioned')
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (created_at)'
+        )
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL')
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    end = _add_months(today, MONTHS_AHEAD + 1)
+    while month < end:
+        following = _add_months(month, 1)
+        for table in TABLES:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}T00:00:00+00:00') TO ('{following}T00:00:00+00:00')"
+            )
+        month = following
+
+    for table in TABLES:
+        op.execute(f'INSERT INTO {table} SELECT * FROM {table}_unpartitioned')
+    op.execute('DROP TABLE order_items_unpartitioned, orders_unpartitioned')
+
+    for statement in PARENT_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute('LOCK TABLE orders, order_items IN ACCESS EXCLUSIVE MODE')
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_partitioned')
+        op.execute(f'CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)')
+        op.execute(f'INSERT INTO {table} SELECT * FROM {table}_partitioned')
+    op.execute('DROP TABLE order_items_partitioned, orders_partitioned CASCADE')
+
+    for statement in PLAIN_DDL:
+        op.execute(statement)
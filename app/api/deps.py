@@ -1,29 +1,82 @@
+import asyncio
+from contextvars import ContextVar
 from typing import Generator, Optional, Union
-from fastapi import Depends, HTTPException, status
+from uuid import UUID
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import fastpath
 from app.core.config import settings
-from app.core.database import get_session
+from app.core.database import get_read_session, get_session, get_store_session, shard_router
 from app.core.security import verify_token
+from app.middleware.consistency import wants_primary
 from app.models import User, Store, Admin
+from app.repositories import PostgresRepository, Repository
 
 
 security = HTTPBearer()
 
 
+class SharedAuth:
+    """Token checks and principal loads shared by the sub-requests of one batch.
+
+    Set through ``shared_auth`` by ``POST /batch``; concurrent sub-requests
+    for the same principal wait on a single load.
+    """
+
+    def __init__(self) -> None:
+        self._payloads: dict[str, Optional[dict]] = {}
+        self._principals: dict[tuple, asyncio.Future] = {}
+
+    def verify(self, token: str) -> Optional[dict]:
+        if token not in self._payloads:
+            self._payloads[token] = verify_token(token)
+        return self._payloads[token]
+
+    async def principal(self, model, principal_id: UUID, load):
+        key = (model, principal_id)
+        future = self._principals.get(key)
+        if future is None:
+            future = self._principals[key] = asyncio.ensure_future(load())
+        return await asyncio.shield(future)
+
+
+shared_auth: ContextVar[Optional[SharedAuth]] = ContextVar("shared_auth", default=None)
+
+
 async def get_db() -> Generator[AsyncSession, None, None]:
     """Get database session dependency."""
     async for session in get_session():
         yield session
 
 
+async def get_repository(db: AsyncSession = Depends(get_db)) -> Repository:
+    """Get the user/store/admin repository for this request."""
+    return PostgresRepository(db)
+
+
+async def get_read_db(request: Request) -> Generator[AsyncSession, None, None]:
+    """Get a read-only database session, served by a replica when available.
+
+    Use only in handlers that do not write. Clients that just wrote (or ask
+    for strong consistency) are kept on the primary.
+    """
+    if wants_primary(request.headers, request.cookies):
+        sessions = get_session()
+    else:
+        sessions = get_read_session()
+    async for session in sessions:
+        yield session
+
+
 async def get_current_user_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> tuple[str, str]:
     """Get current user from JWT token."""
     token = credentials.credentials
-    payload = verify_token(token)
+    shared = shared_auth.get()
+    payload = shared.verify(token) if shared is not None else verify_token(token)
 
     if payload is None:
         raise HTTPException(
@@ -44,6 +97,34 @@ async def get_current_user_token(
     return user_id, role
 
 
+async def load_principal(db: AsyncSession, model, principal_id: str):
+    """Load the token's user, store or admin row; ``None`` if it does not exist."""
+    try:
+        principal_id = UUID(principal_id)
+    except ValueError:
+        return None
+    shared = shared_auth.get()
+    if shared is not None:
+        return await shared.principal(model, principal_id, lambda: _fetch_detached(db, model, principal_id))
+    return await _fetch_principal(db, model, principal_id)
+
+
+async def _fetch_detached(db: AsyncSession, model, principal_id: UUID):
+    """Load a principal that sub-requests on other sessions can share."""
+    principal = await _fetch_principal(db, model, principal_id)
+    if principal is not None and principal in db:
+        # Otherwise it stays bound to the first sub-request's session, which
+        # may be in use by that request or already closed
+        db.expunge(principal)
+    return principal
+
+
+async def _fetch_principal(db: AsyncSession, model, principal_id: UUID):
+    if settings.DB_FAST_PATH:
+        return await fastpath.fetch_principal(db, model, principal_id)
+    return await db.get(model, principal_id)
+
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token_data: tuple[str, str] = Depends(get_current_user_token),
@@ -57,7 +138,7 @@ async def get_current_user(
             detail="Not enough permissions"
         )
 
-    user = await db.get(User, user_id)
+    user = await load_principal(db, User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,7 +167,7 @@ async def get_current_store(
             detail="Not enough permissions"
         )
 
-    store = await db.get(Store, user_id)
+    store = await load_principal(db, Store, user_id)
     if store is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -121,7 +202,7 @@ async def get_current_admin(
             detail="Not enough permissions"
         )
 
-    admin = await db.get(Admin, user_id)
+    admin = await load_principal(db, Admin, user_id)
     if admin is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -137,6 +218,36 @@ async def get_current_admin(
     return admin
 
 
+async def get_store_db(
+    current_store: Store = Depends(get_current_store),
+) -> Generator[AsyncSession, None, None]:
+    """Get a session on the current store's shard (its orders, products and carts)."""
+    async for session in get_store_session(current_store.id):
+        yield session
+
+
+def _store_read_sessions(request: Request, store_id: UUID):
+    # Shards have no replicas of their own.
+    if shard_router:
+        return get_store_session(store_id)
+    return get_read_db(request)
+
+
+async def get_store_read_db(
+    request: Request,
+    current_store: Store = Depends(get_current_store),
+) -> Generator[AsyncSession, None, None]:
+    """Read-only session for the current store's data (see ``get_read_db``)."""
+    async for session in _store_read_sessions(request, current_store.id):
+        yield session
+
+
+async def get_read_db_for_store(request: Request, store_id: UUID) -> Generator[AsyncSession, None, None]:
+    """Read-only session for the data of the ``store_id`` path parameter."""
+    async for session in _store_read_sessions(request, store_id):
+        yield session
+
+
 async def get_current_active_user(
     db: AsyncSession = Depends(get_db),
     token_data: tuple[str, str] = Depends(get_current_user_token),
@@ -145,17 +256,17 @@ async def get_current_active_user(
     user_id, role = token_data
 
     if role == "client":
-        user = await db.get(User, user_id)
+        user = await load_principal(db, User, user_id)
         if not user or not user.is_active:
             raise HTTPException(status_code=404, detail="User not found or inactive")
         return user
     elif role == "store":
-        store = await db.get(Store, user_id)
+        store = await load_principal(db, Store, user_id)
         if not store or not store.is_active or not store.is_approved:
             raise HTTPException(status_code=404, detail="Store not found or inactive")
         return store
     elif role in ["admin", "superadmin"]:
-        admin = await db.get(Admin, user_id)
+        admin = await load_principal(db, Admin, user_id)
         if not admin or not admin.is_active:
             raise HTTPException(status_code=404, detail="Admin not found or inactive")
         return admin
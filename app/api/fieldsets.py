@@ -0,0 +1,60 @@
+"""Sparse fieldsets: ``?fields=store_name,image,rating`` on read endpoints.
+
+A fieldset dependency validates the requested names against the response
+model's fields and hands the endpoint a tuple of columns (``id`` always
+included), or ``None`` when the full model was asked for. Endpoints use it
+to narrow their SQL projection and answer through ``sparse_response``.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+
+ALWAYS_INCLUDED = ("id",)
+
+
+def fieldset(model: type[BaseModel]) -> Callable[..., Optional[tuple[str, ...]]]:
+    """Dependency parsing ``fields`` against the fields of ``model``."""
+    allowed = tuple(model.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description=f"Comma-separated subset of: {', '.join(allowed)}"
+        )
+    ) -> Optional[tuple[str, ...]]:
+        if fields is None:
+            return None
+
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+        requested.update(name for name in ALWAYS_INCLUDED if name in allowed)
+        if len(requested) == len(allowed):
+            return None
+        # Model order, so each distinct fieldset is one SQL shape
+        return tuple(name for name in allowed if name in requested)
+
+    return dependency
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """``model`` narrowed to ``fields``; reads rows, mappings or ORM objects."""
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, ...) for name in fields}
+    )
+
+
+def sparse_response(model: type[BaseModel], fields: tuple[str, ...], envelope: Any, **content: Any) -> ORJSONResponse:
+    """Serialize ``content`` with ``envelope`` (``Envelope``, ``Page``) over the narrowed model."""
+    body = envelope[partial_model(model, fields)].model_validate(content)
+    return ORJSONResponse(body.model_dump(mode="json"))
@@ -1,8 +1,13 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, stores
+from app.api.v1.endpoints import auth, stores, orders, reports, dispatch, batch, profiles
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(stores.router, prefix="/stores", tags=["stores"])
\ No newline at end of file
+api_router.include_router(stores.router, prefix="/stores", tags=["stores"])
+api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
+api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_router.include_router(dispatch.router, prefix="/dispatch", tags=["dispatch"])
+api_router.include_router(batch.router, tags=["batch"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
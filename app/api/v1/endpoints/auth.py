@@ -1,37 +1,30 @@
 from datetime import timedelta
-from typing import Any
+from typing import Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_repository, get_current_active_user
 from app.core.config import settings
 from app.core.security import create_access_token, verify_password, get_password_hash
 from app.models import (
-    User, UserCreate, UserLogin,
-    Store, StoreCreate, StoreLogin,
-    Admin, AdminLogin
+    User, UserCreate, UserLogin, UserAuth, UserResponse,
+    Store, StoreCreate, StoreLogin, StoreAuth, StoreRegistration, StoreResponse,
+    Admin, AdminLogin, AdminAuth, AdminResponse,
+    Envelope, MessageEnvelope
 )
+from app.repositories import Repository
 
 router = APIRouter()
 
+PROFILE_MODELS = {User: UserResponse, Store: StoreResponse, Admin: AdminResponse}
 
-@router.post("/client/register", response_model=dict[str, Any])
+
+@router.post("/client/register", response_model=MessageEnvelope[UserAuth])
 async def register_client(
     user_data: UserCreate,
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Register a new client."""
-    # Check if email already exists
-    result = await db.execute(select(User).where(User.email == user_data.email.lower()))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
-    # Create user
     user = User(
         name=user_data.name,
         email=user_data.email.lower(),
@@ -40,9 +33,12 @@ async def register_client(
         password=get_password_hash(user_data.password)
     )
 
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    user = await repository.add_user(user)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -55,25 +51,19 @@ async def register_client(
         "success": True,
         "message": "Usuario registrado exitosamente",
         "data": {
-            "user": {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "phone": user.phone
-            },
+            "user": user,
             "token": access_token
         }
     }
 
 
-@router.post("/client/login", response_model=dict[str, Any])
+@router.post("/client/login", response_model=MessageEnvelope[UserAuth])
 async def login_client(
     login_data: UserLogin,
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Login client user."""
-    result = await db.execute(select(User).where(User.email == login_data.email.lower()))
-    user = result.scalar_one_or_none()
+    user = await repository.get_user_by_email(login_data.email.lower())
 
     if not user or not verify_password(login_data.password, user.password):
         raise HTTPException(
@@ -98,32 +88,18 @@ async def login_client(
         "success": True,
         "message": "Login exitoso",
         "data": {
-            "user": {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "phone": user.phone,
-                "profile_image": user.profile_image
-            },
+            "user": user,
             "token": access_token
         }
     }
 
 
-@router.post("/store/register", response_model=dict[str, Any])
+@router.post("/store/register", response_model=MessageEnvelope[StoreRegistration])
 async def register_store(
     store_data: StoreCreate,
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Register a new store."""
-    # Check if email already exists
-    result = await db.execute(select(Store).where(Store.owner_email == store_data.owner_email.lower()))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
     # Create store (pending approval)
     store = Store(
         owner_name=store_data.owner_name,
@@ -143,32 +119,29 @@ async def register_store(
         is_approved=False
     )
 
-    db.add(store)
-    await db.commit()
-    await db.refresh(store)
+    store = await repository.add_store(store)
+    if store is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     return {
         "success": True,
         "message": "Tienda registrada. Pendiente de aprobación por el administrador.",
         "data": {
-            "store": {
-                "id": store.id,
-                "store_name": store.store_name,
-                "owner_email": store.owner_email,
-                "is_approved": store.is_approved
-            }
+            "store": store
         }
     }
 
 
-@router.post("/store/login", response_model=dict[str, Any])
+@router.post("/store/login", response_model=MessageEnvelope[StoreAuth])
 async def login_store(
     login_data: StoreLogin,
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Login store user."""
-    result = await db.execute(select(Store).where(Store.owner_email == login_data.email.lower()))
-    store = result.scalar_one_or_none()
+    store = await repository.get_store_by_email(login_data.email.lower())
 
     if not store or not verify_password(login_data.password, store.password):
         raise HTTPException(
@@ -199,34 +172,19 @@ async def login_store(
         "success": True,
         "message": "Login exitoso",
         "data": {
-            "store": {
-                "id": store.id,
-                "owner_name": store.owner_name,
-                "owner_email": store.owner_email,
-                "owner_phone": store.owner_phone,
-                "store_name": store.store_name,
-                "description": store.description,
-                "image": store.image,
-                "address": store.address,
-                "delivery_fee": store.delivery_fee,
-                "delivery_time_min": store.delivery_time_min,
-                "delivery_time_max": store.delivery_time_max,
-                "rating": store.rating,
-                "is_open": store.is_open
-            },
+            "store": store,
             "token": access_token
         }
     }
 
 
-@router.post("/admin/login", response_model=dict[str, Any])
+@router.post("/admin/login", response_model=MessageEnvelope[AdminAuth])
 async def login_admin(
     login_data: AdminLogin,
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Login admin user."""
-    result = await db.execute(select(Admin).where(Admin.email == login_data.email.lower()))
-    admin = result.scalar_one_or_none()
+    admin = await repository.get_admin_by_email(login_data.email.lower())
 
     if not admin or not verify_password(login_data.password, admin.password):
         raise HTTPException(
@@ -251,24 +209,20 @@ async def login_admin(
         "success": True,
         "message": "Login exitoso",
         "data": {
-            "admin": {
-                "id": admin.id,
-                "name": admin.name,
-                "email": admin.email,
-                "phone": admin.phone,
-                "role": admin.role
-            },
+            "admin": admin,
             "token": access_token
         }
     }
 
 
-@router.get("/profile", response_model=dict[str, Any])
+@router.get("/profile", response_model=Envelope[Union[UserResponse, StoreResponse, AdminResponse]])
 async def get_profile(
     current_user = Depends(get_current_active_user)
 ):
     """Get current user profile."""
+    # Convert here: the three response models share fields, so validating the
+    # union from the ORM object could pick the wrong one
     return {
         "success": True,
-        "data": current_user
+        "data": PROFILE_MODELS[type(current_user)].model_validate(current_user)
     }
\ No newline at end of file
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from typing import List
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, status
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.api.deps import SharedAuth, shared_auth
+from app.core.config import settings
+from app.models import BatchOperation, BatchRequest, BatchResult, Envelope
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Request headers the sub-requests inherit from the batch request
+FORWARDED_HEADERS = {b"authorization", b"cookie", b"x-read-consistency", b"accept-language", b"user-agent"}
+
+# Scope keys set by the router for the batch route itself
+ROUTE_SCOPE_KEYS = ("route", "endpoint", "path_params", "fastapi_astack")
+
+
+@router.post("/batch", response_model=Envelope[List[BatchResult]])
+async def run_batch(batch: BatchRequest, request: Request):
+    """Run several GET requests in one round trip.
+
+    Sub-requests go straight to the API router (no middleware), concurrently
+    up to ``BATCH_MAX_CONCURRENCY`` at a time, and share one token check and
+    one principal load. Each gets its own pooled session: an AsyncSession
+    cannot be used by concurrent requests. Results keep the request order.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch takes at most {settings.BATCH_MAX_REQUESTS} requests"
+        )
+    for operation in batch.requests:
+        target = urlsplit(operation.path)
+        if (
+            target.scheme or target.netloc
+            or not target.path.startswith(f"{settings.API_V1_STR}/")
+            or target.path.rstrip("/") == request.url.path.rstrip("/")
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid batch path: {operation.path}"
+            )
+
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+    async def run(operation: BatchOperation) -> BatchResult:
+        async with semaphore:
+            return await _dispatch(request, operation)
+
+    token = shared_auth.set(SharedAuth())
+    try:
+        results = await asyncio.gather(*(run(operation) for operation in batch.requests))
+    finally:
+        shared_auth.reset(token)
+
+    return {
+        "success": True,
+        "data": results
+    }
+
+
+async def _dispatch(request: Request, operation: BatchOperation) -> BatchResult:
+    """Run one sub-request through the app's router and collect its response."""
+    target = urlsplit(operation.path)
+    headers = [(name, value) for name, value in request.scope["headers"] if name in FORWARDED_HEADERS]
+    headers.extend(
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in operation.headers.items()
+    )
+    scope = {key: value for key, value in request.scope.items() if key not in ROUTE_SCOPE_KEYS}
+    scope.update(
+        method=operation.method,
+        path=target.path,
+        raw_path=target.path.encode(),
+        query_string=target.query.encode(),
+        headers=headers
+    )
+
+    finished = asyncio.Event()
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect until they are done
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    start = {"status": 500, "headers": []}
+    chunks: list[bytes] = []
+
+    async def send(message) -> None:
+        nonlocal start
+        if message["type"] == "http.response.start":
+            start = message
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app.router(scope, receive, send)
+    except StarletteHTTPException as exc:
+        return BatchResult(id=operation.id, status=exc.status_code, body={"detail": exc.detail})
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", operation.method, operation.path)
+        return BatchResult(id=operation.id, status=500, body={"detail": "Internal Server Error"})
+    finally:
+        finished.set()
+
+    response_headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in start["headers"]
+        if name.lower() != b"content-length"
+    }
+    return BatchResult(
+        id=operation.id,
+        status=start["status"],
+        headers=response_headers,
+        body=_decode_body(b"".join(chunks), response_headers.get("content-type", ""))
+    )
+
+
+def _decode_body(body: bytes, content_type: str):
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        return orjson.loads(body)
+    return body.decode("utf-8", errors="replace")
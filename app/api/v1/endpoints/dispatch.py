@@ -0,0 +1,69 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_current_store, get_current_admin
+from app.models import Store, DispatchRoutes, DispatchPlanSummary, MessageEnvelope
+from app.services.dispatch import planner
+
+router = APIRouter()
+
+
+@router.get("/routes", response_model=DispatchRoutes)
+async def get_my_routes(
+    current_store: Store = Depends(get_current_store)
+):
+    """Get the proposed delivery routes for the current store."""
+    plan = planner.latest
+    return {
+        "success": True,
+        "data": [route for route in plan.routes if route.store_id == current_store.id] if plan else [],
+        "planned_at": plan.planned_at if plan else None
+    }
+
+
+# Admin endpoints
+@router.get("/admin/routes", response_model=DispatchRoutes)
+async def get_routes(
+    store_id: Optional[UUID] = None,
+    current_admin = Depends(get_current_admin)
+):
+    """Get the latest dispatch plan for every store (admin only)."""
+    plan = planner.latest
+    routes = plan.routes if plan else []
+    if store_id:
+        routes = [route for route in routes if route.store_id == store_id]
+
+    return {
+        "success": True,
+        "data": routes,
+        "planned_at": plan.planned_at if plan else None,
+        "planning_ms": plan.planning_ms if plan else None
+    }
+
+
+@router.post("/admin/plan", response_model=MessageEnvelope[DispatchPlanSummary])
+async def run_dispatch_planning(
+    max_batch_size: Optional[int] = Query(None, ge=1),
+    max_radius_km: Optional[float] = Query(None, gt=0),
+    time_window_minutes: Optional[float] = Query(None, ge=0),
+    current_admin = Depends(get_current_admin)
+):
+    """Run a dispatch planning tick now, optionally overriding the planner settings (admin only)."""
+    plan = await planner.plan(
+        max_batch_size=max_batch_size,
+        max_radius_km=max_radius_km,
+        time_window_minutes=time_window_minutes
+    )
+
+    return {
+        "success": True,
+        "message": "Dispatch plan updated",
+        "data": {
+            "planned_at": plan.planned_at,
+            "planning_ms": plan.planning_ms,
+            "order_count": plan.order_count,
+            "route_count": len(plan.routes)
+        }
+    }
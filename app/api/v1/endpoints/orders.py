@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_store_db, get_current_store, get_current_admin
+from app.models import Order, OrderUpdate, OrderStatusChange, Store, MessageEnvelope
+from app.models.order import OrderStatus
+from app.services.exports import (
+    ExportFormat, MEDIA_TYPES, export_rows, parquet_available, stream_orders_export
+)
+from app.services.rollups import apply_order_status
+
+router = APIRouter()
+
+MAX_EXPORT_DAYS = 366
+
+
+def _export_response(
+    export_format: ExportFormat,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    statuses: Optional[List[OrderStatus]],
+    store_id: Optional[UUID] = None
+) -> StreamingResponse:
+    """Validate export filters and stream the matching orders."""
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=29)
+
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must be before date_to"
+        )
+
+    if (date_to - date_from).days >= MAX_EXPORT_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_EXPORT_DAYS} days"
+        )
+
+    if export_format == ExportFormat.PARQUET and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires pyarrow to be installed"
+        )
+
+    rows = export_rows(date_from, date_to, statuses, store_id)
+    filename = f"orders_{date_from}_{date_to}.{export_format.value}"
+
+    return StreamingResponse(
+        stream_orders_export(rows, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/export")
+async def export_my_orders(
+    format: ExportFormat = ExportFormat.CSV,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[List[OrderStatus]] = Query(None),
+    current_store: Store = Depends(get_current_store)
+):
+    """Stream the current store's orders as CSV, NDJSON or Parquet."""
+    return _export_response(format, date_from, date_to, status, current_store.id)
+
+
+# Admin endpoints
+@router.get("/admin/export")
+async def export_orders(
+    format: ExportFormat = ExportFormat.CSV,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[List[OrderStatus]] = Query(None),
+    store_id: Optional[UUID] = None,
+    current_admin = Depends(get_current_admin)
+):
+    """Stream orders of every store as CSV, NDJSON or Parquet (admin only)."""
+    return _export_response(format, date_from, date_to, status, store_id)
+
+
+@router.put("/{order_id}/status", response_model=MessageEnvelope[OrderStatusChange])
+async def update_order_status(
+    order_id: UUID,
+    order_update: OrderUpdate,
+    current_store: Store = Depends(get_current_store),
+    db: AsyncSession = Depends(get_store_db)
+):
+    """Change the status of one of the current store's orders."""
+    if order_update.status is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Status is required"
+        )
+
+    order = await db.get(Order, order_id, with_for_update=True)
+
+    if not order or order.store_id != current_store.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+
+    try:
+        await apply_order_status(
+            db, order, order_update.status, order_update.cancellation_reason
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+    if order_update.payment_status is not None:
+        order.payment_status = order_update.payment_status
+
+    await db.commit()
+
+    return {
+        "success": True,
+        "message": "Order status updated successfully",
+        "data": order
+    }
@@ -0,0 +1,116 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
+
+from app.api.deps import get_current_admin
+from app.core.config import settings
+from app.core.profiling import profile_store, profiler_available
+from app.models import (
+    Admin, Envelope, Message, MessageEnvelope, ProfileInfo, ProfilingRule, ProfilingRuleCreate
+)
+
+router = APIRouter()
+
+
+def _require_enabled() -> None:
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+
+
+# Admin endpoints
+@router.get("/admin/rule", response_model=Envelope[Optional[ProfilingRule]])
+async def get_profiling_rule(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Get the active profiling rule (admin only)."""
+    _require_enabled()
+    return {
+        "success": True,
+        "data": profile_store.read_rule()
+    }
+
+
+@router.put("/admin/rule", response_model=MessageEnvelope[ProfilingRule])
+async def set_profiling_rule(
+    rule_in: ProfilingRuleCreate,
+    request: Request,
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Start profiling matching requests, replacing any previous rule (admin only)."""
+    _require_enabled()
+    if not profiler_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Profiling requires pyinstrument to be installed"
+        )
+
+    if rule_in.route is not None and rule_in.route not in {route.path for route in request.app.routes}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown route: {rule_in.route}"
+        )
+
+    rule = ProfilingRule(
+        route=rule_in.route,
+        method=rule_in.method,
+        sample_rate=rule_in.sample_rate,
+        token=secrets.token_urlsafe(16),
+        header=settings.PROFILING_HEADER,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=rule_in.expires_in),
+        created_by=current_admin.id,
+    )
+    profile_store.write_rule(rule)
+
+    return {
+        "success": True,
+        "message": f"Profiling enabled; send {rule.header}: <token> to profile a request",
+        "data": rule
+    }
+
+
+@router.delete("/admin/rule", response_model=Message)
+async def clear_profiling_rule(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Stop profiling (admin only)."""
+    _require_enabled()
+    profile_store.clear_rule()
+
+    return {
+        "success": True,
+        "message": "Profiling disabled"
+    }
+
+
+@router.get("/admin", response_model=Envelope[List[ProfileInfo]])
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """List the most recent profiles, newest first (admin only)."""
+    _require_enabled()
+    return {
+        "success": True,
+        "data": profile_store.recent(limit)
+    }
+
+
+@router.get("/admin/{name}", response_class=FileResponse)
+async def download_profile(
+    name: str,
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Download a profile; speedscope files open in https://www.speedscope.app (admin only)."""
+    _require_enabled()
+    found = profile_store.find(name)
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+
+    path, media_type = found
+    return FileResponse(path, media_type=media_type, filename=path.name)
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import (
+    get_read_db, get_read_db_for_store, get_store_read_db, get_current_store, get_current_admin
+)
+from app.core.database import on_shards, shard_router
+from app.core.shards import merge_sorted
+from app.models import Store, SalesReport, RollupConsistency, Envelope
+from app.services.rollups import check_rollups, get_sales_report, mismatch_sort_key
+
+router = APIRouter()
+
+MAX_REPORT_DAYS = 366
+
+
+def _resolve_range(date_from: Optional[date], date_to: Optional[date]) -> tuple[date, date]:
+    """Default to the last 30 days and reject oversized ranges."""
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=29)
+
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must be before date_to"
+        )
+
+    if (date_to - date_from).days >= MAX_REPORT_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_REPORT_DAYS} days"
+        )
+
+    return date_from, date_to
+
+
+@router.get("/sales", response_model=Envelope[SalesReport])
+async def get_my_sales_report(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    top: int = Query(10, ge=1, le=50),
+    current_store: Store = Depends(get_current_store),
+    db: AsyncSession = Depends(get_store_read_db)
+):
+    """Get the current store's sales report."""
+    date_from, date_to = _resolve_range(date_from, date_to)
+    report = await get_sales_report(db, current_store.id, date_from, date_to, top)
+
+    return {
+        "success": True,
+        "data": SalesReport(**report)
+    }
+
+
+# Admin endpoints
+@router.get("/stores/{store_id}/sales", response_model=Envelope[SalesReport])
+async def get_store_sales_report(
+    store_id: UUID,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    top: int = Query(10, ge=1, le=50),
+    current_admin = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_read_db_for_store)
+):
+    """Get any store's sales report (admin only)."""
+    date_from, date_to = _resolve_range(date_from, date_to)
+    report = await get_sales_report(db, store_id, date_from, date_to, top)
+
+    return {
+        "success": True,
+        "data": SalesReport(**report)
+    }
+
+
+@router.get("/admin/consistency", response_model=Envelope[RollupConsistency])
+async def get_rollup_consistency(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    store_id: Optional[UUID] = None,
+    current_admin = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Compare sales rollups against raw orders (admin only)."""
+    date_from, date_to = _resolve_range(date_from, date_to)
+    if shard_router:
+        results = await on_shards(
+            lambda shard_db: check_rollups(shard_db, date_from, date_to, store_id), store_id
+        )
+        mismatches = merge_sorted(results, key=mismatch_sort_key)
+    else:
+        mismatches = await check_rollups(db, date_from, date_to, store_id)
+
+    return {
+        "success": True,
+        "data": {
+            "consistent": not mismatches,
+            "mismatches": mismatches
+        }
+    }
@@ -1,43 +1,82 @@
-from typing import Any, List, Optional
+from typing import List, Optional
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
 
-from app.api.deps import get_db, get_current_store, get_current_admin
-from app.models import Store, StoreUpdate, StoreResponse, StorePublic
+from app.api.deps import get_db, get_read_db, get_repository, get_current_store, get_current_admin
+from app.api.fieldsets import fieldset, sparse_response
+from app.core import fastpath
+from app.core.config import settings
+from app.models import (
+    Store, StoreUpdate, StoreResponse, StorePublic,
+    DeliveryZone, DeliveryZoneCreate, DeliveryZoneResponse, StoreCoverage,
+    Envelope, MessageEnvelope, Message, Page
+)
+from app.repositories import Repository
+from app.services import queries
+from app.services.zones import zone_index
 
 router = APIRouter()
 
 
-@router.get("/", response_model=dict[str, Any])
+@router.get("/", response_model=Page[StorePublic])
 async def get_stores(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
     only_active: bool = True,
     only_approved: bool = True,
-    db: AsyncSession = Depends(get_db)
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    fields: Optional[tuple[str, ...]] = Depends(fieldset(StorePublic)),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get list of stores."""
-    query = select(Store)
-
-    if only_active:
-        query = query.where(Store.is_active == True)
-
-    if only_approved:
-        query = query.where(Store.is_approved == True)
+    """Get list of stores, optionally only those delivering to a point."""
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="latitude and longitude must be sent together"
+        )
 
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            Store.store_name.ilike(search_pattern) |
-            Store.address.ilike(search_pattern) |
-            Store.description.ilike(search_pattern)
+    deliverable = None
+    if latitude is not None:
+        index = await zone_index.ensure_fresh(db)
+        if index.zoned_stores:
+            deliverable = index.stores_delivering_to(latitude, longitude)
+
+    if settings.DB_FAST_PATH:
+        stores_public = await fastpath.fetch_public_stores(
+            db, skip, limit,
+            search=search,
+            only_active=only_active,
+            only_approved=only_approved,
+            deliverable_ids=deliverable,
+            columns=fields
         )
+        if fields:
+            return _store_page(fields, stores_public, skip, limit)
+        return {
+            "success": True,
+            "data": stores_public,
+            "pagination": {
+                "skip": skip,
+                "limit": limit,
+                "total": len(stores_public)
+            }
+        }
 
-    query = query.offset(skip).limit(limit).order_by(Store.rating.desc())
+    query = queries.store_listing(
+        skip, limit,
+        search=search,
+        only_active=only_active,
+        only_approved=only_approved,
+        deliverable_ids=deliverable,
+        columns=fields
+    )
 
     result = await db.execute(query)
+    if fields:
+        return _store_page(fields, result.mappings().all(), skip, limit)
     stores = result.scalars().all()
 
     # Convert to public format
@@ -72,12 +111,132 @@ async def get_stores(
     }
 
 
-@router.get("/{store_id}", response_model=dict[str, Any])
+def _store_page(fields: tuple[str, ...], rows, skip: int, limit: int):
+    return sparse_response(
+        StorePublic, fields, Page,
+        data=rows,
+        pagination={"skip": skip, "limit": limit, "total": len(rows)}
+    )
+
+
+@router.get("/me/zones", response_model=Envelope[List[DeliveryZoneResponse]])
+async def get_my_delivery_zones(
+    current_store: Store = Depends(get_current_store),
+    db: AsyncSession = Depends(get_db)
+):
+    """List the current store's delivery zones."""
+    result = await db.execute(queries.store_zones(current_store.id))
+    zones = result.scalars().all()
+
+    return {
+        "success": True,
+        "data": [DeliveryZoneResponse.model_validate(zone) for zone in zones]
+    }
+
+
+@router.post("/me/zones", response_model=MessageEnvelope[DeliveryZoneResponse])
+async def create_my_delivery_zone(
+    zone_data: DeliveryZoneCreate,
+    current_store: Store = Depends(get_current_store),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add a delivery zone polygon to the current store."""
+    zone = DeliveryZone(
+        store_id=current_store.id,
+        name=zone_data.name,
+        polygon=zone_data.polygon,
+        is_active=zone_data.is_active
+    )
+
+    db.add(zone)
+    await db.commit()
+    await db.refresh(zone)
+    zone_index.invalidate()
+
+    return {
+        "success": True,
+        "message": "Delivery zone created successfully",
+        "data": DeliveryZoneResponse.model_validate(zone)
+    }
+
+
+@router.delete("/me/zones/{zone_id}", response_model=Message)
+async def delete_my_delivery_zone(
+    zone_id: UUID,
+    current_store: Store = Depends(get_current_store),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove one of the current store's delivery zones."""
+    zone = await db.get(DeliveryZone, zone_id)
+
+    if not zone or zone.store_id != current_store.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Delivery zone not found"
+        )
+
+    await db.delete(zone)
+    await db.commit()
+    zone_index.invalidate()
+
+    return {
+        "success": True,
+        "message": "Delivery zone deleted successfully"
+    }
+
+
+@router.get("/{store_id}/coverage", response_model=Envelope[StoreCoverage])
+async def check_store_coverage(
+    store_id: UUID,
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Check whether a store delivers to a point."""
+    index = await zone_index.ensure_fresh(db)
+    zone = index.delivers_to(store_id, latitude, longitude)
+
+    return {
+        "success": True,
+        "data": {
+            "store_id": store_id,
+            "deliverable": zone is not None or not index.has_zones(store_id),
+            "zone_id": zone.zone_id if zone else None,
+            "zone_name": zone.name if zone else None
+        }
+    }
+
+
+@router.get("/{store_id}", response_model=Envelope[StorePublic])
 async def get_store(
     store_id: str,
-    db: AsyncSession = Depends(get_db)
+    fields: Optional[tuple[str, ...]] = Depends(fieldset(StorePublic)),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get store by ID."""
+    if settings.DB_FAST_PATH:
+        try:
+            found = await fastpath.fetch_public_store(db, UUID(store_id), columns=fields)
+        except ValueError:
+            found = None
+        if found is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Store not found"
+            )
+        store_public, available = found
+        if not available:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Store not available"
+            )
+        if fields:
+            return sparse_response(StorePublic, fields, Envelope, data=store_public)
+        return {
+            "success": True,
+            "data": store_public
+        }
+
     store = await db.get(Store, store_id)
 
     if not store:
@@ -92,6 +251,9 @@ async def get_store(
             detail="Store not available"
         )
 
+    if fields:
+        return sparse_response(StorePublic, fields, Envelope, data=store)
+
     store_public = StorePublic(
         id=store.id,
         store_name=store.store_name,
@@ -116,33 +278,34 @@ async def get_store(
     }
 
 
-@router.put("/me", response_model=dict[str, Any])
+@router.put("/me", response_model=MessageEnvelope[StoreResponse])
 async def update_my_store(
     store_update: StoreUpdate,
     current_store: Store = Depends(get_current_store),
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Update current store information."""
     update_data = store_update.dict(exclude_unset=True)
 
-    for field, value in update_data.items():
-        setattr(current_store, field, value)
-
-    await db.commit()
-    await db.refresh(current_store)
+    store = current_store
+    if update_data:
+        store = await repository.update_store(current_store.id, **update_data)
 
     return {
         "success": True,
         "message": "Store updated successfully",
-        "data": current_store
+        "data": store
     }
 
 
-@router.get("/me/profile", response_model=dict[str, Any])
+@router.get("/me/profile", response_model=Envelope[StoreResponse])
 async def get_my_store_profile(
+    fields: Optional[tuple[str, ...]] = Depends(fieldset(StoreResponse)),
     current_store: Store = Depends(get_current_store)
 ):
     """Get current store profile."""
+    if fields:
+        return sparse_response(StoreResponse, fields, Envelope, data=current_store)
     return {
         "success": True,
         "data": current_store
@@ -150,19 +313,23 @@ async def get_my_store_profile(
 
 
 # Admin endpoints
-@router.get("/admin/pending", response_model=dict[str, Any])
+@router.get("/admin/pending", response_model=Page[StoreResponse])
 async def get_pending_stores(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    fields: Optional[tuple[str, ...]] = Depends(fieldset(StoreResponse)),
     current_admin = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get pending approval stores (admin only)."""
-    query = select(Store).where(
-        and_(Store.is_approved == False, Store.is_active == True)
-    ).offset(skip).limit(limit).order_by(Store.created_at.desc())
-
-    result = await db.execute(query)
+    result = await db.execute(queries.pending_stores(skip, limit, columns=fields))
+    if fields:
+        stores = result.mappings().all()
+        return sparse_response(
+            StoreResponse, fields, Page,
+            data=stores,
+            pagination={"skip": skip, "limit": limit, "total": len(stores)}
+        )
     stores = result.scalars().all()
 
     return {
@@ -176,14 +343,14 @@ async def get_pending_stores(
     }
 
 
-@router.post("/{store_id}/approve", response_model=dict[str, Any])
+@router.post("/{store_id}/approve", response_model=MessageEnvelope[StoreResponse])
 async def approve_store(
-    store_id: str,
+    store_id: UUID,
     current_admin = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Approve store (admin only)."""
-    store = await db.get(Store, store_id)
+    store = await repository.update_store(store_id, is_approved=True)
 
     if not store:
         raise HTTPException(
@@ -191,10 +358,6 @@ async def approve_store(
             detail="Store not found"
         )
 
-    store.is_approved = True
-    await db.commit()
-    await db.refresh(store)
-
     return {
         "success": True,
         "message": "Store approved successfully",
@@ -202,14 +365,14 @@ async def approve_store(
     }
 
 
-@router.post("/{store_id}/reject", response_model=dict[str, Any])
+@router.post("/{store_id}/reject", response_model=MessageEnvelope[StoreResponse])
 async def reject_store(
-    store_id: str,
+    store_id: UUID,
     current_admin = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db)
+    repository: Repository = Depends(get_repository)
 ):
     """Reject/deactivate store (admin only)."""
-    store = await db.get(Store, store_id)
+    store = await repository.update_store(store_id, is_active=False, is_approved=False)
 
     if not store:
         raise HTTPException(
@@ -217,11 +380,6 @@ async def reject_store(
             detail="Store not found"
         )
 
-    store.is_active = False
-    store.is_approved = False
-    await db.commit()
-    await db.refresh(store)
-
     return {
         "success": True,
         "message": "Store rejected successfully",
@@ -0,0 +1,166 @@
+"""Maintenance commands for Collique Delivery.
+
+Usage:
+    python -m app.cli rollups-backfill --from 2025-01-01 --to 2025-01-31
+    python -m app.cli rollups-check --from 2025-01-01 --to 2025-01-31
+    python -m app.cli ids-rekey --table orders
+    python -m app.cli partitions-maintain --months-ahead 3
+    python -m app.cli orders-archive --before 2025-01 --format parquet
+    python -m app.cli shards-init
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from app.core.database import AsyncSessionLocal, close_db, store_session, store_session_factories
+
+
+def _store_databases(store_id: Optional[UUID] = None) -> list:
+    """Session factories for one store's shard, or for every store database."""
+    if store_id is not None:
+        return [lambda: store_session(store_id)]
+    return store_session_factories()
+
+
+async def rollups_backfill(args: argparse.Namespace) -> int:
+    from app.services.rollups import backfill_rollups
+
+    written = 0
+    for new_session in _store_databases(args.store_id):
+        async with new_session() as db:
+            try:
+                written += await backfill_rollups(db, args.date_from, args.date_to, args.store_id)
+            except ValueError as error:
+                print(error, file=sys.stderr)
+                return 1
+    print(f"Rebuilt {written} rollup rows from {args.date_from} to {args.date_to}")
+    return 0
+
+
+async def rollups_check(args: argparse.Namespace) -> int:
+    from app.services.rollups import check_rollups
+
+    mismatches = []
+    for new_session in _store_databases(args.store_id):
+        async with new_session() as db:
+            mismatches += await check_rollups(db, args.date_from, args.date_to, args.store_id)
+
+    for mismatch in mismatches:
+        print(
+            f"{mismatch.store_id} {mismatch.day} {mismatch.status.value} "
+            f"{mismatch.field}: expected={mismatch.expected} actual={mismatch.actual}"
+        )
+    print(f"{len(mismatches)} mismatches from {args.date_from} to {args.date_to}")
+    return 1 if mismatches else 0
+
+
+async def ids_rekey(args: argparse.Namespace) -> int:
+    from app.services.rekey import REKEY_TABLES, rekey_table
+
+    for new_session in store_session_factories():
+        async with new_session() as db:
+            for table in args.tables or REKEY_TABLES:
+                rewritten = await rekey_table(db, table, args.batch_size)
+                print(f"Rekeyed {rewritten} rows in {table}")
+    return 0
+
+
+async def partitions_maintain(args: argparse.Namespace) -> int:
+    from app.services.partitions import ensure_partitions
+
+    async with AsyncSessionLocal() as db:
+        created = await ensure_partitions(db, args.months_ahead)
+    for name in created:
+        print(f"Created {name}")
+    print(f"{len(created)} partitions created")
+    return 0
+
+
+async def orders_archive(args: argparse.Namespace) -> int:
+    from app.services.archive import archive_old_partitions
+
+    async with AsyncSessionLocal() as db:
+        archived = await archive_old_partitions(db, args.before, args.format)
+    for month in archived:
+        print(f"Archived {month:%Y-%m}")
+    print(f"{len(archived)} months archived")
+    return 0
+
+
+async def shards_init(args: argparse.Namespace) -> int:
+    from app.core.database import init_shards
+
+    names = await init_shards()
+    for name in names:
+        print(f"Created store-scoped tables on shard {name}")
+    print(f"{len(names)} shards initialised")
+    return 0
+
+
+def _month(value: str) -> date:
+    return date.fromisoformat(f"{value}-01")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, handler, help_text in (
+        (
+            "rollups-backfill", rollups_backfill,
+            "Rebuild sales rollups from raw orders; refuses ranges fed by archived "
+            "months (an archived month and the month after it)"
+        ),
+        ("rollups-check", rollups_check, "Compare sales rollups with raw orders"),
+    ):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True)
+        command.add_argument("--to", dest="date_to", type=date.fromisoformat, required=True)
+        command.add_argument("--store-id", type=UUID, default=None)
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser(
+        "ids-rekey",
+        help="Rewrite legacy uuid4 primary keys as UUIDv7 (changes order ids seen by clients)"
+    )
+    command.add_argument(
+        "--table", dest="tables", action="append", choices=("orders", "order_items", "cart_items"),
+        help="Table to rekey (repeatable; default: all)"
+    )
+    command.add_argument("--batch-size", type=int, default=5000)
+    command.set_defaults(handler=ids_rekey)
+
+    command = commands.add_parser("partitions-maintain", help="Create upcoming monthly order partitions")
+    command.add_argument("--months-ahead", type=int, default=None)
+    command.set_defaults(handler=partitions_maintain)
+
+    command = commands.add_parser(
+        "orders-archive", help="Move monthly order partitions older than a month to the archive"
+    )
+    command.add_argument("--before", type=_month, default=None, help="First month to keep online (YYYY-MM)")
+    command.add_argument("--format", choices=("parquet", "csv"), default=None)
+    command.set_defaults(handler=orders_archive)
+
+    command = commands.add_parser("shards-init", help="Create the store-scoped tables on every store shard")
+    command.set_defaults(handler=shards_init)
+
+    return parser
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        return await args.handler(args)
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,71 @@
 from typing import AsyncGenerator
 
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.core.pool import AdaptivePoolController, InstrumentedAsyncPool, instrument_engine
+from app.core.replicas import ReplicaRouter
+from app.core.shards import ShardRouter, shard_metadata
+from app.core.sql_accounting import instrument_queries
+from app.core.statements import instrument_statement_cache
 
 # Create async engine
-engine = create_async_engine(
-    settings.get_database_url(),
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,
-    pool_recycle=300,
+if settings.DB_POOL_ADAPTIVE:
+    pool_options = dict(
+        pool_size=settings.DB_POOL_MIN_SIZE,
+        max_overflow=settings.DB_POOL_MAX_SIZE - settings.DB_POOL_MIN_SIZE,
+        pool_pre_ping=False,
+    )
+else:
+    pool_options = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+def _create_engine(url: str):
+    new_engine = create_async_engine(
+        url,
+        echo=settings.SQL_ECHO,
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        **pool_options,
+    )
+    instrument_engine(new_engine)
+    instrument_statement_cache(new_engine)
+    if settings.SQL_ACCOUNTING_ENABLED:
+        instrument_queries(new_engine)
+    return new_engine
+
+
+engine = _create_engine(settings.get_database_url())
+
+# Optional read replicas for read-only dependencies
+replica_router = ReplicaRouter(
+    [_create_engine(url) for url in settings.get_replica_urls()],
+    interval=settings.REPLICA_HEALTH_CHECK_INTERVAL,
 )
 
+# Optional store shards; without them store-scoped tables stay on the primary
+shard_router = ShardRouter(
+    {name: _create_engine(url) for name, url in settings.get_shard_urls().items()},
+    pins=settings.STORE_SHARDS,
+)
+
+pool_controller = AdaptivePoolController(
+    engine,
+    min_size=settings.DB_POOL_MIN_SIZE,
+    max_size=settings.DB_POOL_MAX_SIZE,
+    interval=settings.DB_POOL_MAINTENANCE_INTERVAL,
+) if settings.DB_POOL_ADAPTIVE else None
+
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -33,6 +84,63 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only session on a healthy replica, or the primary if none."""
+    index = replica_router.choose() if replica_router else None
+    if index is None:
+        async for session in get_session():
+            yield session
+        return
+
+    async with replica_router.session_factories[index]() as session:
+        try:
+            yield session
+        except exc.DBAPIError as error:
+            if error.connection_invalidated or isinstance(error, exc.OperationalError):
+                replica_router.mark_unhealthy(index)
+            await session.rollback()
+            raise
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+def store_session(store_id) -> AsyncSession:
+    """New session on the database holding ``store_id``'s orders, products and carts."""
+    if shard_router:
+        return shard_router.session(store_id)
+    return AsyncSessionLocal()
+
+
+async def get_store_session(store_id) -> AsyncGenerator[AsyncSession, None]:
+    """Get a session on the shard of ``store_id``."""
+    async with store_session(store_id) as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def on_shards(query, store_id=None) -> list:
+    """Run ``query(session)`` on ``store_id``'s shard, or concurrently on every shard."""
+    if store_id is not None:
+        async with store_session(store_id) as session:
+            return [await query(session)]
+    return await shard_router.fan_out(query)
+
+
+def store_session_factories() -> list:
+    """Session factories of every database holding store-scoped tables."""
+    if shard_router:
+        return [shard_router.session_factories[name] for name in shard_router.names]
+    return [AsyncSessionLocal]
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     # Import all models here so they are registered with SQLModel
@@ -44,12 +152,66 @@ async def init_db() -> None:
     import app.models.address
     import app.models.order
     import app.models.cart
+    import app.models.report
+    import app.models.idempotency
+    import app.models.zone
 
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(SQLModel.metadata.create_all)
+    await init_shards()
+
+
+async def init_shards() -> list[str]:
+    """Create the store-scoped tables on every shard; returns the shard names."""
+    import app.models  # noqa: F401
+
+    metadata = shard_metadata(SQLModel.metadata)
+    for shard_engine in shard_router.engines.values():
+        async with shard_engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+    return shard_router.names
+
+
+def get_pool_stats() -> dict:
+    """Current connection pool metrics."""
+    pool = engine.sync_engine.pool
+    return {
+        "adaptive": pool_controller is not None,
+        **pool.metrics.snapshot(pool),
+        "replicas": [
+            {
+                "healthy": replica_router.healthy[index],
+                **replica.sync_engine.pool.metrics.snapshot(replica.sync_engine.pool),
+            }
+            for index, replica in enumerate(replica_router.engines)
+        ],
+        "shards": {
+            name: shard.sync_engine.pool.metrics.snapshot(shard.sync_engine.pool)
+            for name, shard in shard_router.engines.items()
+        },
+    }
+
+
+def get_statement_cache_stats() -> dict:
+    """Compiled statement cache hit rates for the primary and each replica."""
+    return {
+        **engine.sync_engine.statement_metrics.snapshot(engine.sync_engine),
+        "replicas": [
+            replica.sync_engine.statement_metrics.snapshot(replica.sync_engine)
+            for replica in replica_router.engines
+        ],
+        "shards": {
+            name: shard.sync_engine.statement_metrics.snapshot(shard.sync_engine)
+            for name, shard in shard_router.engines.items()
+        },
+    }
 
 
 async def close_db() -> None:
     """Close database connections."""
+    if pool_controller is not None:
+        await pool_controller.stop()
+    await replica_router.dispose()
+    await shard_router.dispose()
     await engine.dispose()
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Raw asyncpg fast path for the hottest read queries.
+
+The queries below bypass ORM hydration and the identity map: they run as
+plain SQL on the asyncpg connection that backs the request's session (same
+pool, same transaction if one is open) and map records straight to
+response models. asyncpg prepares each distinct SQL text once per
+connection and reuses it from its statement cache, so the SQL strings are
+built once per query shape and kept in module-level caches.
+"""
+import time
+from functools import lru_cache
+from typing import Collection, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import sql_accounting
+from app.models import Admin, Store, StorePublic, User
+
+STORE_PUBLIC_COLUMNS = tuple(StorePublic.model_fields)
+
+PRINCIPAL_TABLES = {
+    User: "users",
+    Store: "stores",
+    Admin: "admins",
+}
+
+
+async def _driver_connection(session: AsyncSession):
+    """The asyncpg connection behind the session's current pooled connection."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+async def _fetch(session: AsyncSession, sql: str, *args, one: bool = False):
+    """Run ``sql`` on the session's connection, counted in the request's SQL stats."""
+    connection = await _driver_connection(session)
+    started = time.perf_counter()
+    try:
+        if one:
+            return await connection.fetchrow(sql, *args)
+        return await connection.fetch(sql, *args)
+    finally:
+        sql_accounting.record(sql, time.perf_counter() - started)
+
+
+def _select_list(columns: Sequence[str]) -> str:
+    return ", ".join(columns)
+
+
+@lru_cache(maxsize=None)
+def _store_by_id_sql(columns: Sequence[str] = STORE_PUBLIC_COLUMNS) -> str:
+    return f"SELECT {_select_list(columns)}, is_active, is_approved FROM stores WHERE id = $1"
+
+
+STORE_BY_ID_SQL = _store_by_id_sql()
+
+
+async def fetch_public_store(
+    session: AsyncSession,
+    store_id: UUID,
+    columns: Optional[tuple[str, ...]] = None
+) -> Optional[tuple[StorePublic | dict, bool]]:
+    """Return ``(store, available)`` for a store id, or ``None`` if it does not exist.
+
+    With ``columns`` only those are read and the store is a plain dict.
+    """
+    record = await _fetch(session, _store_by_id_sql(columns or STORE_PUBLIC_COLUMNS), store_id, one=True)
+    if record is None:
+        return None
+    values = dict(record)
+    is_active, is_approved = values.pop("is_active"), values.pop("is_approved")
+    available = is_active and is_approved
+    return (values if columns else StorePublic(**values)), available
+
+
+@lru_cache(maxsize=None)
+def _store_list_sql(
+    only_active: bool,
+    only_approved: bool,
+    search: bool,
+    zone_filter: bool,
+    columns: Sequence[str] = STORE_PUBLIC_COLUMNS
+) -> str:
+    """SQL for one store listing shape; positional parameters follow the WHERE order."""
+    conditions = []
+    position = 0
+    if only_active:
+        conditions.append("is_active")
+    if only_approved:
+        conditions.append("is_approved")
+    if search:
+        position += 1
+        conditions.append(
+            f"(store_name ILIKE ${position} OR address ILIKE ${position} OR description ILIKE ${position})"
+        )
+    if zone_filter:
+        position += 1
+        # OFFSET 0 keeps the subquery a per-row index probe instead of a hashed scan of every zone
+        conditions.append(
+            f"(id = ANY(${position}::uuid[]) OR NOT EXISTS "
+            f"(SELECT 1 FROM delivery_zones WHERE store_id = stores.id AND is_active OFFSET 0))"
+        )
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return (
+        f"SELECT {_select_list(columns)} FROM stores{where} "
+        f"ORDER BY rating DESC, id LIMIT ${position + 1} OFFSET ${position + 2}"
+    )
+
+
+async def fetch_public_stores(
+    session: AsyncSession,
+    skip: int,
+    limit: int,
+    search: Optional[str] = None,
+    only_active: bool = True,
+    only_approved: bool = True,
+    deliverable_ids: Optional[Collection[UUID]] = None,
+    columns: Optional[tuple[str, ...]] = None
+) -> list[StorePublic] | list[dict]:
+    """Store listing; ``deliverable_ids`` keeps those stores and stores without active zones.
+
+    With ``columns`` only those are selected and rows come back as plain dicts.
+    """
+    zone_filter = deliverable_ids is not None
+    sql = _store_list_sql(only_active, only_approved, bool(search), zone_filter, columns or STORE_PUBLIC_COLUMNS)
+
+    args: list = []
+    if search:
+        args.append(f"%{search}%")
+    if zone_filter:
+        args.append(list(deliverable_ids))
+    args.extend((limit, skip))
+
+    records = await _fetch(session, sql, *args)
+    if columns:
+        return [dict(record) for record in records]
+    return [StorePublic(**record) for record in records]
+
+
+@lru_cache(maxsize=None)
+def _principal_sql(model) -> str:
+    columns = [column.name for column in model.__table__.columns]
+    return f"SELECT {_select_list(columns)} FROM {PRINCIPAL_TABLES[model]} WHERE id = $1"
+
+
+async def fetch_principal(session: AsyncSession, model, principal_id: UUID):
+    """Load a user, store or admin row as a detached model instance.
+
+    The instance is not attached to the session; handlers that need to
+    persist changes must write through an explicit statement.
+    """
+    record = await _fetch(session, _principal_sql(model), principal_id, one=True)
+    if record is None:
+        return None
+    return model(**record)
@@ -0,0 +1,56 @@
+"""Prometheus metrics.
+
+Under ``python -m app.server`` the launcher sets ``PROMETHEUS_MULTIPROC_DIR``
+before the app is imported, so every worker writes its samples to
+memory-mapped files in that directory and ``render`` aggregates them, whichever
+worker answers the scrape. Without it (plain ``uvicorn``) the default
+in-process registry is served.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+
+# Every metric has labels: a metric without labels creates its value (and,
+# in multiprocess mode, its file) at import, in the launcher's master.
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served.",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ["method", "route"]
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements run while serving a request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time a request spent waiting on SQL statements.",
+    ["method", "route"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5)
+)
+
+
+def render() -> tuple[bytes, str]:
+    """Metrics in the Prometheus text format, and their content type."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
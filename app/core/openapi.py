@@ -0,0 +1,125 @@
+"""OpenAPI schema generated at build time and served from disk.
+
+FastAPI builds the schema from every route and model on the first
+``/openapi.json`` or ``/docs`` hit. The Docker image writes it once at
+build time instead:
+
+    python -m app.core.openapi railway_main:app openapi.json
+
+and ``use_cached_openapi`` makes the app serve that file. The file is
+stamped with a fingerprint of the code the schema is built from; one whose
+fingerprint differs from the running app's is ignored and the schema is
+built as usual.
+"""
+import hashlib
+import json
+import sys
+from importlib import import_module
+from pathlib import Path
+from typing import Optional, Union
+
+import fastapi
+import pydantic
+from fastapi import FastAPI
+
+FINGERPRINT_KEY = "x-build-fingerprint"
+
+
+def _documented_routes(app: FastAPI) -> list:
+    return [route for route in app.routes if getattr(route, "include_in_schema", False)]
+
+
+def _source_root(module_name: str) -> Optional[Path]:
+    """The package directory (or lone module file) ``module_name`` belongs to."""
+    module = sys.modules.get(module_name.partition(".")[0])
+    module_file = getattr(module, "__file__", None)
+    if module_file is None:
+        return None
+    path = Path(module_file)
+    return path.parent if path.name == "__init__.py" else path
+
+
+def _describe(value) -> str:
+    """``repr`` of a route attribute, with ``__main__`` named after its file.
+
+    ``python railway_main.py`` defines the endpoints in ``__main__`` while
+    the build step imports them from ``railway_main``; both must hash alike.
+    """
+    text = repr(value)
+    main_file = getattr(sys.modules.get("__main__"), "__file__", None)
+    if main_file is not None:
+        text = text.replace("__main__.", f"{Path(main_file).stem}.")
+    return text
+
+
+def fingerprint(app: FastAPI) -> str:
+    """Hash of everything the schema is built from.
+
+    Covers the app's metadata, the FastAPI and pydantic versions, the route
+    table, and the source of every package that defines a documented
+    endpoint or its request or response model.
+    """
+    digest = hashlib.sha256()
+    for part in (app.title, app.version, app.description, fastapi.__version__, pydantic.VERSION):
+        digest.update(f"{part}\0".encode())
+
+    modules = set()
+    for route in _documented_routes(app):
+        body_field = getattr(route, "body_field", None)
+        body_type = getattr(body_field, "type_", None)
+        digest.update(
+            f"{route.path_format} {sorted(route.methods or ())} {route.endpoint.__qualname__} "
+            f"{_describe(route.response_model)} {_describe(body_type)}\0".encode()
+        )
+        for source in (route.endpoint, route.response_model, body_type):
+            module_name = getattr(source, "__module__", None)
+            if module_name and module_name not in ("builtins", "typing"):
+                modules.add(module_name)
+
+    roots = {root for root in map(_source_root, modules) if root is not None}
+    for root in sorted(roots):
+        for file in sorted(root.rglob("*.py")) if root.is_dir() else [root]:
+            digest.update(f"{file.relative_to(root.parent)}\0".encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def load_schema(path: Union[str, Path]) -> Optional[dict]:
+    try:
+        with open(path, "rb") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def use_cached_openapi(app: FastAPI, path: Union[str, Path]) -> None:
+    """Serve the schema in ``path``, read on the first schema request."""
+    generate = app.openapi
+
+    def openapi() -> dict:
+        if app.openapi_schema is None:
+            schema = load_schema(path)
+            if schema is not None and schema.pop(FINGERPRINT_KEY, None) == fingerprint(app):
+                app.openapi_schema = schema
+            else:
+                generate()
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+def write_schema(app: FastAPI, path: Union[str, Path]) -> None:
+    schema = {**app.openapi(), FINGERPRINT_KEY: fingerprint(app)}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(schema, file, separators=(",", ":"))
+
+
+def main(argv: list[str]) -> None:
+    if len(argv) != 2 or ":" not in argv[0]:
+        sys.exit("usage: python -m app.core.openapi module:app output.json")
+    module, attribute = argv[0].split(":", 1)
+    write_schema(getattr(import_module(module), attribute), argv[1])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import math
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import greenlet_spawn
+from sqlalchemy.util import queue as sqla_queue
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is +Inf.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """Counters and a wait-time histogram for one connection pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.pre_ping_failures = 0
+        self.validation_failures = 0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_total_ms = 0.0
+        self.peak_checked_out = 0
+
+    def observe_wait(self, elapsed_ms: float) -> None:
+        self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+        self.wait_total_ms += elapsed_ms
+
+    def snapshot(self, pool: "InstrumentedAsyncPool") -> dict:
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip((*WAIT_BUCKETS_MS, "+Inf"), self.wait_buckets):
+            cumulative += count
+            histogram[str(bound)] = cumulative
+
+        return {
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "pre_ping_failures": self.pre_ping_failures,
+            "validation_failures": self.validation_failures,
+            "pre_ping": bool(pool._pre_ping),
+            "wait_ms": {
+                "count": cumulative,
+                "sum": round(self.wait_total_ms, 3),
+                "buckets": histogram,
+            },
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that times checkouts and can be resized live."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.observe_wait((time.perf_counter() - started) * 1000)
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def resize(self, target: int) -> None:
+        """Change how many idle connections are kept, keeping the hard limit.
+
+        Total connections allowed stays ``size + max_overflow``; the
+        connection count bookkeeping (``_overflow``) is shifted so that the
+        number of open connections is unchanged. Surplus idle connections
+        are closed as they are returned.
+        """
+        current = self._pool.maxsize
+        if target == current:
+            return
+        limit = current + self._max_overflow
+        target = max(1, min(target, limit))
+        with self._overflow_lock:
+            self._pool.maxsize = target
+            if "_queue" in self._pool.__dict__:
+                # AsyncAdaptedQueue creates its asyncio.Queue lazily with the old maxsize.
+                self._pool._queue._maxsize = target
+            self._max_overflow = limit - target
+            self._overflow += current - target
+
+        while self._pool.qsize() > target:
+            try:
+                record = self._pool.get(False)
+            except sqla_queue.Empty:
+                break
+            record.close()
+            self._dec_overflow()
+
+    def validate_idle(self) -> int:
+        """Ping every idle connection once, invalidating the broken ones.
+
+        Must run inside a greenlet (``greenlet_spawn``). Returns the number
+        of connections that failed.
+        """
+        failures = 0
+        for _ in range(self._pool.qsize()):
+            try:
+                record = self._pool.get(False)
+            except sqla_queue.Empty:
+                break
+            try:
+                if record.dbapi_connection is not None:
+                    try:
+                        alive = self._dialect._do_ping_w_event(record.dbapi_connection)
+                    except Exception:
+                        alive = False
+                    if not alive:
+                        failures += 1
+                        record.invalidate()
+            finally:
+                self._do_return_conn(record)
+        self.metrics.validation_failures += failures
+        return failures
+
+
+def instrument_engine(engine) -> PoolMetrics:
+    """Attach pool event listeners that feed ``pool.metrics``."""
+    pool = engine.sync_engine.pool
+    metrics = pool.metrics
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        metrics.peak_checked_out = max(metrics.peak_checked_out, engine.sync_engine.pool.checkedout())
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def on_error(context):
+        if context.is_pre_ping:
+            metrics.pre_ping_failures += 1
+
+    return metrics
+
+
+class AdaptivePoolController:
+    """Periodically sizes the pool to observed concurrency and validates idle connections.
+
+    Replaces per-checkout pre-ping: every ``interval`` seconds the idle
+    connections are pinged in the background, and the retained pool size is
+    set to the peak number of checked-out connections seen since the last
+    tick plus headroom, clamped to ``[min_size, max_size]``.
+    """
+
+    def __init__(self, engine, min_size: int, max_size: int, interval: float, headroom: float = 1.25) -> None:
+        self.engine = engine
+        self.min_size = min_size
+        self.max_size = max_size
+        self.interval = interval
+        self.headroom = headroom
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pool(self) -> InstrumentedAsyncPool:
+        return self.engine.sync_engine.pool
+
+    def target_size(self, peak: int) -> int:
+        return max(self.min_size, min(self.max_size, math.ceil(peak * self.headroom)))
+
+    async def tick(self) -> None:
+        pool = self.pool
+        target = self.target_size(pool.metrics.peak_checked_out)
+        pool.metrics.peak_checked_out = pool.checkedout()
+        await greenlet_spawn(pool.resize, target)
+        await greenlet_spawn(pool.validate_idle)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Connection pool maintenance failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
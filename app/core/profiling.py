@@ -0,0 +1,130 @@
+"""On-demand request profiling.
+
+An admin stores a ``ProfilingRule`` in ``PROFILING_DIR/rule.json``; every
+worker's ``ProfilingMiddleware`` rereads the file at most once a second, so
+one request to the admin endpoint turns profiling on (or off) for all of
+them. Matching requests run under a pyinstrument sampling profiler in async
+mode, which only charges a request for the time its own task was running or
+awaiting. Each profile is written next to a small ``.meta.json`` describing
+the request, and the oldest are deleted past ``PROFILING_MAX_PROFILES``.
+"""
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.models import ProfileInfo, ProfilingRule
+
+RULE_FILE = "rule.json"
+META_SUFFIX = ".meta.json"
+FORMATS = {
+    "speedscope": (".speedscope.json", "application/json"),
+    "html": (".html", "text/html"),
+}
+PROFILE_NAME = re.compile(r"^\d+-\d+-[0-9a-f]+$")
+
+
+def profiler_available() -> bool:
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _render(session, output_format: str) -> str:
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+
+    renderer = SpeedscopeRenderer() if output_format == "speedscope" else HTMLRenderer()
+    return renderer.render(session)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    partial = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    partial.write_text(text)
+    os.replace(partial, path)
+
+
+class ProfileStore:
+    """Profiling rule and saved profiles in one local directory."""
+
+    def __init__(self, directory: str, output_format: str = "speedscope", max_profiles: int = 200) -> None:
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown profile format {output_format!r}; use one of {sorted(FORMATS)}")
+        self.directory = Path(directory)
+        self.output_format = output_format
+        self.max_profiles = max_profiles
+
+    @property
+    def rule_path(self) -> Path:
+        return self.directory / RULE_FILE
+
+    def read_rule(self) -> Optional[ProfilingRule]:
+        """The stored rule, or ``None`` if there is none or it expired."""
+        try:
+            rule = ProfilingRule.model_validate_json(self.rule_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return rule if rule.expires_at > datetime.now(timezone.utc) else None
+
+    def write_rule(self, rule: ProfilingRule) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.rule_path, rule.model_dump_json())
+
+    def clear_rule(self) -> None:
+        self.rule_path.unlink(missing_ok=True)
+
+    def save(self, session, info: ProfileInfo) -> None:
+        """Render ``session`` and store it under ``info.name``."""
+        suffix, _ = FORMATS[info.format]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile = self.directory / f"{info.name}{suffix}"
+        _write_atomic(profile, _render(session, info.format))
+        info.size = profile.stat().st_size
+        _write_atomic(self.directory / f"{info.name}{META_SUFFIX}", info.model_dump_json())
+        self._prune()
+
+    def recent(self, limit: int) -> list[ProfileInfo]:
+        """Newest profiles first."""
+        profiles = []
+        for meta in sorted(self._metas(), reverse=True)[:limit]:
+            try:
+                profiles.append(ProfileInfo.model_validate_json(meta.read_bytes()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def find(self, name: str) -> Optional[tuple[Path, str]]:
+        """Path and media type of a saved profile."""
+        if not PROFILE_NAME.match(name):
+            return None
+        for suffix, media_type in FORMATS.values():
+            path = self.directory / f"{name}{suffix}"
+            if path.is_file():
+                return path, media_type
+        return None
+
+    def new_name(self) -> str:
+        # Millisecond timestamp first, so names sort by age across workers
+        return f"{time.time_ns() // 1_000_000}-{os.getpid()}-{os.urandom(3).hex()}"
+
+    def _metas(self) -> list[Path]:
+        return list(self.directory.glob(f"*{META_SUFFIX}"))
+
+    def _prune(self) -> None:
+        metas = sorted(self._metas())
+        for meta in metas[:max(0, len(metas) - self.max_profiles)]:
+            name = meta.name[:-len(META_SUFFIX)]
+            for suffix, _ in FORMATS.values():
+                (self.directory / f"{name}{suffix}").unlink(missing_ok=True)
+            meta.unlink(missing_ok=True)
+
+
+profile_store = ProfileStore(
+    settings.PROFILING_DIR,
+    output_format=settings.PROFILING_FORMAT,
+    max_profiles=settings.PROFILING_MAX_PROFILES,
+)
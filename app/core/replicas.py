@@ -0,0 +1,83 @@
+import asyncio
+import itertools
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """Round-robin over read replicas, skipping the ones that failed a health check.
+
+    Replicas are pinged every ``interval`` seconds; a replica that errors
+    during a request is taken out of rotation until the next successful
+    ping.
+    """
+
+    def __init__(self, engines: list, interval: float) -> None:
+        self.engines = engines
+        self.interval = interval
+        self.session_factories = [
+            sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in engines
+        ]
+        self.healthy = [True] * len(engines)
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[int]:
+        """Index of the next healthy replica, or ``None`` if none is available."""
+        count = len(self.engines)
+        start = next(self._counter)
+        for offset in range(count):
+            index = (start + offset) % count
+            if self.healthy[index]:
+                return index
+        return None
+
+    def mark_unhealthy(self, index: int) -> None:
+        if self.healthy[index]:
+            logger.warning("Read replica %d marked unhealthy", index)
+        self.healthy[index] = False
+
+    async def check(self) -> None:
+        for index, engine in enumerate(self.engines):
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            except Exception:
+                self.mark_unhealthy(index)
+            else:
+                if not self.healthy[index]:
+                    logger.info("Read replica %d is healthy again", index)
+                self.healthy[index] = True
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.engines and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def dispose(self) -> None:
+        await self.stop()
+        for engine in self.engines:
+            await engine.dispose()
@@ -3,8 +3,6 @@ from typing import Any, Union, Optional
 import hashlib
 import secrets
 
-from jose import jwt
-
 from app.core.config import settings
 
 
@@ -19,6 +17,9 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
+    # jose pulls in its cryptography backend on import; load it on first use
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
@@ -43,6 +44,8 @@ def get_password_hash(password: str) -> str:
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode JWT token."""
+    from jose import jwt
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import heapq
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy import MetaData
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+T = TypeVar("T")
+
+# Store-scoped tables, split across shards by store_id. Everything else
+# (users, admins, categories, stores, addresses, zones) stays on the
+# directory database, DATABASE_URL.
+SHARDED_TABLES = (
+    "products",
+    "orders",
+    "order_items",
+    "cart_items",
+    "store_daily_sales",
+    "store_product_daily_sales",
+)
+
+
+def shard_for_store(store_id: UUID, names: Iterable[str], pins: Optional[dict[str, str]] = None) -> str:
+    """Shard holding ``store_id``: its pin if it has one, else by rendezvous hashing.
+
+    Rendezvous hashing only moves about 1/N of the stores when a shard is
+    added; pin the ones that should stay put until their data is moved.
+    """
+    if pins and str(store_id) in pins:
+        return pins[str(store_id)]
+    return max(
+        names,
+        key=lambda name: hashlib.blake2b(f"{name}:{store_id}".encode(), digest_size=8).digest()
+    )
+
+
+def shard_metadata(metadata: MetaData) -> MetaData:
+    """Copy of the store-scoped tables without foreign keys into the directory."""
+    shard = MetaData()
+    for name in SHARDED_TABLES:
+        table = metadata.tables[name].to_metadata(shard)
+        for constraint in list(table.foreign_key_constraints):
+            if constraint.elements[0].target_fullname.split(".")[0] not in SHARDED_TABLES:
+                table.constraints.discard(constraint)
+                for foreign_key in constraint.elements:
+                    table.foreign_keys.discard(foreign_key)
+                    foreign_key.parent.foreign_keys.discard(foreign_key)
+    return shard
+
+
+def merge_sorted(results: Iterable[Iterable[T]], key: Callable[[T], object], reverse: bool = False) -> list[T]:
+    """Merge per-shard lists that are already sorted by ``key``."""
+    return list(heapq.merge(*results, key=key, reverse=reverse))
+
+
+async def merge_sorted_chunks(
+    streams: list[AsyncIterator[list[T]]],
+    key: Callable[[T], object]
+) -> AsyncIterator[list[T]]:
+    """Merge chunked streams sorted by ``key`` into one sorted chunked stream.
+
+    Streams whose buffer ran dry are refilled concurrently; every row no
+    greater than the smallest buffered tail is then safe to emit.
+    """
+    buffers = [deque() for _ in streams]
+    live = set(range(len(streams)))
+
+    async def refill(index: int) -> None:
+        while not buffers[index]:
+            chunk = await anext(streams[index], None)
+            if chunk is None:
+                live.discard(index)
+                return
+            buffers[index].extend(chunk)
+
+    while True:
+        await asyncio.gather(*(refill(index) for index in list(live) if not buffers[index]))
+        if not live and not any(buffers):
+            return
+        bound = min((key(buffers[index][-1]) for index in live if buffers[index]), default=None)
+
+        chunk = []
+        for index, buffer in enumerate(buffers):
+            while buffer and (bound is None or key(buffer[0]) <= bound):
+                chunk.append(buffer.popleft())
+        chunk.sort(key=key)
+        if chunk:
+            yield chunk
+
+
+class ShardRouter:
+    """Maps stores to shard databases and fans queries out across all of them."""
+
+    def __init__(self, engines: dict, pins: Optional[dict[str, str]] = None) -> None:
+        self.engines = engines
+        self.names = sorted(engines)
+        self.pins = pins or {}
+        self.session_factories = {
+            name: sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for name, engine in engines.items()
+        }
+        unknown = set(self.pins.values()) - set(self.names)
+        if engines and unknown:
+            raise ValueError(f"Stores pinned to unknown shards: {', '.join(sorted(unknown))}")
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def shard_for(self, store_id: UUID) -> str:
+        return shard_for_store(store_id, self.names, self.pins)
+
+    def session(self, store_id: UUID) -> AsyncSession:
+        return self.session_factories[self.shard_for(store_id)]()
+
+    async def fan_out(self, query: Callable[[AsyncSession], Awaitable[T]]) -> list[T]:
+        """Run ``query`` on every shard concurrently, each with its own session."""
+        async def run(name: str) -> T:
+            async with self.session_factories[name]() as session:
+                return await query(session)
+
+        return await asyncio.gather(*(run(name) for name in self.names))
+
+    async def dispose(self) -> None:
+        for engine in self.engines.values():
+            await engine.dispose()
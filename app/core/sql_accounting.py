@@ -0,0 +1,114 @@
+"""Per-request SQL accounting.
+
+Engines get cursor listeners that add every statement and its time to the
+``QueryStats`` of the current request, held in a contextvar. SQLAlchemy runs
+the listeners inside the greenlet of the awaiting task, which shares that
+task's context, so statements land on the request that issued them. The
+raw asyncpg queries in ``app.core.fastpath`` skip the listeners and call
+``record`` themselves. Outside a request (background jobs, startup) there
+are no stats and nothing is recorded.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+
+SERVER_TIMING_NAME = "db"
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """Statements run while serving one request."""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        # Bound parameters are placeholders in the SQL text, so equal text is
+        # the same statement shape run with different values.
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run more than ``threshold`` times, most repeated first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        return f'{SERVER_TIMING_NAME};dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def record(statement: str, elapsed: float) -> None:
+    """Add a statement run outside SQLAlchemy to the current request's stats."""
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements run inside the block."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def instrument_queries(engine) -> None:
+    """Feed the current ``QueryStats`` from every statement the engine executes."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def on_before_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current.get() is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def on_after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            record(statement, time.perf_counter() - started)
+
+
+_SERVER_TIMING_ENTRY = re.compile(r'dur=(?P<dur>[\d.]+);desc="(?P<count>\d+) queries"')
+
+
+def parse_server_timing(header: str) -> Optional[tuple[int, float]]:
+    """``(queries, milliseconds)`` from a ``Server-Timing`` header, if it has the db entry."""
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        if name != SERVER_TIMING_NAME:
+            continue
+        match = _SERVER_TIMING_ENTRY.search(params)
+        if match:
+            return int(match["count"]), float(match["dur"])
+    return None
+
+
+def assert_query_budget(response, max_queries: int) -> int:
+    """Fail unless ``response`` ran at most ``max_queries`` statements; returns the count.
+
+    For tests: reads the ``Server-Timing`` header the accounting middleware adds.
+    """
+    timing = parse_server_timing(response.headers.get("server-timing", ""))
+    assert timing is not None, "response has no db Server-Timing entry (is SQL_ACCOUNTING_ENABLED on?)"
+    queries, _ = timing
+    assert queries <= max_queries, (
+        f"{response.request.method} {response.request.url.path} ran {queries} queries, budget is {max_queries}"
+    )
+    return queries
@@ -0,0 +1,46 @@
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+
+class StatementCacheMetrics:
+    """Hit/miss counters for the engine's compiled statement cache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def observe(self, context) -> None:
+        if context.cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif context.cache_hit is CACHE_MISS:
+            self.misses += 1
+        else:
+            # Caching disabled, or driver-level SQL without a cache key.
+            self.uncached += 1
+
+    def snapshot(self, sync_engine) -> dict:
+        cache = sync_engine._compiled_cache
+        cached = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_rate": round(self.hits / cached, 4) if cached else None,
+            "size": len(cache) if cache is not None else 0,
+            "capacity": cache.capacity if cache is not None else 0,
+        }
+
+
+def instrument_statement_cache(engine) -> StatementCacheMetrics:
+    """Count compiled-cache hits for every statement the engine executes."""
+    metrics = StatementCacheMetrics()
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            metrics.observe(context)
+
+    sync_engine.statement_metrics = metrics
+    return metrics
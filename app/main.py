@@ -1,11 +1,25 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 from app.api.v1.api import api_router
+from app.core import metrics
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import (
+    init_db, close_db, get_pool_stats, get_statement_cache_stats, pool_controller, replica_router
+)
+from app.core.openapi import use_cached_openapi
+from app.core.profiling import profile_store
+from app.middleware.compression import CompressedBodyCache, CompressionMiddleware
+from app.middleware.consistency import ReadYourWritesMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware, create_shared_store
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.sql_accounting import SQLAccountingMiddleware
+from app.services.dispatch import planner
+from app.services.partitions import partition_maintainer
 
 
 @asynccontextmanager
@@ -15,11 +29,21 @@ async def lifespan(app: FastAPI):
     print("Starting up Collique Delivery API...")
     # Skip database table creation as tables already exist
     print("Using existing database tables...")
+    if pool_controller is not None:
+        pool_controller.start()
+    replica_router.start()
+    # One process per deployment runs these; the others read the shared plan file
+    if settings.SERVER_BACKGROUND_TASKS and settings.DISPATCH_PLANNER_ENABLED:
+        planner.start(settings.DISPATCH_PLANNING_INTERVAL_SECONDS)
+    if settings.SERVER_BACKGROUND_TASKS and settings.ORDER_PARTITION_MAINTENANCE_ENABLED:
+        partition_maintainer.start(settings.ORDER_PARTITION_MAINTENANCE_INTERVAL_SECONDS)
 
     yield
 
     # Shutdown
     print("Shutting down...")
+    await planner.stop()
+    await partition_maintainer.stop()
     await close_db()
     print("Database connections closed")
 
@@ -30,9 +54,27 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     lifespan=lifespan,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # Response models are serialized by pydantic; orjson only writes the bytes
+    default_response_class=ORJSONResponse
 )
 
+if settings.OPENAPI_SCHEMA_FILE:
+    use_cached_openapi(app, settings.OPENAPI_SCHEMA_FILE)
+
+# Replay retried POSTs sent with an Idempotency-Key
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware, shared_store=create_shared_store())
+
+# Keep clients on the primary right after they write
+if replica_router:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Compress outside the idempotency layer so replays follow each client's Accept-Encoding
+compression_cache = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, cache=compression_cache)
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -43,6 +85,22 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Profile requests matching the admin's rule (off until one is set)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, store=profile_store, interval=settings.PROFILING_INTERVAL)
+
+# Server-Timing header, per-route query histograms and N+1 warnings
+if settings.SQL_ACCOUNTING_ENABLED:
+    app.add_middleware(
+        SQLAccountingMiddleware,
+        repeat_threshold=settings.SQL_REPEAT_WARNING_THRESHOLD,
+        record_metrics=settings.METRICS_ENABLED,
+    )
+
+# Outermost, so latency covers every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -74,5 +132,41 @@ async def health_check():
     }
 
 
+@app.get("/health/pool")
+async def pool_health():
+    """Database connection pool metrics."""
+    return {
+        "success": True,
+        "data": get_pool_stats()
+    }
+
+
+@app.get("/health/statements")
+async def statement_cache_health():
+    """Compiled statement cache hit rates."""
+    return {
+        "success": True,
+        "data": get_statement_cache_stats()
+    }
+
+
+@app.get("/health/compression")
+async def compression_health():
+    """Compressed body cache usage."""
+    return {
+        "success": True,
+        "data": compression_cache.stats()
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    body, content_type = metrics.render()
+    return Response(body, headers={"Content-Type": content_type})
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
\ No newline at end of file
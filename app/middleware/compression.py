@@ -0,0 +1,280 @@
+import asyncio
+import gzip
+import hashlib
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+UNCOMPRESSIBLE_STATUSES = {204, 304}
+
+
+@dataclass
+class Codec:
+    compress: Callable[[bytes], bytes]
+    # Returns an object with ``compress(chunk)`` and ``flush()`` for streamed bodies
+    stream: Callable[[], Any]
+
+
+class _BrotliStream:
+    def __init__(self, brotli) -> None:
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _gzip() -> Codec:
+    return Codec(
+        compress=lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+        stream=lambda: zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    )
+
+
+def _brotli() -> Codec:
+    import brotli
+    return Codec(
+        compress=lambda body: brotli.compress(body, quality=BROTLI_QUALITY),
+        stream=lambda: _BrotliStream(brotli)
+    )
+
+
+def _zstd() -> Codec:
+    import zstandard
+    # A ZstdCompressor must not be used by two threads or streams at once;
+    # building one per body is cheap next to compressing it.
+    return Codec(
+        compress=lambda body: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body),
+        stream=lambda: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    )
+
+
+CODECS = {"gzip": _gzip, "br": _brotli, "zstd": _zstd}
+
+
+def load_codecs(names: list[str]) -> dict[str, Codec]:
+    """Codecs for ``names`` in preference order, skipping ones not installed."""
+    codecs = {}
+    for name in names:
+        try:
+            codecs[name] = CODECS[name]()
+        except ImportError:
+            continue
+    return codecs
+
+
+def negotiate(accept_encoding: str, available: list[str]) -> Optional[str]:
+    """Pick the encoding for an ``Accept-Encoding`` header.
+
+    Highest q-value wins; ties go to the earlier entry of ``available``.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in available:
+        quality = weights.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (body digest, encoding), bounded in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+
+    def get(self, digest: bytes, encoding: str) -> Optional[bytes]:
+        body = self._entries.get((digest, encoding))
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((digest, encoding))
+        self.hits += 1
+        return body
+
+    def set(self, digest: bytes, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._entries.pop((digest, encoding), None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[(digest, encoding)] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+def _header(headers: list[tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """Compress responses for clients that accept gzip, brotli or zstd.
+
+    Only bodies of allowlisted content types and at least ``min_size``
+    bytes are compressed. Compressed ``GET`` bodies are cached by content
+    digest, so an unchanged listing is compressed once per encoding no matter
+    how many clients fetch it; ``Cache-Control: no-store`` responses are not
+    cached. Bodies of ``thread_threshold`` bytes or more are compressed in a
+    worker thread (zlib, brotli and zstd release the GIL). Streamed responses
+    are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app,
+        encodings: Optional[list[str]] = None,
+        min_size: Optional[int] = None,
+        content_types: Optional[list[str]] = None,
+        thread_threshold: Optional[int] = None,
+        cache: Optional[CompressedBodyCache] = None
+    ) -> None:
+        self.app = app
+        self.codecs = load_codecs(encodings or settings.COMPRESSION_ENCODINGS)
+        self.encodings = list(self.codecs)
+        self.min_size = settings.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        self.content_types = tuple(
+            content_type.encode() for content_type in (content_types or settings.COMPRESSION_CONTENT_TYPES)
+        )
+        self.thread_threshold = (
+            settings.COMPRESSION_THREAD_THRESHOLD if thread_threshold is None else thread_threshold
+        )
+        self.cache = cache or CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = _header(scope["headers"], b"accept-encoding")
+        encoding = negotiate(accept_encoding.decode("latin-1"), self.encodings) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        codec = self.codecs[encoding]
+        cacheable_request = scope["method"] == "GET"
+        start = None
+        stream = None
+        passthrough = False
+
+        async def send_compressed(message) -> None:
+            nonlocal start, stream, passthrough
+
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is not None:
+                chunk = await self._run(stream.compress, body)
+                if not more_body:
+                    chunk += stream.flush()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = list(start.get("headers", []))
+            if not self._compressible(start["status"], headers) or (not more_body and len(body) < self.min_size):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers = [
+                (name, value) for name, value in headers
+                if name.lower() not in (b"content-length", b"vary")
+            ]
+            headers.append((b"content-encoding", encoding.encode()))
+            headers.append((b"vary", _vary(start.get("headers", []))))
+
+            if more_body:
+                stream = codec.stream()
+                await send({**start, "headers": headers})
+                chunk = await self._run(stream.compress, body)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                return
+
+            cacheable = (
+                cacheable_request and start["status"] == 200
+                and b"no-store" not in (_header(headers, b"cache-control") or b"").lower()
+            )
+            compressed = await self._compress(codec, encoding, body, cacheable)
+            headers.append((b"content-length", str(len(compressed)).encode()))
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, status: int, headers: list[tuple[bytes, bytes]]) -> bool:
+        if status < 200 or status in UNCOMPRESSIBLE_STATUSES:
+            return False
+        if _header(headers, b"content-encoding") is not None:
+            return False
+        content_type = (_header(headers, b"content-type") or b"").lower()
+        return content_type.startswith(self.content_types)
+
+    async def _compress(self, codec: Codec, encoding: str, body: bytes, cacheable: bool) -> bytes:
+        if not cacheable:
+            return await self._run(codec.compress, body)
+
+        digest = await self._run(_digest, body)
+        compressed = self.cache.get(digest, encoding)
+        if compressed is None:
+            compressed = await self._run(codec.compress, body)
+            self.cache.set(digest, encoding, compressed)
+        return compressed
+
+    async def _run(self, function: Callable[[bytes], bytes], data: bytes) -> bytes:
+        if len(data) >= self.thread_threshold:
+            return await asyncio.to_thread(function, data)
+        return function(data)
+
+
+def _digest(body: bytes) -> bytes:
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def _vary(headers: list[tuple[bytes, bytes]]) -> bytes:
+    vary = _header(headers, b"vary")
+    if not vary:
+        return b"Accept-Encoding"
+    if b"accept-encoding" in vary.lower():
+        return vary
+    return vary + b", Accept-Encoding"
@@ -0,0 +1,50 @@
+import time
+
+from app.core.config import settings
+
+PRIMARY_COOKIE = "db_primary_until"
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client to the primary database for a moment after it writes.
+
+    Successful unsafe requests get a short-lived cookie; ``get_read_db``
+    sees it and serves that client's reads from the primary until replicas
+    have caught up. Clients that do not keep cookies can send
+    ``X-Read-Consistency: strong`` instead.
+    """
+
+    def __init__(self, app, sticky_seconds: int = None) -> None:
+        self.app = app
+        self.sticky_seconds = sticky_seconds or settings.REPLICA_STICKY_SECONDS
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = int(time.time()) + self.sticky_seconds
+                cookie = (
+                    f"{PRIMARY_COOKIE}={until}; Max-Age={self.sticky_seconds}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def wants_primary(headers: dict[str, str], cookies: dict[str, str]) -> bool:
+    """Whether a read must see the client's own recent writes."""
+    if headers.get("x-read-consistency", "").lower() == "strong":
+        return True
+    try:
+        return int(cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
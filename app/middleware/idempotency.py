@@ -0,0 +1,436 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from starlette.requests import ClientDisconnect
+
+from app.core.config import settings
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAY_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# Response headers worth replaying; hop-by-hop and per-response headers are dropped.
+REPLAYED_HEADERS = {b"content-type", b"location", b"cache-control"}
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+    def dumps(self) -> bytes:
+        """Compact encoding: JSON metadata line followed by the zlib body."""
+        meta = json.dumps({
+            "f": self.fingerprint,
+            "s": self.status,
+            "h": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers],
+        }, separators=(",", ":")).encode()
+        return meta + b"\n" + zlib.compress(self.body, 6)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "StoredResponse":
+        meta, _, body = data.partition(b"\n")
+        decoded = json.loads(meta)
+        return cls(
+            fingerprint=decoded["f"],
+            status=decoded["s"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in decoded["h"]],
+            body=zlib.decompress(body),
+        )
+
+
+class MemoryIdempotencyStore:
+    """In-process LRU with per-entry expiry, used as L1 in front of a shared store."""
+
+    def __init__(self, max_entries: int, ttl: int) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Delete the lock only while it still holds our token: once it expired,
+# another worker may have taken it.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisIdempotencyStore:
+    """Shared store for multi-worker deployments (requires ``redis``)."""
+
+    def __init__(self, url: str, ttl: int) -> None:
+        import redis.asyncio as redis
+
+        self.ttl = ttl
+        self._redis = redis.from_url(url)
+        self._release_lock = self._redis.register_script(RELEASE_LOCK_SCRIPT)
+        # The middleware runs one request per key at a time in a process
+        self._lock_tokens: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(f"idempotency:{key}")
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self._redis.set(f"idempotency:{key}", value, ex=self.ttl)
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        token = os.urandom(16).hex().encode()
+        acquired = bool(await self._redis.set(
+            f"idempotency-lock:{key}", token, nx=True, px=int(timeout * 1000)
+        ))
+        if acquired:
+            self._lock_tokens[key] = token
+        return acquired
+
+    async def release(self, key: str) -> None:
+        token = self._lock_tokens.pop(key, None)
+        if token is not None:
+            await self._release_lock(keys=[f"idempotency-lock:{key}"], args=[token])
+
+
+class DatabaseIdempotencyStore:
+    """Shared store backed by the ``idempotency_keys`` table.
+
+    A row without a response is an in-flight reservation; it expires after
+    the wait timeout so a crashed worker cannot block the key forever.
+    """
+
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[bytes]:
+        from sqlalchemy import select
+
+        from app.core.database import AsyncSessionLocal
+        from app.models import IdempotencyKey
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(IdempotencyKey.response).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.expires_at > datetime.now(timezone.utc)
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def set(self, key: str, value: bytes) -> None:
+        from sqlalchemy.dialects.postgresql import insert
+
+        from app.core.database import AsyncSessionLocal
+        from app.models import IdempotencyKey
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        stmt = insert(IdempotencyKey).values(key=key, response=value, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"response": value, "expires_at": expires_at}
+        )
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        from sqlalchemy.dialects.postgresql import insert
+
+        from app.core.database import AsyncSessionLocal
+        from app.models import IdempotencyKey
+
+        now = datetime.now(timezone.utc)
+        stmt = insert(IdempotencyKey).values(
+            key=key, response=None, expires_at=now + timedelta(seconds=timeout)
+        )
+        # Take over reservations (and stored responses) that have expired.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"response": None, "expires_at": stmt.excluded.expires_at},
+            where=IdempotencyKey.expires_at <= now
+        ).returning(IdempotencyKey.key)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.scalar_one_or_none() is not None
+
+    async def release(self, key: str) -> None:
+        from sqlalchemy import delete
+
+        from app.core.database import AsyncSessionLocal
+        from app.models import IdempotencyKey
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.response.is_(None)
+                )
+            )
+            await session.commit()
+
+
+def create_shared_store():
+    """Build the shared backend configured in ``IDEMPOTENCY_BACKEND``, if any."""
+    backend = settings.IDEMPOTENCY_BACKEND
+    if backend == "memory":
+        return None
+    if backend == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("IDEMPOTENCY_BACKEND=redis requires REDIS_URL")
+        return RedisIdempotencyStore(settings.REDIS_URL, settings.IDEMPOTENCY_TTL_SECONDS)
+    if backend == "database":
+        return DatabaseIdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS)
+    raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {backend}")
+
+
+class IdempotencyMiddleware:
+    """Replay stored responses for requests that repeat an ``Idempotency-Key``.
+
+    The key is scoped by method, path and ``Authorization`` header, and the
+    request body is fingerprinted so a reused key with a different payload is
+    rejected instead of replayed. Concurrent duplicates in this process wait
+    on the in-flight request; duplicates on other workers wait on the shared
+    store's reservation. Only responses below 500 are stored.
+    """
+
+    def __init__(
+        self,
+        app,
+        methods: tuple[str, ...] = ("POST", "PATCH"),
+        shared_store=None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_body_size: Optional[int] = None,
+        max_request_size: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+    ) -> None:
+        self.app = app
+        self.methods = set(methods)
+        self.ttl = ttl or settings.IDEMPOTENCY_TTL_SECONDS
+        self.max_body_size = max_body_size or settings.IDEMPOTENCY_MAX_BODY_SIZE
+        self.max_request_size = max_request_size or settings.IDEMPOTENCY_MAX_REQUEST_SIZE
+        self.wait_timeout = wait_timeout or settings.IDEMPOTENCY_WAIT_TIMEOUT
+        self.local = MemoryIdempotencyStore(
+            max_entries or settings.IDEMPOTENCY_MAX_ENTRIES, self.ttl
+        )
+        self.shared = shared_store
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, "Idempotency-Key is too long")
+            return
+
+        key = hashlib.sha256(b"\0".join((
+            scope["method"].encode(),
+            scope["path"].encode(),
+            headers.get(b"authorization", b""),
+            idempotency_key,
+        ))).hexdigest()
+
+        # The body is buffered to fingerprint it, so its size is capped
+        try:
+            declared_size = int(headers.get(b"content-length", 0))
+        except ValueError:
+            declared_size = 0
+        try:
+            body = None if declared_size > self.max_request_size else await _read_body(receive, self.max_request_size)
+        except ClientDisconnect:
+            # A partial body must not reach the handler or claim the key
+            return
+        if body is None:
+            await _send_error(send, 413, "Request body is too large for an Idempotency-Key request")
+            return
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        while True:
+            stored = await self._lookup(key)
+            if stored is not None:
+                await self._replay(stored, fingerprint, send)
+                return
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                await asyncio.wait_for(asyncio.shield(pending), self.wait_timeout)
+            except asyncio.TimeoutError:
+                await _send_error(send, 409, "A request with this Idempotency-Key is in progress")
+                return
+
+        done = asyncio.get_running_loop().create_future()
+        self._inflight[key] = done
+        try:
+            if self.shared is not None and not await self.shared.acquire(key, self.wait_timeout):
+                stored = await self._wait_for_shared(key)
+                if stored is None:
+                    await _send_error(send, 409, "A request with this Idempotency-Key is in progress")
+                else:
+                    await self._replay(stored, fingerprint, send)
+                return
+
+            try:
+                await self._execute(scope, receive, send, body, key, fingerprint)
+            finally:
+                if self.shared is not None:
+                    await self.shared.release(key)
+        finally:
+            del self._inflight[key]
+            done.set_result(None)
+
+    async def _lookup(self, key: str) -> Optional[StoredResponse]:
+        data = await self.local.get(key)
+        if data is None and self.shared is not None:
+            data = await self.shared.get(key)
+            if data is not None:
+                await self.local.set(key, data)
+        return StoredResponse.loads(data) if data is not None else None
+
+    async def _wait_for_shared(self, key: str) -> Optional[StoredResponse]:
+        """Poll the shared store while another worker handles the same key."""
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.05
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            stored = await self._lookup(key)
+            if stored is not None:
+                return stored
+            delay = min(delay * 2, 0.5)
+        return None
+
+    async def _execute(self, scope, receive, send, body: bytes, key: str, fingerprint: str) -> None:
+        start: dict = {}
+        chunks: list[bytes] = []
+        size = 0
+        storable = True
+
+        async def receive_body():
+            nonlocal body
+            if body is None:
+                return await receive()
+            message = {"type": "http.request", "body": body, "more_body": False}
+            body = None
+            return message
+
+        async def capture(message) -> None:
+            nonlocal size, storable
+            if message["type"] == "http.response.start":
+                start.update(message)
+                storable = message["status"] < 500
+            elif message["type"] == "http.response.body" and storable:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size > self.max_body_size:
+                    storable = False
+                    chunks.clear()
+                else:
+                    chunks.append(chunk)
+            await send(message)
+
+        await self.app(scope, receive_body, capture)
+
+        if not storable or not start:
+            return
+
+        stored = StoredResponse(
+            fingerprint=fingerprint,
+            status=start["status"],
+            headers=[
+                (name, value) for name, value in start.get("headers", [])
+                if name.lower() in REPLAYED_HEADERS
+            ],
+            body=b"".join(chunks),
+        )
+        data = stored.dumps()
+        await self.local.set(key, data)
+        if self.shared is not None:
+            await self.shared.set(key, data)
+
+    async def _replay(self, stored: StoredResponse, fingerprint: str, send) -> None:
+        if stored.fingerprint != fingerprint:
+            await _send_error(
+                send, 422, "Idempotency-Key was already used with a different request body"
+            )
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": [
+                *stored.headers,
+                (b"content-length", str(len(stored.body)).encode()),
+                (REPLAY_HEADER, b"true"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _read_body(receive, max_size: int) -> Optional[bytes]:
+    """The whole request body, or ``None`` once it grows past ``max_size``.
+
+    Raises ``ClientDisconnect`` if the client goes away before the body ends.
+    """
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise ClientDisconnect()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_size:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _send_error(send, status_code: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,73 @@
+import time
+
+from app.core import metrics
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Count requests and time them per route template.
+
+    The route is read after the request was served, from the ``route`` the
+    router put in the scope, so ``/api/v1/stores/{store_id}`` is one series
+    however many stores are fetched; requests no route matched share one
+    label. The in-flight gauge is labeled by method only, since the route is
+    not known until routing. Labeled children are cached so a request costs
+    two dict lookups instead of ``labels()`` calls.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._in_progress: dict[str, object] = {}
+        self._durations: dict[tuple[str, str], object] = {}
+        self._requests: dict[tuple[str, str, int], object] = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in METHODS else "OTHER"
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = metrics.REQUESTS_IN_PROGRESS.labels(method)
+
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            self._record(method, route_template(scope), status, elapsed)
+
+    def _record(self, method: str, route: str, status: int, elapsed: float) -> None:
+        duration = self._durations.get((method, route))
+        if duration is None:
+            duration = self._durations[(method, route)] = metrics.REQUEST_DURATION.labels(method, route)
+        duration.observe(elapsed)
+
+        requests = self._requests.get((method, route, status))
+        if requests is None:
+            requests = self._requests[(method, route, status)] = metrics.REQUESTS.labels(method, route, status)
+        requests.inc()
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Plain Starlette routes (/docs, /openapi.json) set only the endpoint;
+    # the app has none with path parameters, so the path is the template.
+    if "endpoint" in scope:
+        return scope["path"]
+    return UNMATCHED_ROUTE
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from starlette.routing import compile_path
+
+from app.core.profiling import ProfileStore
+from app.middleware.metrics import route_template
+from app.models import ProfileInfo, ProfilingRule
+
+logger = logging.getLogger(__name__)
+
+RULE_CHECK_INTERVAL = 1.0
+
+
+class _ActiveRule:
+    """A stored rule prepared for matching request scopes."""
+
+    def __init__(self, rule: ProfilingRule) -> None:
+        self.rule = rule
+        self.expires_at = rule.expires_at.timestamp()
+        self.path_regex = compile_path(rule.route)[0] if rule.route else None
+        self.header = rule.header.lower().encode()
+        self.token = rule.token.encode()
+
+    def trigger(self, scope) -> Optional[str]:
+        """Why this request should be profiled, or ``None``."""
+        if time.time() >= self.expires_at:
+            return None
+        if self.rule.method and scope["method"] != self.rule.method:
+            return None
+        if self.path_regex is not None and not self.path_regex.match(scope["path"]):
+            return None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                if value == self.token:
+                    return "header"
+                break
+        if self.rule.sample_rate and random.random() < self.rule.sample_rate:
+            return "sample"
+        return None
+
+
+class ProfilingMiddleware:
+    """Profile the requests matching the admin's profiling rule.
+
+    Without a rule a request costs one clock read; the rule file is checked
+    at most once per ``RULE_CHECK_INTERVAL``. Profiled responses carry an
+    ``X-Profile`` header naming the saved profile.
+    """
+
+    def __init__(self, app, store: ProfileStore, interval: float = 0.001) -> None:
+        self.app = app
+        self.store = store
+        self.interval = interval
+        self._rule: Optional[_ActiveRule] = None
+        self._rule_mtime: Optional[int] = None
+        self._next_check = 0.0
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + RULE_CHECK_INTERVAL
+            self._reload()
+        trigger = self._rule.trigger(scope) if self._rule is not None else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+        await self._profile(scope, receive, send, trigger)
+
+    def _reload(self) -> None:
+        try:
+            mtime = self.store.rule_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._rule_mtime:
+            return
+        self._rule_mtime = mtime
+        rule = self.store.read_rule() if mtime is not None else None
+        self._rule = _ActiveRule(rule) if rule is not None else None
+
+    async def _profile(self, scope, receive, send, trigger: str) -> None:
+        from pyinstrument import Profiler
+
+        name = self.store.new_name()
+        status = 500
+
+        async def send_with_name(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile", name.encode())]}
+            await send(message)
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        started = datetime.now(timezone.utc)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_name)
+        finally:
+            session = profiler.stop()
+            info = ProfileInfo(
+                name=name,
+                method=scope["method"],
+                path=scope["path"],
+                route=route_template(scope),
+                status=status,
+                duration_ms=round(session.duration * 1000, 2),
+                trigger=trigger,
+                format=self.store.output_format,
+                size=0,
+                created_at=started,
+            )
+            try:
+                # Rendering walks every sampled frame; keep it off the event loop
+                await asyncio.to_thread(self.store.save, session, info)
+            except Exception:
+                logger.exception("Could not save profile %s", name)
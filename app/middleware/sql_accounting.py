@@ -0,0 +1,57 @@
+import logging
+
+from app.core import metrics
+from app.core.sql_accounting import track_queries
+from app.middleware.metrics import METHODS, route_template
+
+logger = logging.getLogger(__name__)
+
+
+class SQLAccountingMiddleware:
+    """Count the SQL each request runs and report it.
+
+    The totals so far go out in a ``Server-Timing: db;dur=...;desc="N queries"``
+    header (a streamed body may run more after the headers are sent). When
+    the request is done the full totals feed the per-route query histograms,
+    and statement shapes run more than ``repeat_threshold`` times log a
+    warning, which is how an N+1 loop looks from here.
+    """
+
+    def __init__(self, app, repeat_threshold: int, record_metrics: bool = True) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.record_metrics = record_metrics
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_timing(message) -> None:
+                if message["type"] == "http.response.start":
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", []),
+                            (b"server-timing", stats.server_timing().encode()),
+                        ],
+                    }
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self._report(scope, stats)
+
+    def _report(self, scope, stats) -> None:
+        method = scope["method"] if scope["method"] in METHODS else "OTHER"
+        route = route_template(scope)
+        if self.record_metrics:
+            metrics.REQUEST_DB_QUERIES.labels(method, route).observe(stats.count)
+            metrics.REQUEST_DB_DURATION.labels(method, route).observe(stats.duration)
+        for shape, count in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "Possible N+1: %s %s ran the same statement %d times: %s",
+                method, route, count, " ".join(shape.split())[:300]
+            )
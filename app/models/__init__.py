@@ -1,19 +1,41 @@
-from .admin import Admin, AdminCreate, AdminUpdate, AdminResponse, AdminLogin
-from .user import User, UserCreate, UserUpdate, UserResponse, UserLogin
-from .store import Store, StoreCreate, StoreUpdate, StoreResponse, StoreLogin, StorePublic
+from .admin import Admin, AdminCreate, AdminUpdate, AdminResponse, AdminLogin, AdminSummary, AdminAuth
+from .user import User, UserCreate, UserUpdate, UserResponse, UserLogin, UserSummary, UserAuth
+from .store import (
+    Store, StoreCreate, StoreUpdate, StoreResponse, StoreLogin, StorePublic,
+    StoreSummary, StoreAuth, StoreRegistered, StoreRegistration
+)
 from .category import Category, CategoryCreate, CategoryUpdate, CategoryResponse
 from .product import Product, ProductCreate, ProductUpdate, ProductResponse, ProductWithStore
 from .address import Address, AddressCreate, AddressUpdate, AddressResponse
-from .order import Order, OrderItem, OrderCreate, OrderUpdate, OrderItemResponse, OrderResponse
+from .order import (
+    Order, OrderItem, OrderCreate, OrderUpdate, OrderItemResponse, OrderResponse, OrderStatusChange
+)
+from .batch import BatchOperation, BatchRequest, BatchResult
 from .cart import CartItem, CartItemCreate, CartItemUpdate, CartItemResponse, CartItemWithProduct
+from .dispatch import RouteStop, DeliveryRoute, DispatchPlan, DispatchRoutes, DispatchPlanSummary
+from .idempotency import IdempotencyKey
+from .profiling import ProfilingRuleCreate, ProfilingRule, ProfileInfo
+from .report import (
+    StoreDailySales, StoreProductDailySales, SalesDay, TopProduct, SalesReport, RollupMismatch, RollupConsistency
+)
+from .response import Pagination, Envelope, MessageEnvelope, Message, Page
+from .zone import DeliveryZone, DeliveryZoneCreate, DeliveryZoneResponse, StoreCoverage
 
 __all__ = [
-    "Admin", "AdminCreate", "AdminUpdate", "AdminResponse", "AdminLogin",
-    "User", "UserCreate", "UserUpdate", "UserResponse", "UserLogin",
+    "Admin", "AdminCreate", "AdminUpdate", "AdminResponse", "AdminLogin", "AdminSummary", "AdminAuth",
+    "User", "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "UserSummary", "UserAuth",
     "Store", "StoreCreate", "StoreUpdate", "StoreResponse", "StoreLogin", "StorePublic",
+    "StoreSummary", "StoreAuth", "StoreRegistered", "StoreRegistration",
     "Category", "CategoryCreate", "CategoryUpdate", "CategoryResponse",
     "Product", "ProductCreate", "ProductUpdate", "ProductResponse", "ProductWithStore",
     "Address", "AddressCreate", "AddressUpdate", "AddressResponse",
-    "Order", "OrderItem", "OrderCreate", "OrderUpdate", "OrderItemResponse", "OrderResponse",
+    "Order", "OrderItem", "OrderCreate", "OrderUpdate", "OrderItemResponse", "OrderResponse", "OrderStatusChange",
+    "BatchOperation", "BatchRequest", "BatchResult",
     "CartItem", "CartItemCreate", "CartItemUpdate", "CartItemResponse", "CartItemWithProduct",
+    "RouteStop", "DeliveryRoute", "DispatchPlan", "DispatchRoutes", "DispatchPlanSummary",
+    "IdempotencyKey",
+    "ProfilingRuleCreate", "ProfilingRule", "ProfileInfo",
+    "StoreDailySales", "StoreProductDailySales", "SalesDay", "TopProduct", "SalesReport", "RollupMismatch", "RollupConsistency",
+    "Pagination", "Envelope", "MessageEnvelope", "Message", "Page",
+    "DeliveryZone", "DeliveryZoneCreate", "DeliveryZoneResponse", "StoreCoverage",
 ]
\ No newline at end of file
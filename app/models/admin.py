@@ -51,4 +51,17 @@ class AdminResponse(AdminBase):
 
 class AdminLogin(SQLModel):
     email: str
-    password: str
\ No newline at end of file
+    password: str
+
+
+class AdminSummary(SQLModel):
+    id: UUID
+    name: str
+    email: str
+    phone: Optional[str]
+    role: str
+
+
+class AdminAuth(SQLModel):
+    admin: AdminSummary
+    token: str
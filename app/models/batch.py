@@ -0,0 +1,22 @@
+from typing import Any, Dict, List, Literal, Optional
+
+from sqlmodel import SQLModel, Field
+
+
+class BatchOperation(SQLModel):
+    """One sub-request of a batch; ``path`` includes the query string."""
+    id: Optional[str] = Field(None, max_length=64)
+    method: Literal["GET"] = "GET"
+    path: str = Field(max_length=2048)
+    headers: Dict[str, str] = {}
+
+
+class BatchRequest(SQLModel):
+    requests: List[BatchOperation] = Field(min_length=1)
+
+
+class BatchResult(SQLModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
@@ -1,10 +1,12 @@
 from datetime import datetime
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from sqlmodel import SQLModel, Field, Column, Relationship, ForeignKey, UniqueConstraint
 from sqlalchemy import DateTime, func
 
+from app.core.ids import uuid7
+
 
 class CartItemBase(SQLModel):
     quantity: int = Field(default=1, ge=1)
@@ -14,7 +16,7 @@ class CartItem(CartItemBase, table=True):
     __tablename__ = "cart_items"
     __table_args__ = (UniqueConstraint("user_id", "product_id"),)
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id")
     store_id: UUID = Field(foreign_key="stores.id")
     product_id: UUID = Field(foreign_key="products.id")
@@ -0,0 +1,42 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+
+class RouteStop(SQLModel):
+    sequence: int
+    order_id: UUID
+    order_number: str
+    latitude: Decimal
+    longitude: Decimal
+    distance_from_previous_km: float
+
+
+class DeliveryRoute(SQLModel):
+    store_id: UUID
+    stops: List[RouteStop]
+    total_distance_km: float
+
+
+class DispatchPlan(SQLModel):
+    planned_at: datetime
+    planning_ms: float
+    order_count: int
+    routes: List[DeliveryRoute]
+
+
+class DispatchRoutes(SQLModel):
+    success: bool = True
+    data: List[DeliveryRoute]
+    planned_at: Optional[datetime] = None
+    planning_ms: Optional[float] = None
+
+
+class DispatchPlanSummary(SQLModel):
+    planned_at: datetime
+    planning_ms: float
+    order_count: int
+    route_count: int
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import DateTime, LargeBinary
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """Stored response for a request sent with an ``Idempotency-Key`` header."""
+    __tablename__ = "idempotency_keys"
+
+    key: str = Field(primary_key=True, max_length=64)
+    response: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
@@ -1,11 +1,13 @@
 from datetime import datetime
 from typing import Optional, List
 from decimal import Decimal
-from uuid import UUID, uuid4
+from uuid import UUID
 from enum import Enum
 
 from sqlmodel import SQLModel, Field, Column, Relationship, ForeignKey
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, Index, func, text
+
+from app.core.ids import uuid7
 
 
 class OrderStatus(str, Enum):
@@ -64,16 +66,25 @@ class OrderBase(SQLModel):
 
 
 class Order(OrderBase, table=True):
+    # Migrated databases range-partition orders and order_items by created_at
+    # month, with primary keys on (id, created_at); see app.services.partitions.
     __tablename__ = "orders"
+    __table_args__ = (
+        # Exports and reports by creation date, across stores and per store
+        Index("ix_orders_created_at", "created_at"),
+        Index("ix_orders_store_id_created_at", "store_id", "created_at"),
+        # Dispatch planner: orders being prepared
+        Index("ix_orders_preparing_store_id", "store_id", postgresql_where=text("status = 'PREPARING'")),
+    )
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id")
     store_id: UUID = Field(foreign_key="stores.id")
     address_id: Optional[UUID] = Field(None, foreign_key="addresses.id")
 
     created_at: datetime = Field(
         default_factory=datetime.utcnow,
-        sa_column=Column(DateTime(timezone=True), server_default=func.now())
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     )
     updated_at: datetime = Field(
         default_factory=datetime.utcnow,
@@ -93,8 +104,10 @@ class Order(OrderBase, table=True):
 class OrderItem(SQLModel, table=True):
     __tablename__ = "order_items"
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
-    order_id: UUID = Field(foreign_key="orders.id")
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
+    # Not enforced once order_items is partitioned; `app.cli ids-rekey` rewrites
+    # order_id together with the order.
+    order_id: UUID = Field(sa_column_args=[ForeignKey("orders.id", onupdate="CASCADE")], index=True)
     product_id: UUID = Field(foreign_key="products.id")
 
     # Product snapshot
@@ -155,4 +168,11 @@ class OrderResponse(OrderBase):
     address_id: Optional[UUID]
     created_at: datetime
     updated_at: datetime
-    items: List[OrderItemResponse]
\ No newline at end of file
+    items: List[OrderItemResponse]
+
+
+class OrderStatusChange(SQLModel):
+    id: UUID
+    order_number: str
+    status: OrderStatus
+    payment_status: PaymentStatus
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from sqlmodel import SQLModel, Field
+
+
+class ProfilingRuleCreate(SQLModel):
+    """Which requests to profile.
+
+    ``route`` (a route template such as ``/api/v1/stores/{store_id}``) and
+    ``method`` narrow the requests; of those, requests sending the rule's
+    token are always profiled and the rest with probability ``sample_rate``.
+    """
+    route: Optional[str] = Field(None, max_length=256)
+    method: Optional[Literal["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"]] = None
+    sample_rate: float = Field(0.0, ge=0, le=1)
+    expires_in: int = Field(600, ge=1, le=86400, description="Seconds until profiling turns itself off")
+
+
+class ProfilingRule(SQLModel):
+    route: Optional[str] = None
+    method: Optional[str] = None
+    sample_rate: float
+    token: str
+    header: str
+    expires_at: datetime
+    created_by: UUID
+
+
+class ProfileInfo(SQLModel):
+    name: str
+    method: str
+    path: str
+    route: Optional[str] = None
+    status: int
+    duration_ms: float
+    trigger: Literal["header", "sample"]
+    format: str
+    size: int
+    created_at: datetime
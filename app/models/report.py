@@ -0,0 +1,89 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from sqlmodel import SQLModel, Field, Column, PrimaryKeyConstraint
+from sqlalchemy import DateTime, func
+
+from .order import OrderStatus
+
+
+class StoreDailySales(SQLModel, table=True):
+    """Per-store sales rollup, one row per store x day x terminal status."""
+    __tablename__ = "store_daily_sales"
+    __table_args__ = (PrimaryKeyConstraint("store_id", "day", "status"),)
+
+    store_id: UUID = Field(foreign_key="stores.id")
+    day: date
+    status: OrderStatus
+
+    order_count: int = Field(default=0)
+    subtotal: Decimal = Field(default=Decimal("0"), decimal_places=2, max_digits=14)
+    delivery_fee: Decimal = Field(default=Decimal("0"), decimal_places=2, max_digits=14)
+    discount_amount: Decimal = Field(default=Decimal("0"), decimal_places=2, max_digits=14)
+    total: Decimal = Field(default=Decimal("0"), decimal_places=2, max_digits=14)
+
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            onupdate=func.now()
+        )
+    )
+
+
+class StoreProductDailySales(SQLModel, table=True):
+    """Per-store product rollup of delivered orders, one row per store x day x product."""
+    __tablename__ = "store_product_daily_sales"
+    __table_args__ = (PrimaryKeyConstraint("store_id", "day", "product_id"),)
+
+    store_id: UUID = Field(foreign_key="stores.id")
+    day: date
+    product_id: UUID = Field(foreign_key="products.id")
+
+    product_name: str = Field(max_length=100)
+    quantity: int = Field(default=0)
+    revenue: Decimal = Field(default=Decimal("0"), decimal_places=2, max_digits=14)
+
+
+class SalesDay(SQLModel):
+    day: date
+    delivered_orders: int
+    cancelled_orders: int
+    revenue: Decimal
+    average_ticket: Decimal
+
+
+class TopProduct(SQLModel):
+    product_id: UUID
+    product_name: str
+    quantity: int
+    revenue: Decimal
+
+
+class SalesReport(SQLModel):
+    store_id: UUID
+    date_from: date
+    date_to: date
+    delivered_orders: int
+    cancelled_orders: int
+    revenue: Decimal
+    average_ticket: Decimal
+    days: List[SalesDay]
+    top_products: List[TopProduct]
+
+
+class RollupMismatch(SQLModel):
+    store_id: UUID
+    day: date
+    status: OrderStatus
+    field: str
+    expected: Optional[Decimal]
+    actual: Optional[Decimal]
+
+
+class RollupConsistency(SQLModel):
+    consistent: bool
+    mismatches: List[RollupMismatch]
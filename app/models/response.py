@@ -0,0 +1,35 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+from sqlmodel import SQLModel
+
+DataT = TypeVar("DataT")
+
+
+class Pagination(SQLModel):
+    skip: int
+    limit: int
+    total: int
+
+
+class Envelope(BaseModel, Generic[DataT]):
+    """``{"success": true, "data": ...}`` body shared by the endpoints."""
+    success: bool = True
+    data: DataT
+
+
+class MessageEnvelope(BaseModel, Generic[DataT]):
+    success: bool = True
+    message: str
+    data: DataT
+
+
+class Message(BaseModel):
+    success: bool = True
+    message: str
+
+
+class Page(BaseModel, Generic[DataT]):
+    success: bool = True
+    data: List[DataT]
+    pagination: Pagination
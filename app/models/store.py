@@ -4,7 +4,7 @@ from decimal import Decimal
 from uuid import UUID, uuid4
 
 from sqlmodel import SQLModel, Field, Column, Relationship
-from sqlalchemy import DateTime, func, Time
+from sqlalchemy import DateTime, Index, desc, func, text, Time
 
 
 class StoreBase(SQLModel):
@@ -37,6 +37,18 @@ class StoreBase(SQLModel):
 
 class Store(StoreBase, table=True):
     __tablename__ = "stores"
+    __table_args__ = (
+        # Public listing: active, approved stores ordered by rating, ties by id
+        Index(
+            "ix_stores_listing_rating_id", desc("rating"), "id",
+            postgresql_where=text("is_active AND is_approved")
+        ),
+        # Admin approval queue, newest first
+        Index(
+            "ix_stores_pending_created_at", desc("created_at"),
+            postgresql_where=text("is_active AND NOT is_approved")
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     password: str = Field(max_length=255)
@@ -104,4 +116,36 @@ class StorePublic(SQLModel):
     close_time: time
     rating: Decimal
     total_reviews: int
-    is_open: bool
\ No newline at end of file
+    is_open: bool
+
+
+class StoreSummary(SQLModel):
+    id: UUID
+    owner_name: str
+    owner_email: str
+    owner_phone: str
+    store_name: str
+    description: Optional[str]
+    image: Optional[str]
+    address: str
+    delivery_fee: Decimal
+    delivery_time_min: int
+    delivery_time_max: int
+    rating: Decimal
+    is_open: bool
+
+
+class StoreAuth(SQLModel):
+    store: StoreSummary
+    token: str
+
+
+class StoreRegistered(SQLModel):
+    id: UUID
+    store_name: str
+    owner_email: str
+    is_approved: bool
+
+
+class StoreRegistration(SQLModel):
+    store: StoreRegistered
@@ -58,4 +58,17 @@ class UserResponse(UserBase):
 
 class UserLogin(SQLModel):
     email: str
-    password: str
\ No newline at end of file
+    password: str
+
+
+class UserSummary(SQLModel):
+    id: UUID
+    name: str
+    email: str
+    phone: Optional[str]
+    profile_image: Optional[str] = None
+
+
+class UserAuth(SQLModel):
+    user: UserSummary
+    token: str
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from pydantic import field_validator
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import DateTime, JSON, func
+
+
+class DeliveryZoneBase(SQLModel):
+    name: str = Field(max_length=100)
+    # Polygon vertices as [latitude, longitude] pairs; the ring closes implicitly.
+    polygon: List[List[float]] = Field(sa_column=Column(JSON, nullable=False))
+    is_active: bool = Field(default=True)
+
+
+class DeliveryZone(DeliveryZoneBase, table=True):
+    __tablename__ = "delivery_zones"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    store_id: UUID = Field(foreign_key="stores.id", index=True)
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
+    )
+
+
+class DeliveryZoneCreate(SQLModel):
+    name: str = Field(max_length=100)
+    polygon: List[List[float]]
+    is_active: bool = True
+
+    @field_validator("polygon")
+    @classmethod
+    def validate_polygon(cls, v: List[List[float]]) -> List[List[float]]:
+        if len(v) > 1 and v[0] == v[-1]:
+            v = v[:-1]
+        if len(v) < 3:
+            raise ValueError("A delivery zone needs at least 3 vertices")
+        if len(v) > 500:
+            raise ValueError("A delivery zone can have at most 500 vertices")
+        for point in v:
+            if len(point) != 2:
+                raise ValueError("Vertices must be [latitude, longitude] pairs")
+            latitude, longitude = point
+            if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+                raise ValueError("Vertex out of range")
+        return v
+
+
+class DeliveryZoneResponse(DeliveryZoneBase):
+    id: UUID
+    store_id: UUID
+    created_at: datetime
+
+
+class StoreCoverage(SQLModel):
+    store_id: UUID
+    deliverable: bool
+    zone_id: Optional[UUID]
+    zone_name: Optional[str]
@@ -0,0 +1,6 @@
+from .base import Repository
+from .journal import JournaledRepository
+from .memory import MemoryRepository
+from .postgres import PostgresRepository
+
+__all__ = ["Repository", "JournaledRepository", "MemoryRepository", "PostgresRepository"]
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from uuid import UUID
+
+from app.models import Admin, Store, User
+
+
+class Repository(ABC):
+    """Storage for users, stores and admins, shared by the API and the demo app.
+
+    Emails are stored lowercased; lookups expect lowercased input. ``add_*``
+    return ``None`` when the email is already taken. Returned objects are
+    read-only views: change them through ``update_*`` so indexes stay valid.
+    """
+
+    @abstractmethod
+    async def get_user(self, user_id: UUID) -> Optional[User]:
+        ...
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        ...
+
+    @abstractmethod
+    async def add_user(self, user: User) -> Optional[User]:
+        ...
+
+    @abstractmethod
+    async def get_store(self, store_id: UUID) -> Optional[Store]:
+        ...
+
+    @abstractmethod
+    async def get_store_by_email(self, email: str) -> Optional[Store]:
+        ...
+
+    @abstractmethod
+    async def add_store(self, store: Store) -> Optional[Store]:
+        ...
+
+    @abstractmethod
+    async def update_store(self, store_id: UUID, **values: Any) -> Optional[Store]:
+        """Apply ``values`` and return the updated store; ``None`` if it does not exist."""
+
+    @abstractmethod
+    async def list_stores(self, skip: int = 0, limit: int = 20) -> list[Store]:
+        """Active, approved stores, best rated first."""
+
+    @abstractmethod
+    async def count_stores(self) -> int:
+        """Number of stores ``list_stores`` pages through."""
+
+    @abstractmethod
+    async def get_admin(self, admin_id: UUID) -> Optional[Admin]:
+        ...
+
+    @abstractmethod
+    async def get_admin_by_email(self, email: str) -> Optional[Admin]:
+        ...
+
+    @abstractmethod
+    async def add_admin(self, admin: Admin) -> Optional[Admin]:
+        ...
@@ -0,0 +1,222 @@
+"""Append-only journal and compacted snapshots for the in-memory repository.
+
+Files in ``data_dir``::
+
+    snapshot.jsonl      compacted state, one ``add`` record per row
+    journal.jsonl       writes since the snapshot was started
+    journal.old.jsonl   the previous journal while a compaction is running
+
+Each record is one JSON line, ``["add", table, row]`` or
+``["set", table, id, values]``. Replaying a record twice leaves the same
+state, so startup simply replays snapshot, old journal and journal in that
+order, whatever point a crash interrupted.
+"""
+import asyncio
+import gc
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union
+from uuid import UUID
+
+from pydantic_core import to_jsonable_python
+
+from app.models import Admin, Store, User
+from app.repositories.memory import MemoryRepository, row_key
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+SNAPSHOT = "snapshot.jsonl"
+JOURNAL = "journal.jsonl"
+OLD_JOURNAL = "journal.old.jsonl"
+
+
+def encode(record: list) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+decode = orjson.loads if orjson is not None else json.loads
+
+
+def _sync(file: BinaryIO) -> None:
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def _sync_directory(path: Path) -> None:
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class JournaledRepository(MemoryRepository):
+    """``MemoryRepository`` that survives restarts.
+
+    Writes are appended to the journal and acknowledged once fsynced. Writes
+    that arrive while an fsync is in flight, or within ``fsync_interval``
+    seconds of the first unsynced write, share the next fsync. After
+    ``compact_after`` journal records the state is rewritten as a snapshot in
+    a worker thread and the journal starts over. Rows replayed at startup are
+    validated lazily, on first read.
+    """
+
+    def __init__(self, data_dir: Union[str, Path], fsync_interval: float = 0.0, compact_after: int = 100_000) -> None:
+        super().__init__()
+        self.data_dir = Path(data_dir)
+        self.fsync_interval = fsync_interval
+        self.compact_after = compact_after
+        self._tables = {"users": self.users, "stores": self.stores, "admins": self.admins}
+        self._journal: Optional[BinaryIO] = None
+        self._records = 0
+        self._sync: Optional[asyncio.Future] = None
+        self._sync_lock = asyncio.Lock()
+        self._compaction: Optional[asyncio.Task] = None
+
+    async def open(self) -> None:
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Replay only allocates rows that live on; collecting while it runs
+        # rescans them over and over.
+        gc.disable()
+        try:
+            for name in (SNAPSHOT, OLD_JOURNAL, JOURNAL):
+                path = self.data_dir / name
+                if path.exists():
+                    records = self._replay(path)
+                    if name != SNAPSHOT:
+                        self._records += records
+            self._rebuild_listing()
+        finally:
+            gc.enable()
+        self._journal = open(self.data_dir / JOURNAL, "ab")
+
+        if (self.data_dir / OLD_JOURNAL).exists() or self._records >= self.compact_after:
+            await self.compact()
+
+    async def close(self) -> None:
+        if self._compaction is not None:
+            await self._compaction
+        if self._sync is not None:
+            await self._sync
+        if self._journal is not None:
+            await self._fsync(self._journal, close=True)
+            self._journal = None
+
+    async def compact(self) -> None:
+        """Write the current state as the snapshot and drop the journal it covers."""
+        old_journal = self.data_dir / OLD_JOURNAL
+        if not old_journal.exists():
+            os.replace(self.data_dir / JOURNAL, old_journal)
+            journal, self._journal = self._journal, open(self.data_dir / JOURNAL, "ab")
+            self._records = 0
+            pending, self._sync = self._sync, None
+            if pending is not None:
+                await asyncio.shield(pending)
+            await self._fsync(journal, close=True)
+
+        # Rows may change while the snapshot is written; those changes are
+        # also in the new journal and are replayed over it.
+        tables = {name: list(table.by_id.values()) for name, table in self._tables.items()}
+        await asyncio.to_thread(self._write_snapshot, tables)
+        old_journal.unlink()
+        await asyncio.to_thread(_sync_directory, self.data_dir)
+
+    async def add_user(self, user: User) -> Optional[User]:
+        return await self._log_add("users", await super().add_user(user))
+
+    async def add_store(self, store: Store) -> Optional[Store]:
+        return await self._log_add("stores", await super().add_store(store))
+
+    async def add_admin(self, admin: Admin) -> Optional[Admin]:
+        return await self._log_add("admins", await super().add_admin(admin))
+
+    async def update_store(self, store_id: UUID, **values: Any) -> Optional[Store]:
+        store = await super().update_store(store_id, **values)
+        if store is not None and values:
+            values["updated_at"] = store.updated_at
+            await self._append(["set", "stores", str(store_id), to_jsonable_python(values)])
+        return store
+
+    async def _log_add(self, table: str, row):
+        if row is not None:
+            await self._append(["add", table, row.model_dump(mode="json")])
+        return row
+
+    async def _append(self, record: list) -> None:
+        self._journal.write(encode(record))
+        self._records += 1
+        if self._sync is None:
+            self._sync = asyncio.ensure_future(self._sync_soon(self._journal))
+        sync = self._sync
+
+        if self._records >= self.compact_after and self._compaction is None:
+            self._compaction = asyncio.create_task(self._compact_in_background())
+        await asyncio.shield(sync)
+
+    async def _sync_soon(self, journal: BinaryIO) -> None:
+        await asyncio.sleep(self.fsync_interval)
+        if journal is self._journal:
+            self._sync = None
+        await self._fsync(journal)
+
+    async def _fsync(self, journal: BinaryIO, close: bool = False) -> None:
+        async with self._sync_lock:
+            if journal.closed:
+                return
+            await asyncio.to_thread(_sync, journal)
+            if close:
+                journal.close()
+
+    async def _compact_in_background(self) -> None:
+        try:
+            await self.compact()
+        finally:
+            self._compaction = None
+
+    def _replay(self, path: Path) -> int:
+        records = 0
+        offset = 0
+        with open(path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                self._apply(decode(line))
+                records += 1
+                offset += len(line)
+
+        if offset < path.stat().st_size:
+            # A crash cut the last write short; it was never acknowledged.
+            os.truncate(path, offset)
+        return records
+
+    def _apply(self, record: list) -> None:
+        table = self._tables[record[1]]
+        if record[0] == "add":
+            table.load(record[2])
+            return
+
+        key = row_key(record[2])
+        row = table.by_id.get(key)
+        if isinstance(row, dict):
+            row.update(record[3])
+        elif row is not None:
+            table.by_id[key] = table.model.model_validate({**row.model_dump(mode="json"), **record[3]})
+
+    def _write_snapshot(self, tables: dict[str, list]) -> None:
+        path = self.data_dir / SNAPSHOT
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb", buffering=1024 * 1024) as file:
+            for name, rows in tables.items():
+                for row in rows:
+                    if not isinstance(row, dict):
+                        row = row.model_dump(mode="json")
+                    file.write(encode(["add", name, row]))
+            _sync(file)
+        os.replace(temporary, path)
+        _sync_directory(self.data_dir)
@@ -0,0 +1,163 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Generic, Optional, TypeVar, Union
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+from app.models import Admin, Store, User
+from app.repositories.base import Repository
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+def row_key(row_id: str) -> int:
+    """Table key of a UUID string, without building a ``UUID``."""
+    return int(row_id.replace("-", ""), 16)
+
+
+class _Table(Generic[ModelT]):
+    """Rows keyed by ``UUID.int`` with a unique email index.
+
+    Integer keys hash and compare in C; ``UUID`` objects do both in Python,
+    which dominates a restart that loads a million rows. Rows loaded from
+    disk stay as their JSON dicts until first read, so a restart only pays
+    for validation of the rows it actually serves.
+    """
+
+    def __init__(self, model: type[ModelT], email_field: str) -> None:
+        self.model = model
+        self.email_field = email_field
+        self.by_id: dict[int, Union[ModelT, dict]] = {}
+        self.by_email: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, row_id: UUID) -> Optional[ModelT]:
+        return self.row(row_id.int)
+
+    def get_by_email(self, email: str) -> Optional[ModelT]:
+        key = self.by_email.get(email)
+        return self.row(key) if key is not None else None
+
+    def row(self, key: int) -> Optional[ModelT]:
+        row = self.by_id.get(key)
+        if isinstance(row, dict):
+            row = self.by_id[key] = self.model.model_validate(row)
+        return row
+
+    def add(self, row: ModelT) -> Optional[ModelT]:
+        email = getattr(row, self.email_field)
+        if email in self.by_email:
+            return None
+        self.by_id[row.id.int] = row
+        self.by_email[email] = row.id.int
+        return row
+
+    def load(self, raw: dict) -> Optional[int]:
+        """Add a JSON row without validating it; ``None`` if its email is taken."""
+        email = raw[self.email_field]
+        if email in self.by_email:
+            return None
+        key = row_key(raw["id"])
+        self.by_id[key] = raw
+        self.by_email[email] = key
+        return key
+
+    def value(self, key: int, field: str) -> Any:
+        row = self.by_id[key]
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+class MemoryRepository(Repository):
+    """In-process repository with secondary indexes, for the demo deployment.
+
+    Lookups by id and email are dict hits. Listed stores (active and
+    approved) are kept in a list sorted by (-rating, id), so a listing page
+    is a slice and a store update costs one binary search and one insert.
+    """
+
+    def __init__(self) -> None:
+        self.users: _Table[User] = _Table(User, "email")
+        self.stores: _Table[Store] = _Table(Store, "owner_email")
+        self.admins: _Table[Admin] = _Table(Admin, "email")
+        self._listing: list[tuple[Decimal, int]] = []
+
+    async def open(self) -> None:
+        """Load persisted state; a plain memory repository starts empty."""
+
+    async def close(self) -> None:
+        """Flush persisted state; nothing to do without persistence."""
+
+    async def get_user(self, user_id: UUID) -> Optional[User]:
+        return self.users.get(user_id)
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        return self.users.get_by_email(email)
+
+    async def add_user(self, user: User) -> Optional[User]:
+        return self.users.add(user)
+
+    async def get_store(self, store_id: UUID) -> Optional[Store]:
+        return self.stores.get(store_id)
+
+    async def get_store_by_email(self, email: str) -> Optional[Store]:
+        return self.stores.get_by_email(email)
+
+    async def add_store(self, store: Store) -> Optional[Store]:
+        if self.stores.add(store) is None:
+            return None
+        self._list(store.id.int)
+        return store
+
+    async def update_store(self, store_id: UUID, **values: Any) -> Optional[Store]:
+        store = self.stores.get(store_id)
+        if store is None or not values:
+            return store
+
+        self._unlist(store_id.int)
+        for field, value in values.items():
+            setattr(store, field, value)
+        store.updated_at = datetime.utcnow()
+        self._list(store_id.int)
+        return store
+
+    async def list_stores(self, skip: int = 0, limit: int = 20) -> list[Store]:
+        return [self.stores.row(key) for _, key in self._listing[skip:skip + limit]]
+
+    async def count_stores(self) -> int:
+        return len(self._listing)
+
+    async def get_admin(self, admin_id: UUID) -> Optional[Admin]:
+        return self.admins.get(admin_id)
+
+    async def get_admin_by_email(self, email: str) -> Optional[Admin]:
+        return self.admins.get_by_email(email)
+
+    async def add_admin(self, admin: Admin) -> Optional[Admin]:
+        return self.admins.add(admin)
+
+    def _listing_entry(self, key: int) -> Optional[tuple[Decimal, int]]:
+        value = self.stores.value
+        if not (value(key, "is_active") and value(key, "is_approved")):
+            return None
+        return -Decimal(value(key, "rating")), key
+
+    def _list(self, key: int) -> None:
+        entry = self._listing_entry(key)
+        if entry is not None:
+            insort(self._listing, entry)
+
+    def _unlist(self, key: int) -> None:
+        entry = self._listing_entry(key)
+        if entry is None:
+            return
+        index = bisect_left(self._listing, entry)
+        if index < len(self._listing) and self._listing[index] == entry:
+            del self._listing[index]
+
+    def _rebuild_listing(self) -> None:
+        entries = (self._listing_entry(key) for key in self.stores.by_id)
+        self._listing = sorted(entry for entry in entries if entry is not None)
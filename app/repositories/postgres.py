@@ -0,0 +1,66 @@
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Admin, Store, User
+from app.repositories.base import Repository
+from app.services import queries, writes
+
+
+class PostgresRepository(Repository):
+    """Repository over a request's database session; writes commit immediately."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_user(self, user_id: UUID) -> Optional[User]:
+        return await self.db.get(User, user_id)
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        return (await self.db.execute(queries.user_by_email(email))).scalar_one_or_none()
+
+    async def add_user(self, user: User) -> Optional[User]:
+        return await self._add(user, User.email)
+
+    async def get_store(self, store_id: UUID) -> Optional[Store]:
+        return await self.db.get(Store, store_id)
+
+    async def get_store_by_email(self, email: str) -> Optional[Store]:
+        return (await self.db.execute(queries.store_by_owner_email(email))).scalar_one_or_none()
+
+    async def add_store(self, store: Store) -> Optional[Store]:
+        return await self._add(store, Store.owner_email)
+
+    async def update_store(self, store_id: UUID, **values: Any) -> Optional[Store]:
+        if not values:
+            return await self.get_store(store_id)
+        store = await writes.update_store(self.db, store_id, **values)
+        await self.db.commit()
+        return store
+
+    async def list_stores(self, skip: int = 0, limit: int = 20) -> list[Store]:
+        result = await self.db.execute(queries.store_listing(skip, limit))
+        return list(result.scalars().all())
+
+    async def count_stores(self) -> int:
+        result = await self.db.execute(
+            select(func.count()).select_from(Store).where(Store.is_active == True, Store.is_approved == True)
+        )
+        return result.scalar_one()
+
+    async def get_admin(self, admin_id: UUID) -> Optional[Admin]:
+        return await self.db.get(Admin, admin_id)
+
+    async def get_admin_by_email(self, email: str) -> Optional[Admin]:
+        return (await self.db.execute(queries.admin_by_email(email))).scalar_one_or_none()
+
+    async def add_admin(self, admin: Admin) -> Optional[Admin]:
+        return await self._add(admin, Admin.email)
+
+    async def _add(self, instance, unique_column):
+        created = await writes.insert_unless_exists(self.db, instance, unique_column)
+        if created is not None:
+            await self.db.commit()
+        return created
@@ -0,0 +1,315 @@
+"""Production launcher: a preforking master around uvicorn workers.
+
+    python -m app.server app.main:app --host 0.0.0.0 --port 8000
+
+The master imports the app and binds the socket once, then forks the
+workers, so each worker starts with the app already loaded and shares the
+listening socket. Each worker runs uvicorn with ``loop="auto"`` and
+``http="auto"``, which pick uvloop and httptools when they are installed.
+Lifespan startup (pools, replica checks) runs in every worker; the
+singleton loops (dispatch planner, partition maintenance) run only in the
+primary worker, which is the first one and whichever replaces it, so they
+run once per host (``SERVER_BACKGROUND_TASKS``). The master points
+prometheus_client at a multiprocess directory before importing the app, so
+``/metrics`` aggregates all workers.
+
+The number of workers follows ``SERVER_WORKERS``; 0 sizes it to the CPUs the
+process may use (affinity mask and cgroup CPU quota). Signals to the master:
+
+- ``SIGHUP``: rolling restart. One worker at a time is replaced, and the new
+  one must finish its startup before the old one is told to stop, so capacity
+  never drops. The app is not re-imported; deploy new code with a restart.
+- ``SIGTERM`` / ``SIGINT``: graceful stop. Workers finish in-flight requests
+  for up to ``SERVER_GRACEFUL_TIMEOUT`` seconds.
+
+A worker that dies after startup is replaced. If a worker dies before it
+finishes starting, the master stops, since the app cannot boot.
+"""
+import argparse
+import logging
+import math
+import os
+import select
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+MASTER_SIGNALS = {signal.SIGINT, signal.SIGTERM, signal.SIGHUP, signal.SIGCHLD}
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """CPUs allowed by the cgroup CPU quota, or ``None`` without one."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        quota, period = (CGROUP_ROOT / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((CGROUP_ROOT / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((CGROUP_ROOT / "cpu" / "cpu.cfs_period_us").read_text())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, capped by the cgroup quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+@dataclass
+class Worker:
+    pid: int
+    ready_fd: int
+    primary: bool = False
+    ready: bool = False
+    retiring: bool = False
+
+
+class _WorkerServer(uvicorn.Server):
+    """uvicorn server that tells the master when its startup is done."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int) -> None:
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[list[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            os.write(self.ready_fd, b"1")
+        os.close(self.ready_fd)
+
+
+def _prepare_metrics_dir() -> tuple[str, bool]:
+    """Empty multiprocess metrics directory for this run; ``True`` if it is temporary.
+
+    Must run before prometheus_client is imported: it picks its value
+    storage from the environment at import.
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or settings.METRICS_MULTIPROC_DIR
+    temporary = not path
+    if temporary:
+        path = tempfile.mkdtemp(prefix="collique-metrics-")
+    else:
+        os.makedirs(path, exist_ok=True)
+        # Files left by a previous run would be counted again
+        for stale in Path(path).glob("*.db"):
+            stale.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path, temporary
+
+
+def _mark_worker_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (in-flight requests) from the aggregate."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(pid)
+
+
+class Master:
+    def __init__(
+        self,
+        app: str,
+        host: str,
+        port: int,
+        workers: int = 0,
+        graceful_timeout: float = 30.0,
+        startup_timeout: float = 60.0
+    ) -> None:
+        self.config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            loop="auto",
+            http="auto",
+            lifespan="on",
+            timeout_graceful_shutdown=int(graceful_timeout),
+        )
+        self.worker_count = workers or available_cpus()
+        self.graceful_timeout = graceful_timeout
+        self.startup_timeout = startup_timeout
+        self.workers: dict[int, Worker] = {}
+        self.socket: Optional[socket.socket] = None
+
+    def run(self) -> int:
+        metrics_dir, temporary = _prepare_metrics_dir()
+        # Preload: import the app (and everything it imports) before forking
+        self.config.load()
+        self.socket = self.config.bind_socket()
+        signal.pthread_sigmask(signal.SIG_BLOCK, MASTER_SIGNALS)
+        logger.info(
+            "Master [%d] starting %d worker(s) on %s:%d",
+            os.getpid(), self.worker_count, self.config.host, self.config.port
+        )
+
+        try:
+            for index in range(self.worker_count):
+                if not self._wait_ready(self._spawn(primary=index == 0)):
+                    return 1
+            return self._loop()
+        finally:
+            self._stop()
+            self.socket.close()
+            if temporary:
+                shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    def _loop(self) -> int:
+        while True:
+            info = signal.sigtimedwait(MASTER_SIGNALS, 1.0)
+            if info is None:
+                continue
+            if info.si_signo in (signal.SIGINT, signal.SIGTERM):
+                logger.info("Master [%d] stopping", os.getpid())
+                return 0
+            if info.si_signo == signal.SIGHUP:
+                if not self._rolling_restart():
+                    return 1
+            elif not self._reap():
+                return 1
+
+    def _spawn(self, primary: bool) -> Worker:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, MASTER_SIGNALS)
+            if not primary:
+                settings.SERVER_BACKGROUND_TASKS = False
+            code = 0
+            try:
+                _WorkerServer(self.config, write_fd).run(sockets=[self.socket])
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+
+        os.close(write_fd)
+        worker = Worker(pid, read_fd, primary)
+        self.workers[pid] = worker
+        return worker
+
+    def _wait_ready(self, worker: Worker) -> bool:
+        """Block until ``worker`` finished its startup; ``False`` if it failed to."""
+        readable, _, _ = select.select([worker.ready_fd], [], [], self.startup_timeout)
+        worker.ready = bool(readable) and os.read(worker.ready_fd, 1) == b"1"
+        os.close(worker.ready_fd)
+        if not worker.ready:
+            logger.error("Worker [%d] failed to start", worker.pid)
+            self._kill(worker.pid, signal.SIGKILL)
+        return worker.ready
+
+    def _rolling_restart(self) -> bool:
+        logger.info("Master [%d] rolling restart of %d worker(s)", os.getpid(), len(self.workers))
+        for old in [worker for worker in self.workers.values() if not worker.retiring]:
+            # A new primary briefly overlaps the old one: partition DDL takes an
+            # advisory lock, and two planners only rewrite the same plan file
+            if not self._wait_ready(self._spawn(old.primary)):
+                return False
+            old.retiring = True
+            self._kill(old.pid, signal.SIGTERM)
+        return self._reap()
+
+    def _reap(self) -> bool:
+        """Collect exited workers and replace unexpected exits."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return True
+            if pid == 0:
+                return True
+            worker = self.workers.pop(pid, None)
+            _mark_worker_dead(pid)
+            if worker is None or worker.retiring:
+                continue
+            logger.warning("Worker [%d] exited with status %d, replacing it", pid, os.waitstatus_to_exitcode(status))
+            if not self._wait_ready(self._spawn(worker.primary)):
+                return False
+
+    def _stop(self) -> None:
+        for pid in self.workers:
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+            self.workers.pop(pid, None)
+            _mark_worker_dead(pid)
+        for pid in self.workers:
+            self._kill(pid, signal.SIGKILL)
+        self.workers.clear()
+
+    @staticmethod
+    def _kill(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+def serve(
+    app: str,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None
+) -> int:
+    """Run ``app`` (``"module:attribute"``) under the preforking master.
+
+    The app is passed by name so the master imports it after setting up the
+    metrics directory.
+    """
+    return Master(
+        app,
+        host=host or settings.HOST,
+        port=port or settings.PORT,
+        workers=settings.SERVER_WORKERS if workers is None else workers,
+        graceful_timeout=settings.SERVER_GRACEFUL_TIMEOUT,
+        startup_timeout=settings.SERVER_STARTUP_TIMEOUT,
+    ).run()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run an ASGI app with preforked uvicorn workers")
+    parser.add_argument("app", nargs="?", default="app.main:app")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="0 sizes to the available CPUs")
+    args = parser.parse_args(argv)
+    return serve(args.app, host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""Archive of detached order partitions.
+
+Each archived month is one file per table under ``ORDER_ARCHIVE_DIR``
+(``orders/2024-01.parquet``, ``order_items/2024-01.parquet``, or
+``.csv.gz``). Values are stored as plain strings in their database form
+(enums by name) and parsed back when the exports read them.
+"""
+import asyncio
+import csv
+import gzip
+import logging
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.order import OrderStatus, PaymentMethod, PaymentStatus
+from app.services.exports import EXPORT_CHUNK_ROWS, EXPORT_COLUMNS, parquet_available, plain_value
+from app.services.partitions import (
+    PARTITION_LOCK_KEY, PARTITIONED_TABLES, add_months, is_partitioned, list_partitions, month_start
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIXES = {"parquet": ".parquet", "csv": ".csv.gz"}
+
+_PARSERS = {
+    "id": UUID, "store_id": UUID, "user_id": UUID,
+    "status": OrderStatus.__members__.__getitem__,
+    "payment_method": PaymentMethod.__members__.__getitem__,
+    "payment_status": PaymentStatus.__members__.__getitem__,
+    "subtotal": Decimal, "delivery_fee": Decimal, "discount_amount": Decimal, "total": Decimal,
+    "created_at": datetime.fromisoformat, "confirmed_at": datetime.fromisoformat,
+    "delivered_at": datetime.fromisoformat, "cancelled_at": datetime.fromisoformat,
+}
+
+
+def archive_path(table: str, month: date, archive_format: str) -> Path:
+    return Path(settings.ORDER_ARCHIVE_DIR) / table / f"{month:%Y-%m}{ARCHIVE_SUFFIXES[archive_format]}"
+
+
+def archived_months(table: str = "orders") -> dict[date, Path]:
+    """Archived months of ``table`` and their files."""
+    directory = Path(settings.ORDER_ARCHIVE_DIR) / table
+    months = {}
+    if not directory.is_dir():
+        return months
+    for path in directory.iterdir():
+        for suffix in ARCHIVE_SUFFIXES.values():
+            if path.name.endswith(suffix):
+                year, month = path.name[:-len(suffix)].split("-")
+                months[date(int(year), int(month), 1)] = path
+    return months
+
+
+class _ArchiveWriter:
+    """Writes string rows to a Parquet or gzipped CSV file."""
+
+    def __init__(self, path: Path, columns: Sequence[str], archive_format: str) -> None:
+        self.path = path
+        self.columns = list(columns)
+        self.archive_format = archive_format
+        self.rows = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if archive_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            self._schema = pa.schema([(column, pa.string()) for column in self.columns])
+            self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+        else:
+            self._file = gzip.open(path, "wt", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns)
+
+    def write(self, rows: list[tuple]) -> None:
+        values = [[None if value is None else str(plain_value(value)) for value in row] for row in rows]
+        if self.archive_format == "parquet":
+            import pyarrow as pa
+
+            columns = list(zip(*values)) if values else [[] for _ in self.columns]
+            self._writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=pa.string()) for column in columns], schema=self._schema
+            ))
+        else:
+            self._writer.writerows([["" if value is None else value for value in row] for row in values])
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if self.archive_format == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
+
+
+async def archive_partition(db, table: str, partition: str, path: Path, archive_format: str) -> int:
+    """Copy a partition to ``path`` (written atomically); returns the row count.
+
+    Pages through the partition by primary key rather than holding a cursor
+    open, so the partition can be dropped in the same transaction.
+    """
+    columns = list((await db.execute(text(f"SELECT * FROM {partition} LIMIT 0"))).keys())
+    first_page = text(f"SELECT * FROM {partition} ORDER BY created_at, id LIMIT :limit")
+    next_page = text(
+        f"SELECT * FROM {partition} WHERE (created_at, id) > (:created_at, :id) "
+        "ORDER BY created_at, id LIMIT :limit"
+    )
+    temporary = path.with_name(path.name + ".tmp")
+    writer = _ArchiveWriter(temporary, columns, archive_format)
+    try:
+        rows = (await db.execute(first_page, {"limit": EXPORT_CHUNK_ROWS})).all()
+        while rows:
+            await asyncio.to_thread(writer.write, rows)
+            last = rows[-1]._mapping
+            rows = (await db.execute(
+                next_page, {"created_at": last["created_at"], "id": last["id"], "limit": EXPORT_CHUNK_ROWS}
+            )).all()
+    finally:
+        writer.close()
+
+    expected = (await db.execute(text(f"SELECT count(*) FROM {partition}"))).scalar()
+    if writer.rows != expected:
+        temporary.unlink(missing_ok=True)
+        raise RuntimeError(f"Archived {writer.rows} of {expected} rows from {partition}")
+    os.replace(temporary, path)
+    return writer.rows
+
+
+async def archive_month(db, month: date, archive_format: Optional[str] = None) -> bool:
+    """Archive one month of orders and order items, then drop its partitions.
+
+    Months that still hold orders in a non-terminal status are left alone.
+    Returns whether the month was archived.
+    """
+    archive_format = archive_format or settings.ORDER_ARCHIVE_FORMAT
+    if archive_format not in ARCHIVE_SUFFIXES:
+        raise ValueError(f"Unsupported archive format: {archive_format}")
+    if archive_format == "parquet" and not parquet_available():
+        raise ValueError("Parquet archives require pyarrow to be installed")
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+    partitions = {table: (await list_partitions(db, table)).get(month) for table in PARTITIONED_TABLES}
+    if partitions["orders"] is None:
+        await db.rollback()
+        return False
+
+    await db.execute(text(
+        f"LOCK TABLE {', '.join(name for name in partitions.values() if name)} IN SHARE MODE"
+    ))
+    open_orders = (await db.execute(text(
+        f"SELECT count(*) FROM {partitions['orders']} WHERE status NOT IN ('DELIVERED', 'CANCELLED')"
+    ))).scalar()
+    if open_orders:
+        logger.warning("Not archiving %s: %s orders are still open", f"{month:%Y-%m}", open_orders)
+        await db.rollback()
+        return False
+
+    for table, partition in partitions.items():
+        if partition is None:
+            continue
+        path = archive_path(table, month, archive_format)
+        rows = await archive_partition(db, table, partition, path, archive_format)
+        logger.info("Archived %s rows from %s", rows, partition)
+
+    for table, partition in partitions.items():
+        if partition is not None:
+            await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+            await db.execute(text(f"DROP TABLE {partition}"))
+    await db.commit()
+    return True
+
+
+async def archive_old_partitions(
+    db,
+    before: Optional[date] = None,
+    archive_format: Optional[str] = None
+) -> list[date]:
+    """Archive every monthly partition that ends before ``before``.
+
+    Defaults to keeping ``ORDER_ARCHIVE_AFTER_MONTHS`` months online.
+    Returns the months archived.
+    """
+    if not await is_partitioned(db, "orders"):
+        return []
+    before = month_start(before or add_months(date.today(), -settings.ORDER_ARCHIVE_AFTER_MONTHS))
+
+    months = sorted(month for month in await list_partitions(db, "orders") if month < before)
+    await db.commit()
+    archived = []
+    for month in months:
+        if await archive_month(db, month, archive_format):
+            archived.append(month)
+    return archived
+
+
+def _read_rows(path: Path) -> Iterator[list[dict]]:
+    if path.name.endswith(ARCHIVE_SUFFIXES["parquet"]):
+        import pyarrow.parquet as pq
+
+        archive = pq.ParquetFile(path)
+        for batch in archive.iter_batches(batch_size=EXPORT_CHUNK_ROWS, columns=list(EXPORT_COLUMNS)):
+            yield batch.to_pylist()
+    else:
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as file:
+            chunk = []
+            for row in csv.DictReader(file):
+                chunk.append({column: row[column] or None for column in EXPORT_COLUMNS})
+                if len(chunk) == EXPORT_CHUNK_ROWS:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+
+def _parse(column: str, value: Optional[str]):
+    if value is None:
+        return None
+    parser = _PARSERS.get(column)
+    return parser(value) if parser else value
+
+
+def iter_archived_orders(
+    date_from: date,
+    date_to: date,
+    statuses: Optional[Sequence[OrderStatus]] = None,
+    store_id: Optional[UUID] = None
+) -> Iterator[list[tuple]]:
+    """Yield chunks of archived orders as ``EXPORT_COLUMNS`` tuples, oldest first."""
+    start = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+    end = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    wanted_store = str(store_id) if store_id else None
+    wanted_statuses = {status.name for status in statuses} if statuses else None
+
+    for month, path in sorted(archived_months().items()):
+        if month > date_to or add_months(month, 1) <= date_from:
+            continue
+        for records in _read_rows(path):
+            chunk = []
+            for record in records:
+                if wanted_store and record["store_id"] != wanted_store:
+                    continue
+                if wanted_statuses and record["status"] not in wanted_statuses:
+                    continue
+                created_at = datetime.fromisoformat(record["created_at"])
+                if not start <= created_at < end:
+                    continue
+                chunk.append(tuple(_parse(column, record[column]) for column in EXPORT_COLUMNS))
+            if chunk:
+                yield chunk
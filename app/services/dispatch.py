@@ -0,0 +1,342 @@
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, shard_router
+from app.models import DeliveryRoute, DispatchPlan, Order, RouteStop, Store
+from app.models.order import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+# Only orders still waiting for a courier are batched. ON_THE_WAY orders have
+# already left with one; re-planning them would hand the same order to a
+# second courier and reshuffle a route that is being driven.
+DISPATCH_STATUSES = (OrderStatus.PREPARING,)
+
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LON = 111.320
+
+
+@dataclass(slots=True)
+class PlannerOrder:
+    id: UUID
+    order_number: str
+    store_id: UUID
+    latitude: Decimal
+    longitude: Decimal
+    ready_at: float  # epoch seconds
+    x: float = 0.0
+    y: float = 0.0
+
+
+def _project(latitude: float, longitude: float, cos_lat: float) -> tuple[float, float]:
+    """Equirectangular projection to kilometres; accurate enough at city scale."""
+    return longitude * KM_PER_DEGREE_LON * cos_lat, latitude * KM_PER_DEGREE_LAT
+
+
+def cluster_orders(
+    orders: Sequence[PlannerOrder],
+    max_batch_size: int,
+    max_radius_km: float,
+    time_window_seconds: float
+) -> list[list[PlannerOrder]]:
+    """Greedily group one store's orders into batches.
+
+    The oldest unassigned order seeds a batch and pulls in its nearest
+    unassigned neighbours that are within ``max_radius_km`` of it and ready
+    within ``time_window_seconds``. A uniform grid with cells of the radius
+    size keeps the neighbour search local, so a tick is ~O(n) instead of
+    O(n^2).
+    """
+    ordered = sorted(orders, key=lambda order: order.ready_at)
+    grid: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for index, order in enumerate(ordered):
+        grid[(int(order.x // max_radius_km), int(order.y // max_radius_km))].append(index)
+
+    assigned = bytearray(len(ordered))
+    radius_squared = max_radius_km * max_radius_km
+    batches = []
+
+    for seed_index, seed in enumerate(ordered):
+        if assigned[seed_index]:
+            continue
+        assigned[seed_index] = 1
+        batch = [seed]
+
+        if max_batch_size > 1:
+            cell_x, cell_y = int(seed.x // max_radius_km), int(seed.y // max_radius_km)
+            candidates = []
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for index in grid.get((cell_x + dx, cell_y + dy), ()):
+                        if assigned[index]:
+                            continue
+                        other = ordered[index]
+                        if abs(other.ready_at - seed.ready_at) > time_window_seconds:
+                            continue
+                        distance = (other.x - seed.x) ** 2 + (other.y - seed.y) ** 2
+                        if distance <= radius_squared:
+                            candidates.append((distance, index))
+
+            candidates.sort()
+            for _, index in candidates[:max_batch_size - 1]:
+                assigned[index] = 1
+                batch.append(ordered[index])
+
+        batches.append(batch)
+
+    return batches
+
+
+def _distance(a: tuple[float, float], b: tuple[float, float]) -> float:
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def order_route(
+    start: Optional[tuple[float, float]],
+    stops: Sequence[PlannerOrder]
+) -> list[PlannerOrder]:
+    """Sequence stops with nearest-neighbour, then improve with 2-opt.
+
+    The path is open: it starts at the store (or the first stop when the
+    store has no coordinates) and ends at the last drop.
+    """
+    remaining = list(stops)
+    if start is None:
+        first = remaining.pop(0)
+        path = [first]
+        current = (first.x, first.y)
+    else:
+        path = []
+        current = start
+
+    while remaining:
+        nearest = min(remaining, key=lambda stop: _distance(current, (stop.x, stop.y)))
+        remaining.remove(nearest)
+        path.append(nearest)
+        current = (nearest.x, nearest.y)
+
+    points = ([start] if start is not None else []) + [(stop.x, stop.y) for stop in path]
+    offset = 1 if start is not None else 0
+    if len(points) < 3:
+        return path
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(points) - 1):
+            for j in range(i + 1, len(points)):
+                before = _distance(points[i - 1], points[i])
+                after = _distance(points[i - 1], points[j])
+                if j + 1 < len(points):
+                    before += _distance(points[j], points[j + 1])
+                    after += _distance(points[i], points[j + 1])
+                if after < before - 1e-9:
+                    points[i:j + 1] = reversed(points[i:j + 1])
+                    path[i - offset:j + 1 - offset] = reversed(path[i - offset:j + 1 - offset])
+                    improved = True
+
+    return path
+
+
+def plan_routes(
+    orders: Iterable[PlannerOrder],
+    store_locations: dict[UUID, tuple[Decimal, Decimal]],
+    max_batch_size: Optional[int] = None,
+    max_radius_km: Optional[float] = None,
+    time_window_minutes: Optional[float] = None
+) -> list[DeliveryRoute]:
+    """Cluster ready orders per store and sequence each batch into a route.
+
+    Options left as ``None`` come from settings. A ``time_window_minutes`` of
+    0 only batches orders that became ready at the same moment.
+    """
+    if max_batch_size is None:
+        max_batch_size = settings.DISPATCH_MAX_BATCH_SIZE
+    if max_radius_km is None:
+        max_radius_km = settings.DISPATCH_MAX_RADIUS_KM
+    if time_window_minutes is None:
+        time_window_minutes = settings.DISPATCH_TIME_WINDOW_MINUTES
+    if max_batch_size < 1 or max_radius_km <= 0 or time_window_minutes < 0:
+        raise ValueError("max_batch_size and max_radius_km must be positive and time_window_minutes not negative")
+    time_window = time_window_minutes * 60
+
+    by_store: dict[UUID, list[PlannerOrder]] = defaultdict(list)
+    for order in orders:
+        by_store[order.store_id].append(order)
+
+    routes = []
+    for store_id, store_orders in by_store.items():
+        location = store_locations.get(store_id)
+        reference_lat = float(location[0]) if location else float(store_orders[0].latitude)
+        cos_lat = math.cos(math.radians(reference_lat))
+        for order in store_orders:
+            order.x, order.y = _project(float(order.latitude), float(order.longitude), cos_lat)
+        start = _project(float(location[0]), float(location[1]), cos_lat) if location else None
+
+        for batch in cluster_orders(store_orders, max_batch_size, max_radius_km, time_window):
+            path = order_route(start, batch)
+            previous = start
+            stops = []
+            for sequence, stop in enumerate(path, start=1):
+                leg = _distance(previous, (stop.x, stop.y)) if previous is not None else 0.0
+                stops.append(RouteStop(
+                    sequence=sequence,
+                    order_id=stop.id,
+                    order_number=stop.order_number,
+                    latitude=stop.latitude,
+                    longitude=stop.longitude,
+                    distance_from_previous_km=round(leg, 3)
+                ))
+                previous = (stop.x, stop.y)
+            routes.append(DeliveryRoute(
+                store_id=store_id,
+                stops=stops,
+                total_distance_km=round(sum(stop.distance_from_previous_km for stop in stops), 3)
+            ))
+
+    return routes
+
+
+async def _ready_order_rows(db) -> list:
+    result = await db.execute(
+        select(
+            Order.id, Order.order_number, Order.store_id,
+            Order.delivery_latitude, Order.delivery_longitude,
+            Order.preparing_at, Order.created_at
+        )
+        .where(
+            Order.status.in_(DISPATCH_STATUSES),
+            Order.delivery_latitude.is_not(None),
+            Order.delivery_longitude.is_not(None)
+        )
+    )
+    return result.all()
+
+
+async def load_ready_orders(db) -> tuple[list[PlannerOrder], dict[UUID, tuple[Decimal, Decimal]]]:
+    """Fetch dispatchable orders with coordinates, plus their stores' locations.
+
+    With store shards the orders are gathered from every shard concurrently;
+    store locations always come from ``db``, the directory database.
+    """
+    if shard_router:
+        rows = list(itertools.chain.from_iterable(await shard_router.fan_out(_ready_order_rows)))
+    else:
+        rows = await _ready_order_rows(db)
+
+    orders = []
+    for row in rows:
+        ready_at = row.preparing_at or row.created_at
+        orders.append(PlannerOrder(
+            id=row.id,
+            order_number=row.order_number,
+            store_id=row.store_id,
+            latitude=row.delivery_latitude,
+            longitude=row.delivery_longitude,
+            ready_at=ready_at.timestamp() if ready_at else 0.0
+        ))
+
+    store_locations = {}
+    store_ids = {order.store_id for order in orders}
+    if store_ids:
+        result = await db.execute(
+            select(Store.id, Store.latitude, Store.longitude).where(Store.id.in_(store_ids))
+        )
+        for row in result.all():
+            if row.latitude is not None and row.longitude is not None:
+                store_locations[row.id] = (row.latitude, row.longitude)
+
+    return orders, store_locations
+
+
+class DispatchPlanner:
+    """Keeps the latest dispatch plan and refreshes it on a fixed interval.
+
+    With ``path`` the plan is written there after each tick and ``latest``
+    rereads it when it changes, so every worker on the host serves the plan
+    made by whichever one planned last, while only one runs the loop.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = Path(path) if path else None
+        self._latest: Optional[DispatchPlan] = None
+        self._loaded_mtime: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def latest(self) -> Optional[DispatchPlan]:
+        if self.path is not None:
+            try:
+                mtime = self.path.stat().st_mtime_ns
+                if mtime != self._loaded_mtime:
+                    self._latest = DispatchPlan.model_validate_json(self.path.read_bytes())
+                    self._loaded_mtime = mtime
+            except (OSError, ValueError):
+                pass
+        return self._latest
+
+    def _store(self, plan: DispatchPlan) -> None:
+        self._latest = plan
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        partial.write_text(plan.model_dump_json())
+        os.replace(partial, self.path)
+        self._loaded_mtime = self.path.stat().st_mtime_ns
+
+    async def plan(self, **options) -> DispatchPlan:
+        """Plan now; ``options`` override ``plan_routes``'s settings for this plan."""
+        async with self._lock:
+            async with AsyncSessionLocal() as db:
+                orders, store_locations = await load_ready_orders(db)
+
+            started = time.perf_counter()
+            routes = plan_routes(orders, store_locations, **options)
+            plan = DispatchPlan(
+                planned_at=datetime.utcnow(),
+                planning_ms=round((time.perf_counter() - started) * 1000, 2),
+                order_count=len(orders),
+                routes=routes
+            )
+            self._store(plan)
+            return plan
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.plan()
+            except Exception:
+                logger.exception("Dispatch planning tick failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+planner = DispatchPlanner(settings.DISPATCH_PLAN_FILE)
@@ -0,0 +1,220 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from functools import partial
+from operator import itemgetter
+from typing import AsyncIterator, Callable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.database import store_session, store_session_factories
+from app.core.shards import merge_sorted_chunks
+from app.models import Order
+from app.models.order import OrderStatus
+
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_COLUMNS = (
+    "id", "order_number", "store_id", "user_id", "status",
+    "payment_method", "payment_status",
+    "subtotal", "delivery_fee", "discount_amount", "total",
+    "delivery_address", "delivery_reference",
+    "created_at", "confirmed_at", "delivered_at", "cancelled_at",
+)
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_export_query(
+    date_from: date,
+    date_to: date,
+    statuses: Optional[Sequence[OrderStatus]] = None,
+    store_id: Optional[UUID] = None
+):
+    """Select plain columns (no ORM entities) so rows never enter the identity map."""
+    query = (
+        select(*[getattr(Order, column) for column in EXPORT_COLUMNS])
+        .where(
+            Order.created_at >= datetime.combine(date_from, time.min),
+            Order.created_at < datetime.combine(date_to + timedelta(days=1), time.min)
+        )
+        .order_by(Order.created_at)
+    )
+    if statuses:
+        query = query.where(Order.status.in_(statuses))
+    if store_id:
+        query = query.where(Order.store_id == store_id)
+    return query
+
+
+async def _stream_rows(query, new_session: Callable) -> AsyncIterator[list[tuple]]:
+    """Yield chunks of rows from a server-side cursor.
+
+    The generator owns its session: StreamingResponse iterates after the
+    endpoint (and its request-scoped session) has returned.
+    """
+    async with new_session() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_CHUNK_ROWS)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+
+def plain_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def export_rows(
+    date_from: date,
+    date_to: date,
+    statuses: Optional[Sequence[OrderStatus]] = None,
+    store_id: Optional[UUID] = None
+) -> AsyncIterator[list[tuple]]:
+    """Yield export rows oldest first: archived months from disk, then the database."""
+    from app.services.archive import iter_archived_orders
+
+    archived = iter_archived_orders(date_from, date_to, statuses, store_id)
+    while (rows := await asyncio.to_thread(next, archived, None)) is not None:
+        yield rows
+
+    query = build_export_query(date_from, date_to, statuses, store_id)
+    if store_id is not None:
+        sources = [partial(store_session, store_id)]
+    else:
+        sources = store_session_factories()
+    streams = [_stream_rows(query, source) for source in sources]
+    # Each shard returns its rows by created_at; interleave them.
+    rows_source = streams[0] if len(streams) == 1 else merge_sorted_chunks(
+        streams, key=itemgetter(EXPORT_COLUMNS.index("created_at"))
+    )
+    async for rows in rows_source:
+        yield rows
+
+
+async def _csv_chunks(rows_source: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for rows in rows_source:
+        writer.writerows([plain_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def _ndjson_chunks(rows_source: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    async for rows in rows_source:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, map(plain_value, row))), ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the caller on ``drain``."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    money = pa.decimal128(12, 2)
+    timestamp = pa.timestamp("us")
+    types = {
+        "subtotal": money, "delivery_fee": money,
+        "discount_amount": money, "total": money,
+        "created_at": timestamp, "confirmed_at": timestamp,
+        "delivered_at": timestamp, "cancelled_at": timestamp,
+    }
+    return pa.schema([(column, types.get(column, pa.string())) for column in EXPORT_COLUMNS])
+
+
+async def _parquet_chunks(rows_source: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    """Write one Parquet row group per cursor chunk and flush it immediately."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    string_columns = {field.name for field in schema if pa.types.is_string(field.type)}
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        async for rows in rows_source:
+            columns = list(zip(*rows))
+            arrays = [
+                pa.array(
+                    [plain_value(value) for value in values] if name in string_columns
+                    else [
+                        value.replace(tzinfo=None) if isinstance(value, datetime) else value
+                        for value in values
+                    ],
+                    type=schema.field(name).type
+                )
+                for name, values in zip(EXPORT_COLUMNS, columns)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_orders_export(rows: AsyncIterator[list[tuple]], export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """Return an async byte iterator for ``rows`` (see ``export_rows``) in ``export_format``."""
+    if export_format == ExportFormat.CSV:
+        return _csv_chunks(rows)
+    if export_format == ExportFormat.NDJSON:
+        return _ndjson_chunks(rows)
+    return _parquet_chunks(rows)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import re
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Range-partitioned by created_at month (see the partition_orders_by_month migration).
+PARTITIONED_TABLES = ("orders", "order_items")
+
+# Serialises partition DDL across workers.
+PARTITION_LOCK_KEY = 7_310_017
+
+_PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+async def is_partitioned(db, table: str) -> bool:
+    result = await db.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.oid = to_regclass(:table))"
+        ),
+        {"table": table}
+    )
+    return bool(result.scalar())
+
+
+async def list_partitions(db, table: str) -> dict[date, str]:
+    """Monthly partitions currently attached to ``table``, keyed by month."""
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table}
+    )
+    partitions = {}
+    for (name,) in result.all():
+        match = _PARTITION_NAME.search(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+async def ensure_partitions(db, months_ahead: Optional[int] = None) -> list[str]:
+    """Create any missing monthly partitions from this month to ``months_ahead``.
+
+    Does nothing on databases where the tables are not partitioned. Returns
+    the names of the partitions created.
+    """
+    months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    created = []
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+
+    current = month_start(date.today())
+    for table in PARTITIONED_TABLES:
+        if not await is_partitioned(db, table):
+            continue
+        existing = await list_partitions(db, table)
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            name = partition_name(table, month)
+            await db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}T00:00:00+00:00') TO ('{add_months(month, 1)}T00:00:00+00:00')"
+            ))
+            created.append(name)
+
+    await db.commit()
+    for name in created:
+        logger.info("Created partition %s", name)
+    return created
+
+
+class PartitionMaintainer:
+    """Creates upcoming order partitions and archives old ones on a fixed interval."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    async def tick(self) -> None:
+        async with AsyncSessionLocal() as db:
+            await ensure_partitions(db)
+            if settings.ORDER_ARCHIVE_ENABLED:
+                from app.services.archive import archive_old_partitions
+
+                await archive_old_partitions(db)
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Partition maintenance failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+partition_maintainer = PartitionMaintainer()
@@ -0,0 +1,100 @@
+"""Cached lambda statements for the queries that run on every request.
+
+``lambda_stmt`` builds each expression tree once per code location and
+reuses its cache key, so repeated calls skip both statement construction
+and SQL compilation; closure variables become bound parameters.
+"""
+from typing import Collection, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.models import Admin, DeliveryZone, Store, User
+
+
+def user_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.email == email))
+
+
+def store_by_owner_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Store).where(Store.owner_email == email))
+
+
+def admin_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Admin).where(Admin.email == email))
+
+
+def store_listing(
+    skip: int,
+    limit: int,
+    search: Optional[str] = None,
+    only_active: bool = True,
+    only_approved: bool = True,
+    deliverable_ids: Optional[Collection[UUID]] = None,
+    columns: Optional[Sequence[str]] = None
+) -> StatementLambdaElement:
+    """Public store listing; each combination of filters is its own cached shape.
+
+    With ``deliverable_ids`` only those stores and stores without active
+    delivery zones are listed. With ``columns`` the rows are those columns
+    only, instead of ``Store`` objects.
+    """
+    stmt = _store_select(columns)
+
+    if deliverable_ids is not None:
+        deliverable = list(deliverable_ids)
+        # OFFSET 0 keeps the EXISTS a per-row probe of ix_delivery_zones_store_id;
+        # otherwise Postgres may hash every zone before reading the first store.
+        stmt += lambda s: s.where(
+            Store.id.in_(deliverable) |
+            ~select(DeliveryZone.id)
+            .where(DeliveryZone.store_id == Store.id, DeliveryZone.is_active == True)
+            .offset(0)
+            .exists()
+        )
+
+    if only_active:
+        stmt += lambda s: s.where(Store.is_active == True)
+
+    if only_approved:
+        stmt += lambda s: s.where(Store.is_approved == True)
+
+    if search:
+        pattern = f"%{search}%"
+        stmt += lambda s: s.where(
+            Store.store_name.ilike(pattern) |
+            Store.address.ilike(pattern) |
+            Store.description.ilike(pattern)
+        )
+
+    # id breaks rating ties so pages neither repeat nor skip stores
+    stmt += lambda s: s.order_by(Store.rating.desc(), Store.id).offset(skip).limit(limit)
+    return stmt
+
+
+def pending_stores(skip: int, limit: int, columns: Optional[Sequence[str]] = None) -> StatementLambdaElement:
+    stmt = _store_select(columns)
+    stmt += lambda s: (
+        s.where(Store.is_approved == False, Store.is_active == True)
+        .order_by(Store.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return stmt
+
+
+def _store_select(columns: Optional[Sequence[str]]) -> StatementLambdaElement:
+    if columns is None:
+        return lambda_stmt(lambda: select(Store))
+    # The columns are the cache key: one cached shape per fieldset
+    selected = tuple(Store.__table__.c[name] for name in columns)
+    return lambda_stmt(lambda: select(*selected), track_on=[selected])
+
+
+def store_zones(store_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(DeliveryZone)
+        .where(DeliveryZone.store_id == store_id)
+        .order_by(DeliveryZone.created_at)
+    )
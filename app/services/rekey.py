@@ -0,0 +1,75 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Insert-heavy tables whose legacy uuid4 keys can be moved to UUIDv7.
+# Rekeying orders also rewrites order_items.order_id, since partitioned
+# order_items cannot reference orders with a cascading foreign key.
+REKEY_TABLES = ("orders", "order_items", "cart_items")
+
+_BATCH_SQL = """
+WITH batch AS (
+    SELECT id FROM {table}
+    WHERE id > :after AND substr(id::text, 15, 1) <> '7'
+    ORDER BY id
+    LIMIT :limit
+    FOR UPDATE
+), rekeyed AS (
+    UPDATE {table} AS t
+    SET id = uuid7(coalesce(t.created_at, now()))
+    FROM batch
+    WHERE t.id = batch.id
+    RETURNING batch.id
+)
+SELECT count(*), max(id::text) FROM rekeyed
+"""
+
+_ORDERS_BATCH_SQL = """
+WITH batch AS (
+    SELECT id, created_at FROM orders
+    WHERE id > :after AND substr(id::text, 15, 1) <> '7'
+    ORDER BY id
+    LIMIT :limit
+    FOR UPDATE
+), mapping AS (
+    SELECT id AS old_id, uuid7(coalesce(created_at, now())) AS new_id FROM batch
+), items AS (
+    UPDATE order_items AS i
+    SET order_id = mapping.new_id
+    FROM mapping
+    WHERE i.order_id = mapping.old_id
+), rekeyed AS (
+    UPDATE orders AS o
+    SET id = mapping.new_id
+    FROM mapping
+    WHERE o.id = mapping.old_id
+    RETURNING mapping.old_id AS id
+)
+SELECT count(*), max(id::text) FROM rekeyed
+"""
+
+
+async def rekey_table(db, table: str, batch_size: int = 5000) -> int:
+    """Rewrite every non-v7 primary key in ``table`` as ``uuid7(created_at)``.
+
+    Walks the primary key in order and commits after each batch, so it can
+    be interrupted and resumed. Returns the number of rows rewritten.
+    """
+    if table not in REKEY_TABLES:
+        raise ValueError(f"Unsupported table: {table}")
+
+    statement = text(_ORDERS_BATCH_SQL if table == "orders" else _BATCH_SQL.format(table=table))
+    after = UUID(int=0)
+    total = 0
+    while True:
+        result = await db.execute(statement, {"after": after, "limit": batch_size})
+        count, last_id = result.one()
+        await db.commit()
+        if not count:
+            return total
+        total += count
+        after = UUID(last_id)
+        logger.info("Rekeyed %s rows in %s", total, table)
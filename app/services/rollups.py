@@ -0,0 +1,360 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, cast, Date, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Order, OrderItem
+from app.models.order import OrderStatus
+from app.models.report import RollupMismatch, StoreDailySales, StoreProductDailySales
+from app.services.archive import archived_months
+from app.services.partitions import add_months
+
+TERMINAL_STATUSES = (OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+
+STATUS_TIMESTAMPS = {
+    OrderStatus.CONFIRMED: "confirmed_at",
+    OrderStatus.PREPARING: "preparing_at",
+    OrderStatus.ON_THE_WAY: "on_the_way_at",
+    OrderStatus.DELIVERED: "delivered_at",
+    OrderStatus.CANCELLED: "cancelled_at",
+}
+
+ALLOWED_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.CONFIRMED, OrderStatus.CANCELLED},
+    OrderStatus.CONFIRMED: {OrderStatus.PREPARING, OrderStatus.CANCELLED},
+    OrderStatus.PREPARING: {OrderStatus.ON_THE_WAY, OrderStatus.CANCELLED},
+    OrderStatus.ON_THE_WAY: {OrderStatus.DELIVERED, OrderStatus.CANCELLED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+AMOUNT_FIELDS = ("subtotal", "delivery_fee", "discount_amount", "total")
+
+
+def rollup_day(moment: datetime) -> date:
+    """Map a naive UTC timestamp to the reporting day."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(ZoneInfo(settings.REPORTS_TIMEZONE)).date()
+
+
+def _day_expression(column):
+    """SQL equivalent of ``rollup_day`` for naive UTC timestamp columns."""
+    return cast(
+        func.timezone(settings.REPORTS_TIMEZONE, func.timezone("UTC", column)),
+        Date
+    )
+
+
+async def apply_order_status(
+    db: AsyncSession,
+    order: Order,
+    new_status: OrderStatus,
+    cancellation_reason: Optional[str] = None
+) -> Order:
+    """Move an order to ``new_status`` and fold it into the sales rollups.
+
+    The rollup upserts run in the caller's transaction, so they commit or
+    roll back together with the status change. The caller should load the
+    order ``FOR UPDATE`` to serialize concurrent transitions.
+    """
+    if new_status not in ALLOWED_TRANSITIONS[order.status]:
+        raise ValueError(
+            f"Cannot change order status from {order.status.value} to {new_status.value}"
+        )
+
+    now = datetime.utcnow()
+    order.status = new_status
+    setattr(order, STATUS_TIMESTAMPS[new_status], now)
+    if new_status == OrderStatus.CANCELLED:
+        order.cancellation_reason = cancellation_reason
+
+    if new_status in TERMINAL_STATUSES:
+        await _add_to_rollups(db, order, rollup_day(now))
+
+    return order
+
+
+async def _add_to_rollups(db: AsyncSession, order: Order, day: date) -> None:
+    """Increment the store/day/status counters for a finished order."""
+    values = {
+        "store_id": order.store_id,
+        "day": day,
+        "status": order.status,
+        "order_count": 1,
+        **{field: getattr(order, field) for field in AMOUNT_FIELDS},
+    }
+    stmt = insert(StoreDailySales).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["store_id", "day", "status"],
+        set_={
+            "order_count": StoreDailySales.order_count + stmt.excluded.order_count,
+            **{
+                field: getattr(StoreDailySales, field) + getattr(stmt.excluded, field)
+                for field in AMOUNT_FIELDS
+            },
+            "updated_at": func.now(),
+        }
+    )
+    await db.execute(stmt)
+
+    if order.status != OrderStatus.DELIVERED:
+        return
+
+    result = await db.execute(
+        select(
+            OrderItem.product_id,
+            OrderItem.product_name,
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.total_price)
+        )
+        .where(OrderItem.order_id == order.id)
+        .group_by(OrderItem.product_id, OrderItem.product_name)
+    )
+    rows = [
+        {
+            "store_id": order.store_id,
+            "day": day,
+            "product_id": product_id,
+            "product_name": product_name,
+            "quantity": quantity,
+            "revenue": revenue,
+        }
+        for product_id, product_name, quantity, revenue in result.all()
+    ]
+    if not rows:
+        return
+
+    stmt = insert(StoreProductDailySales).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["store_id", "day", "product_id"],
+        set_={
+            "product_name": stmt.excluded.product_name,
+            "quantity": StoreProductDailySales.quantity + stmt.excluded.quantity,
+            "revenue": StoreProductDailySales.revenue + stmt.excluded.revenue,
+        }
+    )
+    await db.execute(stmt)
+
+
+def _raw_sales_query(date_from: date, date_to: date, store_id: Optional[UUID] = None):
+    """Aggregate finished orders straight from ``orders``, shaped like the rollup."""
+    finished_at = func.coalesce(Order.delivered_at, Order.cancelled_at)
+    day = _day_expression(finished_at)
+    query = (
+        select(
+            Order.store_id,
+            day.label("day"),
+            Order.status,
+            func.count().label("order_count"),
+            *[func.sum(getattr(Order, field)).label(field) for field in AMOUNT_FIELDS]
+        )
+        .where(
+            Order.status.in_(TERMINAL_STATUSES),
+            day.between(date_from, date_to)
+        )
+        .group_by(Order.store_id, day, Order.status)
+    )
+    if store_id:
+        query = query.where(Order.store_id == store_id)
+    return query
+
+
+def _raw_product_query(date_from: date, date_to: date, store_id: Optional[UUID] = None):
+    """Aggregate delivered order lines straight from ``order_items``."""
+    day = _day_expression(Order.delivered_at)
+    query = (
+        select(
+            Order.store_id,
+            day.label("day"),
+            OrderItem.product_id,
+            func.max(OrderItem.product_name).label("product_name"),
+            func.sum(OrderItem.quantity).label("quantity"),
+            func.sum(OrderItem.total_price).label("revenue")
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(
+            Order.status == OrderStatus.DELIVERED,
+            day.between(date_from, date_to)
+        )
+        .group_by(Order.store_id, day, OrderItem.product_id)
+    )
+    if store_id:
+        query = query.where(Order.store_id == store_id)
+    return query
+
+
+def archived_rollup_months(date_from: date, date_to: date) -> list[date]:
+    """Archived order months that fed rollup days between ``date_from`` and ``date_to``.
+
+    Orders are rolled up on the day they end but archived by the month they
+    were created, so an archived month also feeds the start of the next one.
+    """
+    return sorted(
+        month for month in archived_months()
+        if month <= date_to and add_months(month, 2) > date_from
+    )
+
+
+async def backfill_rollups(
+    db: AsyncSession,
+    date_from: date,
+    date_to: date,
+    store_id: Optional[UUID] = None
+) -> int:
+    """Rebuild the rollups for a date range from the raw order tables.
+
+    Returns the number of store/day/status rows written. Commits on success.
+    Raises ``ValueError`` if archived orders fed the range: their rollups
+    would be deleted and not rebuilt.
+    """
+    archived = archived_rollup_months(date_from, date_to)
+    if archived:
+        raise ValueError(
+            "Orders of " + ", ".join(f"{month:%Y-%m}" for month in archived)
+            + f" are archived; rebuild ranges from {add_months(archived[-1], 2):%Y-%m} on"
+        )
+
+    for model in (StoreDailySales, StoreProductDailySales):
+        conditions = [model.day.between(date_from, date_to)]
+        if store_id:
+            conditions.append(model.store_id == store_id)
+        await db.execute(delete(model).where(and_(*conditions)))
+
+    sales = _raw_sales_query(date_from, date_to, store_id).subquery()
+    result = await db.execute(
+        insert(StoreDailySales).from_select(
+            ["store_id", "day", "status", "order_count", *AMOUNT_FIELDS],
+            select(sales)
+        )
+    )
+    written = result.rowcount
+
+    products = _raw_product_query(date_from, date_to, store_id).subquery()
+    await db.execute(
+        insert(StoreProductDailySales).from_select(
+            ["store_id", "day", "product_id", "product_name", "quantity", "revenue"],
+            select(products)
+        )
+    )
+
+    await db.commit()
+    return written
+
+
+def mismatch_sort_key(mismatch: RollupMismatch) -> str:
+    return str((mismatch.store_id, mismatch.day, mismatch.status))
+
+
+async def check_rollups(
+    db: AsyncSession,
+    date_from: date,
+    date_to: date,
+    store_id: Optional[UUID] = None
+) -> list[RollupMismatch]:
+    """Compare the rollups against the raw order tables and list every difference."""
+    expected = {}
+    for row in (await db.execute(_raw_sales_query(date_from, date_to, store_id))).all():
+        expected[(row.store_id, row.day, row.status)] = row
+
+    query = select(StoreDailySales).where(StoreDailySales.day.between(date_from, date_to))
+    if store_id:
+        query = query.where(StoreDailySales.store_id == store_id)
+    actual = {
+        (row.store_id, row.day, row.status): row
+        for row in (await db.execute(query)).scalars().all()
+    }
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        raw, rollup = expected.get(key), actual.get(key)
+        for field in ("order_count", *AMOUNT_FIELDS):
+            raw_value = getattr(raw, field) if raw else None
+            rollup_value = getattr(rollup, field) if rollup else None
+            if (raw_value or 0) != (rollup_value or 0):
+                mismatches.append(RollupMismatch(
+                    store_id=key[0],
+                    day=key[1],
+                    status=key[2],
+                    field=field,
+                    expected=raw_value,
+                    actual=rollup_value
+                ))
+
+    return mismatches
+
+
+async def get_sales_report(
+    db: AsyncSession,
+    store_id: UUID,
+    date_from: date,
+    date_to: date,
+    top: int = 10
+) -> dict:
+    """Build a store sales report from the rollup tables only."""
+    result = await db.execute(
+        select(StoreDailySales)
+        .where(
+            StoreDailySales.store_id == store_id,
+            StoreDailySales.day.between(date_from, date_to)
+        )
+        .order_by(StoreDailySales.day)
+    )
+
+    days: dict[date, dict] = defaultdict(lambda: {
+        "delivered_orders": 0, "cancelled_orders": 0, "revenue": Decimal("0")
+    })
+    for row in result.scalars().all():
+        bucket = days[row.day]
+        if row.status == OrderStatus.DELIVERED:
+            bucket["delivered_orders"] += row.order_count
+            bucket["revenue"] += row.total
+        else:
+            bucket["cancelled_orders"] += row.order_count
+
+    product_result = await db.execute(
+        select(
+            StoreProductDailySales.product_id,
+            func.max(StoreProductDailySales.product_name).label("product_name"),
+            func.sum(StoreProductDailySales.quantity).label("quantity"),
+            func.sum(StoreProductDailySales.revenue).label("revenue")
+        )
+        .where(
+            StoreProductDailySales.store_id == store_id,
+            StoreProductDailySales.day.between(date_from, date_to)
+        )
+        .group_by(StoreProductDailySales.product_id)
+        .order_by(func.sum(StoreProductDailySales.revenue).desc())
+        .limit(top)
+    )
+
+    delivered = sum(bucket["delivered_orders"] for bucket in days.values())
+    revenue = sum((bucket["revenue"] for bucket in days.values()), Decimal("0"))
+
+    return {
+        "store_id": store_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "delivered_orders": delivered,
+        "cancelled_orders": sum(bucket["cancelled_orders"] for bucket in days.values()),
+        "revenue": revenue,
+        "average_ticket": _average(revenue, delivered),
+        "days": [
+            {"day": day, **bucket, "average_ticket": _average(bucket["revenue"], bucket["delivered_orders"])}
+            for day, bucket in sorted(days.items())
+        ],
+        "top_products": [dict(row._mapping) for row in product_result.all()],
+    }
+
+
+def _average(amount: Decimal, count: int) -> Decimal:
+    if not count:
+        return Decimal("0.00")
+    return (amount / count).quantize(Decimal("0.01"))
@@ -0,0 +1,50 @@
+"""Single-statement writes for the mutation endpoints.
+
+Each helper issues one ``UPDATE ... RETURNING`` or ``INSERT ... ON CONFLICT
+DO NOTHING RETURNING`` and hands back the written row as a model instance, so
+endpoints need neither a SELECT before the write nor a refresh after it.
+"""
+from typing import Any, Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Table, bindparam, lambda_stmt, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlmodel import SQLModel
+
+from app.models import Store
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+async def update_store(db: AsyncSession, store_id: UUID, **values: Any) -> Optional[Store]:
+    """Update a store and return its new state; ``None`` if it does not exist."""
+    result = await db.execute(
+        update(Store).where(Store.id == store_id).values(**values).returning(Store),
+        execution_options={"populate_existing": True},
+    )
+    return result.scalar_one_or_none()
+
+
+def _insert_unless_exists(table: Table, unique_column) -> StatementLambdaElement:
+    # postgresql.insert() has no cache key of its own and would be compiled
+    # on every call; as a lambda statement it compiles once per table.
+    return lambda_stmt(
+        lambda: insert(table)
+        .values({column.name: bindparam(column.name, type_=column.type) for column in table.columns})
+        .on_conflict_do_nothing(index_elements=[unique_column])
+        .returning(*table.columns)
+    )
+
+
+async def insert_unless_exists(db: AsyncSession, instance: ModelT, unique_column) -> Optional[ModelT]:
+    """Insert ``instance`` unless a row with the same ``unique_column`` exists.
+
+    Returns the inserted row, or ``None`` on conflict. The unique index
+    decides, so concurrent registrations of one email cannot both succeed.
+    """
+    model = type(instance)
+    result = await db.execute(_insert_unless_exists(model.__table__, unique_column), instance.model_dump())
+    row = result.one_or_none()
+    return model(**row._mapping) if row else None
@@ -0,0 +1,175 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models import DeliveryZone
+
+
+@dataclass(slots=True)
+class PreparedZone:
+    """A polygon flattened for fast point-in-polygon tests."""
+    zone_id: UUID
+    store_id: UUID
+    name: str
+    xs: tuple[float, ...]  # longitudes
+    ys: tuple[float, ...]  # latitudes
+    bbox: tuple[float, float, float, float]  # min_x, min_y, max_x, max_y
+
+    @classmethod
+    def from_polygon(cls, zone_id: UUID, store_id: UUID, name: str, polygon: Sequence[Sequence[float]]):
+        ys = tuple(float(point[0]) for point in polygon)
+        xs = tuple(float(point[1]) for point in polygon)
+        return cls(zone_id, store_id, name, xs, ys, (min(xs), min(ys), max(xs), max(ys)))
+
+    def contains(self, x: float, y: float) -> bool:
+        """Even-odd ray casting; points on the boundary may fall either way."""
+        xs, ys = self.xs, self.ys
+        inside = False
+        j = len(xs) - 1
+        for i in range(len(xs)):
+            yi, yj = ys[i], ys[j]
+            if (yi > y) != (yj > y):
+                if x < xs[i] + (y - yi) * (xs[j] - xs[i]) / (yj - yi):
+                    inside = not inside
+            j = i
+        return inside
+
+
+class RTree:
+    """Static R-tree over bounding boxes, bulk-loaded with Sort-Tile-Recursive.
+
+    Zones change rarely, so the tree is rebuilt rather than updated in place.
+    """
+
+    def __init__(self, items: Sequence[PreparedZone], node_capacity: int = 16) -> None:
+        self.node_capacity = node_capacity
+        entries = [(item.bbox, item) for item in items]
+        self.root = self._build(entries) if entries else None
+
+    def _build(self, entries):
+        is_leaf = True
+        while True:
+            nodes = self._pack(entries, is_leaf)
+            if len(nodes) == 1:
+                return nodes[0]
+            entries, is_leaf = nodes, False
+
+    def _pack(self, entries, is_leaf):
+        capacity = self.node_capacity
+        slab_count = max(1, math.ceil(math.sqrt(math.ceil(len(entries) / capacity))))
+        slab_size = math.ceil(len(entries) / slab_count)
+        entries = sorted(entries, key=lambda entry: entry[0][0] + entry[0][2])
+
+        nodes = []
+        for start in range(0, len(entries), slab_size):
+            slab = sorted(entries[start:start + slab_size], key=lambda entry: entry[0][1] + entry[0][3])
+            for node_start in range(0, len(slab), capacity):
+                children = slab[node_start:node_start + capacity]
+                bbox = (
+                    min(child[0][0] for child in children),
+                    min(child[0][1] for child in children),
+                    max(child[0][2] for child in children),
+                    max(child[0][3] for child in children),
+                )
+                nodes.append((bbox, (is_leaf, children)))
+        return nodes
+
+    def query_point(self, x: float, y: float) -> list[PreparedZone]:
+        """Return items whose bounding box contains the point."""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            bbox, (is_leaf, children) = stack.pop()
+            if not (bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]):
+                continue
+            if is_leaf:
+                found.extend(
+                    item for child_bbox, item in children
+                    if child_bbox[0] <= x <= child_bbox[2] and child_bbox[1] <= y <= child_bbox[3]
+                )
+            else:
+                stack.extend(children)
+        return found
+
+
+class DeliveryZoneIndex:
+    """In-process spatial index of every active delivery zone.
+
+    The index reloads from the database when it is older than
+    ``DELIVERY_ZONE_INDEX_TTL_SECONDS`` (so other workers pick up zone
+    edits) or right after a local edit calls ``invalidate``. Stores that
+    have no active zone are treated as delivering everywhere.
+    """
+
+    def __init__(self) -> None:
+        self._tree = RTree([])
+        self._zoned_stores: frozenset[UUID] = frozenset()
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def load(self, zones: Iterable[PreparedZone]) -> None:
+        zones = list(zones)
+        self._tree = RTree(zones)
+        self._zoned_stores = frozenset(zone.store_id for zone in zones)
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
+
+    async def ensure_fresh(self, db) -> "DeliveryZoneIndex":
+        if time.monotonic() - self._loaded_at < settings.DELIVERY_ZONE_INDEX_TTL_SECONDS:
+            return self
+        async with self._lock:
+            if time.monotonic() - self._loaded_at >= settings.DELIVERY_ZONE_INDEX_TTL_SECONDS:
+                result = await db.execute(
+                    select(DeliveryZone.id, DeliveryZone.store_id, DeliveryZone.name, DeliveryZone.polygon)
+                    .where(DeliveryZone.is_active == True)
+                )
+                self.load(
+                    PreparedZone.from_polygon(zone_id, store_id, name, polygon)
+                    for zone_id, store_id, name, polygon in result.all()
+                )
+        return self
+
+    def zones_at(self, latitude: float, longitude: float) -> list[PreparedZone]:
+        """Return every zone containing the point."""
+        x, y = float(longitude), float(latitude)
+        return [zone for zone in self._tree.query_point(x, y) if zone.contains(x, y)]
+
+    def stores_delivering_to(self, latitude: float, longitude: float) -> set[UUID]:
+        """Return ids of zoned stores that deliver to the point."""
+        return {zone.store_id for zone in self.zones_at(latitude, longitude)}
+
+    def has_zones(self, store_id: UUID) -> bool:
+        return store_id in self._zoned_stores
+
+    @property
+    def zoned_stores(self) -> frozenset[UUID]:
+        return self._zoned_stores
+
+    def delivers_to(self, store_id: UUID, latitude: float, longitude: float) -> Optional[PreparedZone]:
+        """Return the zone covering the point, or ``None`` if the store cannot deliver.
+
+        Stores without zones cover every point; the returned zone is then ``None``
+        too, so callers should check ``has_zones`` to tell the cases apart.
+        """
+        for zone in self.zones_at(latitude, longitude):
+            if zone.store_id == store_id:
+                return zone
+        return None
+
+    def is_deliverable(self, store_id: UUID, latitude: float, longitude: float) -> bool:
+        if not self.has_zones(store_id):
+            return True
+        return self.delivers_to(store_id, latitude, longitude) is not None
+
+
+zone_index = DeliveryZoneIndex()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the delivery dispatch planner.
+
+Generates open orders around Lima for a number of stores and times
+``plan_routes`` (clustering + nearest-neighbour + 2-opt) per tick.
+
+    python -m benchmarks.bench_dispatch --orders 5000 --stores 50
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from app.services.dispatch import PlannerOrder, plan_routes
+
+LIMA = (-12.0464, -77.0428)
+
+
+def generate(order_count: int, store_count: int, seed: int):
+    rng = random.Random(seed)
+    stores = {
+        uuid4(): (
+            Decimal(f"{LIMA[0] + rng.uniform(-0.15, 0.15):.8f}"),
+            Decimal(f"{LIMA[1] + rng.uniform(-0.15, 0.15):.8f}"),
+        )
+        for _ in range(store_count)
+    }
+    store_ids = list(stores)
+    now = time.time()
+    orders = []
+    for number in range(order_count):
+        store_id = rng.choice(store_ids)
+        latitude, longitude = stores[store_id]
+        orders.append(PlannerOrder(
+            id=uuid4(),
+            order_number=f"ORD{number:08d}",
+            store_id=store_id,
+            latitude=Decimal(f"{float(latitude) + rng.gauss(0, 0.03):.8f}"),
+            longitude=Decimal(f"{float(longitude) + rng.gauss(0, 0.03):.8f}"),
+            ready_at=now - rng.uniform(0, 45 * 60),
+        ))
+    return orders, stores
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--stores", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    orders, stores = generate(args.orders, args.stores, seed=42)
+
+    timings = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        routes = plan_routes(orders, stores)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    stops = sum(len(route.stops) for route in routes)
+    distance = sum(route.total_distance_km for route in routes)
+    print(f"🚚 Dispatch planner: {args.orders} orders, {args.stores} stores")
+    print(f"Routes: {len(routes)} ({stops / len(routes):.2f} stops/route, {distance:.1f} km total)")
+    print(f"Tick: median {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms")
+
+    if max(timings) > args.budget_ms:
+        print(f"❌ Over budget ({args.budget_ms:.0f} ms)")
+        return 1
+    print(f"✅ Within budget ({args.budget_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
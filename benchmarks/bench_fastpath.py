@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the raw asyncpg fast path against the ORM path.
+
+Seeds throwaway stores in the database from ``DATABASE_URL``, then runs the
+store-by-id, store listing and principal lookups with ``DB_FAST_PATH`` off
+and on, reporting rows/sec and latency percentiles. The seeded stores are
+deleted afterwards.
+
+    python -m benchmarks.bench_fastpath --stores 500 --iterations 2000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+from sqlalchemy import delete
+
+from app.api.deps import load_principal
+from app.api.v1.endpoints.stores import get_store, get_stores
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models import Store
+
+MARKER = "bench-fastpath"
+
+
+async def seed(count: int) -> list[str]:
+    rng = random.Random(42)
+    async with AsyncSessionLocal() as db:
+        stores = [
+            Store(
+                owner_name="Bench",
+                owner_email=f"{MARKER}-{number}@example.com",
+                owner_phone="999999999",
+                password="x",
+                store_name=f"{MARKER} {number}",
+                description="Benchmark store",
+                address="Av. Benchmark 123",
+                latitude=Decimal(f"{-12.0464 + rng.uniform(-0.1, 0.1):.8f}"),
+                longitude=Decimal(f"{-77.0428 + rng.uniform(-0.1, 0.1):.8f}"),
+                rating=Decimal(f"{rng.uniform(0, 5):.1f}"),
+                is_approved=True
+            )
+            for number in range(count)
+        ]
+        db.add_all(stores)
+        await db.commit()
+        return [str(store.id) for store in stores]
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Store).where(Store.owner_email.like(f"{MARKER}-%")))
+        await db.commit()
+
+
+async def measure(name: str, call, iterations: int, rows_per_call: int) -> dict:
+    timings = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(min(50, iterations)):
+            await call(db)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await call(db)
+            timings.append((time.perf_counter() - started) * 1000)
+            await db.rollback()
+
+    timings.sort()
+    total_seconds = sum(timings) / 1000
+    return {
+        "name": name,
+        "rows_per_sec": iterations * rows_per_call / total_seconds,
+        "p50": statistics.median(timings),
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+async def run(args) -> int:
+    await cleanup()
+    store_ids = await seed(args.stores)
+    rng = random.Random(7)
+    page = min(args.page_size, 100)
+
+    def by_id(db):
+        return get_store(store_id=rng.choice(store_ids), db=db)
+
+    def listing(db):
+        return get_stores(
+            skip=0, limit=page, search=MARKER, only_active=True,
+            only_approved=True, latitude=None, longitude=None, db=db
+        )
+
+    def principal(db):
+        return load_principal(db, Store, rng.choice(store_ids))
+
+    cases = [("store by id", by_id, 1), (f"store list ({page})", listing, page), ("principal", principal, 1)]
+    results = []
+    try:
+        for fast in (False, True):
+            settings.DB_FAST_PATH = fast
+            for name, call, rows in cases:
+                result = await measure(name, call, args.iterations, rows)
+                result["path"] = "fast" if fast else "orm"
+                results.append(result)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+    print(f"⚡ Fast path vs ORM: {args.stores} stores, {args.iterations} iterations")
+    for name, _, _ in cases:
+        orm, fast = [result for result in results if result["name"] == name]
+        print(
+            f"{name:<18} orm {orm['rows_per_sec']:>10.0f} rows/s p99 {orm['p99']:6.2f} ms | "
+            f"fast {fast['rows_per_sec']:>10.0f} rows/s p99 {fast['p99']:6.2f} ms | "
+            f"x{fast['rows_per_sec'] / orm['rows_per_sec']:.2f}"
+        )
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stores", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark the journaled demo repository: restart time and write latency.
+
+Restart: writes a snapshot of ``--records`` rows (one store per four users)
+plus a journal tail of ``--tail`` store updates, then times
+``JournaledRepository.open()`` and the first reads after it. For reference it
+also times one full JSON dump of the same rows, which is what persisting the
+old dicts on every write would cost per request, and estimates eager
+validation of every row from a sample.
+
+Writes: ``--writers`` concurrent tasks register users, each acknowledged
+after fsync: with one fsync per write, with group commit (writes queued
+behind an fsync in flight share the next one), and with a 10 ms window.
+
+    python -m benchmarks.bench_journal --records 1000000 --tail 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from app.models import Store, User
+from app.repositories import JournaledRepository
+from app.repositories.journal import JOURNAL, SNAPSHOT, _sync, encode
+
+
+class SyncEveryWrite(JournaledRepository):
+    """Baseline: one fsync per write, no sharing."""
+
+    async def _append(self, record: list) -> None:
+        async with self._sync_lock:
+            self._journal.write(encode(record))
+            await asyncio.to_thread(_sync, self._journal)
+
+
+def templates() -> tuple[dict, dict]:
+    user = User(name="Bench", email="bench@example.com", phone="999999999", password="x" * 97)
+    store = Store(
+        owner_name="Bench",
+        owner_email="bench-store@example.com",
+        owner_phone="999999999",
+        password="x" * 97,
+        store_name="Bench store",
+        description="Benchmark store",
+        address="Av. Benchmark 123",
+        is_approved=True
+    )
+    return user.model_dump(mode="json"), store.model_dump(mode="json")
+
+
+def write_dataset(directory: Path, records: int, tail: int) -> list[dict]:
+    user, store = templates()
+    rows = []
+    store_ids = []
+    with open(directory / SNAPSHOT, "wb", buffering=1024 * 1024) as file:
+        for number in range(records):
+            row_id = str(uuid.uuid4())
+            if number % 5 == 4:
+                row = dict(store, id=row_id, owner_email=f"store-{number}@example.com", rating=f"{random.uniform(0, 5):.1f}")
+                store_ids.append(row_id)
+                file.write(encode(["add", "stores", row]))
+            else:
+                row = dict(user, id=row_id, email=f"user-{number}@example.com")
+                file.write(encode(["add", "users", row]))
+            rows.append(row)
+
+    with open(directory / JOURNAL, "wb") as file:
+        for _ in range(tail):
+            values = {"rating": f"{random.uniform(0, 5):.1f}", "updated_at": store["updated_at"]}
+            file.write(encode(["set", "stores", random.choice(store_ids), values]))
+    return rows
+
+
+async def bench_restart(records: int, tail: int, sample: int) -> None:
+    directory = Path(tempfile.mkdtemp(prefix="bench-journal-"))
+    try:
+        started = time.perf_counter()
+        rows = write_dataset(directory, records, tail)
+        size = sum(path.stat().st_size for path in directory.iterdir())
+        print(f"dataset: {records:,} rows + {tail:,} journal records, "
+              f"{size / 1e6:.0f} MB, written in {time.perf_counter() - started:.1f} s")
+
+        started = time.perf_counter()
+        text = json.dumps(rows)
+        print(f"full JSON dump (per write, if the dicts were rewritten): "
+              f"{time.perf_counter() - started:.2f} s, {len(text) / 1e6:.0f} MB")
+        del text
+
+        repository = JournaledRepository(directory, compact_after=records * 2)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        await repository.open()
+        elapsed = time.perf_counter() - started
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"restart (replay snapshot + tail): {elapsed:.2f} s, "
+              f"{len(repository.users):,} users, {len(repository.stores):,} stores, "
+              f"peak RSS +{(rss_after - rss_before) / 1024:.0f} MB")
+
+        started = time.perf_counter()
+        await repository.list_stores(0, 20)
+        print(f"first listing page: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+        emails = [f"user-{number}@example.com" for number in random.sample(range(records), 1000) if number % 5 != 4]
+        started = time.perf_counter()
+        for email in emails:
+            await repository.get_user_by_email(email)
+        print(f"first lookup by email: {(time.perf_counter() - started) / len(emails) * 1e6:.1f} us")
+
+        users = [row for row in rows[:sample * 5] if "email" in row][:sample]
+        started = time.perf_counter()
+        for row in users:
+            User.model_validate(row)
+        per_row = (time.perf_counter() - started) / len(users)
+        print(f"eager validation of every row (estimated from {len(users):,}): {per_row * records:.1f} s")
+        await repository.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+async def bench_writes(label: str, repository_class, writers: int, writes: int, fsync_interval: float) -> None:
+    directory = Path(tempfile.mkdtemp(prefix="bench-journal-"))
+    repository = repository_class(directory, fsync_interval=fsync_interval)
+    await repository.open()
+    fsyncs = 0
+    sync = os.fsync
+
+    def counting_fsync(descriptor):
+        nonlocal fsyncs
+        fsyncs += 1
+        sync(descriptor)
+
+    os.fsync = counting_fsync
+    latencies = []
+
+    async def writer(number: int) -> None:
+        for write in range(writes):
+            user = User(name="Bench", email=f"w{number}-{write}@example.com", phone="999999999", password="x")
+            started = time.perf_counter()
+            await repository.add_user(user)
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(number) for number in range(writers)))
+        elapsed = time.perf_counter() - started
+        await repository.close()
+    finally:
+        os.fsync = sync
+        shutil.rmtree(directory)
+
+    latencies.sort()
+    print(f"{label:<22} {len(latencies) / elapsed:>7.0f} writes/s, "
+          f"{fsyncs:>5} fsyncs, p50 {statistics.median(latencies) * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--tail", type=int, default=10_000)
+    parser.add_argument("--sample", type=int, default=10_000)
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--writes", type=int, default=50)
+    args = parser.parse_args()
+
+    await bench_restart(args.records, args.tail, args.sample)
+    await bench_writes("fsync per write", SyncEveryWrite, args.writers, args.writes, 0.0)
+    await bench_writes("group commit", JournaledRepository, args.writers, args.writes, 0.0)
+    await bench_writes("group commit, 10 ms", JournaledRepository, args.writers, args.writes, 0.01)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization of the store listing payload.
+
+Builds the ``GET /api/v1/stores/`` body for ``--rows`` stores and runs it
+through FastAPI's own response pipeline (``serialize_response`` for the
+route's response field, then the response class's ``render``) two ways: the
+previous ``response_model=dict[str, Any]`` with ``JSONResponse``, and the
+typed ``Page[StorePublic]`` with ``ORJSONResponse``. The admin pending list,
+whose rows are ORM ``Store`` objects, is measured the same way; there the
+typed model costs more, since each row is now validated into
+``StoreResponse`` (which is what drops ``password``). Reports CPU time per
+response; no database is needed.
+
+    python -m benchmarks.bench_serialization --rows 100 --iterations 5000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models import Page, Store, StorePublic, StoreResponse
+
+
+def stores(count: int) -> list[Store]:
+    now = datetime.utcnow()
+    return [
+        Store(
+            id=uuid4(),
+            owner_name="Bench",
+            owner_email=f"bench-{number}@example.com",
+            owner_phone="999999999",
+            password="x" * 97,
+            store_name=f"Store {number}",
+            description="Comida criolla y bebidas",
+            address="Av. Benchmark 123, Lima",
+            latitude=Decimal("-12.04637400"),
+            longitude=Decimal("-77.04279300"),
+            rating=Decimal("4.5"),
+            total_reviews=120,
+            is_approved=True,
+            created_at=now,
+            updated_at=now
+        )
+        for number in range(count)
+    ]
+
+
+def body(data: list, rows: int) -> dict:
+    return {"success": True, "data": data, "pagination": {"skip": 0, "limit": rows, "total": rows}}
+
+
+async def measure(label: str, response_model, response_class, content: dict, iterations: int) -> float:
+    field = create_response_field(name="Response", type_=response_model, mode="serialization")
+    size = 0
+    started = time.process_time()
+    for _ in range(iterations):
+        value = await serialize_response(field=field, response_content=content)
+        size = len(response_class(value).body)
+    per_response = (time.process_time() - started) / iterations
+    print(f"{label:<48} {per_response * 1e6:>8.0f} us/response  {size:>7,} bytes")
+    return per_response
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = stores(args.rows)
+    public = [StorePublic.model_validate(store) for store in rows]
+
+    print(f"GET /stores/ payload, {args.rows} rows")
+    before = await measure("dict[str, Any] + JSONResponse", dict[str, Any], JSONResponse, body(public, args.rows), args.iterations)
+    after = await measure("Page[StorePublic] + ORJSONResponse", Page[StorePublic], ORJSONResponse, body(public, args.rows), args.iterations)
+    print(f"CPU per response: {after / before:.2f}x")
+
+    print(f"\nGET /stores/admin/pending payload, {args.rows} ORM rows")
+    before = await measure("dict[str, Any] + JSONResponse (leaks password)", dict[str, Any], JSONResponse, body(rows, args.rows), args.iterations)
+    after = await measure("Page[StoreResponse] + ORJSONResponse", Page[StoreResponse], ORJSONResponse, body(rows, args.rows), args.iterations)
+    print(f"CPU per response: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark uuid4 vs UUIDv7 primary keys on insert-heavy tables.
+
+Loads the same number of order-sized rows into two scratch tables, one
+keyed by uuid4 and one by ``app.core.ids.uuid7``, in batches through COPY.
+Reports insert throughput at the start and end of the load (random keys
+slow down once the primary key index no longer fits in shared buffers),
+WAL written, and the final primary key index size and leaf density.
+
+    python -m benchmarks.bench_uuid7 --rows 20000000
+
+Runs against ``DATABASE_URL``; the scratch tables are dropped afterwards
+unless ``--keep`` is given. Leaf density needs the pgstattuple extension.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.ids import uuid7
+
+TABLES = {
+    "uuid4": ("bench_uuid4_orders", uuid.uuid4),
+    "uuid7": ("bench_uuid7_orders", uuid7),
+}
+
+PAYLOAD = "x" * 120  # roughly an order row's address and notes
+
+
+async def load(connection, table: str, make_id, rows: int, batch: int) -> dict:
+    await connection.execute(f"DROP TABLE IF EXISTS {table}")
+    await connection.execute(
+        f"CREATE TABLE {table} (id uuid PRIMARY KEY, created_at timestamptz NOT NULL, payload text NOT NULL)"
+    )
+    wal_start = await connection.fetchval("SELECT pg_current_wal_lsn()")
+
+    rates = []
+    inserted = 0
+    elapsed = 0.0
+    while inserted < rows:
+        count = min(batch, rows - inserted)
+        now = datetime.now(timezone.utc)
+        records = [(make_id(), now, PAYLOAD) for _ in range(count)]
+        started = time.perf_counter()
+        await connection.copy_records_to_table(table, records=records, columns=("id", "created_at", "payload"))
+        seconds = time.perf_counter() - started
+        rates.append(count / seconds)
+        elapsed += seconds
+        inserted += count
+
+    wal_bytes = await connection.fetchval(
+        "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), $1::pg_lsn)", wal_start
+    )
+    index_bytes = await connection.fetchval(f"SELECT pg_relation_size('{table}_pkey')")
+    try:
+        density = await connection.fetchval(f"SELECT avg_leaf_density FROM pgstatindex('{table}_pkey')")
+    except asyncpg.PostgresError:
+        density = None
+
+    tenth = max(1, len(rates) // 10)
+    return {
+        "first": sum(rates[:tenth]) / tenth,
+        "last": sum(rates[-tenth:]) / tenth,
+        "overall": rows / elapsed,
+        "wal_mb": wal_bytes / 2**20,
+        "index_mb": index_bytes / 2**20,
+        "density": density,
+    }
+
+
+async def run(args) -> int:
+    connection = await asyncpg.connect(settings.DATABASE_URL)
+    try:
+        try:
+            await connection.execute("CREATE EXTENSION IF NOT EXISTS pgstattuple")
+        except asyncpg.PostgresError:
+            pass
+
+        print(f"🔑 uuid4 vs uuid7 primary keys: {args.rows:,} rows, batches of {args.batch:,}")
+        results = {}
+        for name, (table, make_id) in TABLES.items():
+            results[name] = await load(connection, table, make_id, args.rows, args.batch)
+            result = results[name]
+            density = f"{result['density']:.1f}%" if result["density"] is not None else "n/a"
+            print(
+                f"{name}: {result['overall']:>10,.0f} rows/s overall "
+                f"(first 10% {result['first']:,.0f}, last 10% {result['last']:,.0f}) | "
+                f"WAL {result['wal_mb']:,.0f} MB | pkey {result['index_mb']:,.0f} MB, leaf density {density}"
+            )
+
+        speedup = results["uuid7"]["overall"] / results["uuid4"]["overall"]
+        size = results["uuid7"]["index_mb"] / results["uuid4"]["index_mb"]
+        print(f"✅ uuid7 inserts x{speedup:.2f} vs uuid4, pkey {size:.2f}x the size")
+    finally:
+        if not args.keep:
+            for table, _ in TABLES.values():
+                await connection.execute(f"DROP TABLE IF EXISTS {table}")
+        await connection.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables for inspection")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTTP throughput: single-process uvicorn against ``app.server``.
+
+Starts ``--app`` three ways in turn: ``uvicorn.run`` in one process (how
+``railway_main`` and ``demo_main`` run), ``app.server`` with one worker, and
+``app.server`` with ``--workers`` (default: one per available CPU). Each is
+driven by ``--connections`` keep-alive connections spread over
+``--client-processes`` load generator processes for ``--duration`` seconds,
+and requests/s and latency percentiles are reported. Run the load generator
+on spare cores (or another machine) for meaningful numbers; sharing the
+server's cores understates multi-worker gains.
+
+    python -m benchmarks.bench_workers --app app.main:app --path /health --duration 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.server import available_cpus
+
+HOST = "127.0.0.1"
+
+
+async def _connection(port: int, request: bytes, deadline: float, latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+def _generate_load(port: int, path: str, connections: int, duration: float) -> list[float]:
+    request = f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode()
+    latencies: list[float] = []
+
+    async def run() -> None:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(_connection(port, request, deadline, latencies) for _ in range(connections)))
+
+    asyncio.run(run())
+    return latencies
+
+
+def _wait_listening(port: int, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def measure(label: str, command: list[str], port: int, args) -> float:
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_listening(port, process)
+        # Warm up every worker
+        _generate_load(port, args.path, args.connections, 1.0)
+
+        per_process = max(1, args.connections // args.client_processes)
+        with ProcessPoolExecutor(args.client_processes) as pool:
+            futures = [
+                pool.submit(_generate_load, port, args.path, per_process, args.duration)
+                for _ in range(args.client_processes)
+            ]
+            latencies = sorted(latency for future in futures for latency in future.result())
+    finally:
+        process.terminate()
+        process.wait(30)
+
+    throughput = len(latencies) / args.duration
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{label:<28} {throughput:>9,.0f} req/s   p50 {p50:>7.2f} ms   p99 {p99:>7.2f} ms")
+    return throughput
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="app.main:app")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=available_cpus())
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--client-processes", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    port = str(args.port)
+    single = [
+        sys.executable, "-c",
+        f"import uvicorn; uvicorn.run({args.app!r}, host={HOST!r}, port={args.port})"
+    ]
+    launcher = [sys.executable, "-m", "app.server", args.app, "--host", HOST, "--port", port, "--workers"]
+
+    print(f"GET {args.path} on {args.app}, {available_cpus()} CPU(s), {args.connections} connections")
+    baseline = measure("uvicorn.run (single)", single, args.port, args)
+    one = measure("app.server, 1 worker", [*launcher, "1"], args.port, args)
+    many = measure(f"app.server, {args.workers} workers", [*launcher, str(args.workers)], args.port, args)
+    print(f"1 worker vs single: {one / baseline:.2f}x, {args.workers} workers vs single: {many / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark single-statement writes against the read-modify-write path.
+
+Seeds throwaway stores in the database from ``DATABASE_URL`` and times the
+store update, approval and registration writes two ways: the previous
+``db.get`` → mutate → commit → ``db.refresh`` (and SELECT-then-INSERT for
+registration), and the ``UPDATE/INSERT ... RETURNING`` helpers in
+``app.services.writes``. Reports statements per write and latency
+percentiles. Password hashing is left out; it is the same on both paths.
+
+    python -m benchmarks.bench_writes --stores 200 --iterations 2000
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+from sqlalchemy import delete, event
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models import Store
+from app.services import queries, writes
+
+MARKER = "bench-writes"
+
+
+def new_store(email: str) -> Store:
+    return Store(
+        owner_name="Bench",
+        owner_email=email,
+        owner_phone="999999999",
+        password="x",
+        store_name=f"{MARKER} store",
+        description="Benchmark store",
+        address="Av. Benchmark 123",
+        delivery_fee=Decimal("3.00"),
+        is_approved=False
+    )
+
+
+async def seed(count: int) -> list:
+    async with AsyncSessionLocal() as db:
+        stores = [new_store(f"{MARKER}-seed-{number}@example.com") for number in range(count)]
+        db.add_all(stores)
+        await db.commit()
+        return [store.id for store in stores]
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Store).where(Store.owner_email.like(f"{MARKER}-%")))
+        await db.commit()
+
+
+# Previous implementations, kept here for comparison
+async def update_legacy(db, store_id, **values):
+    store = await db.get(Store, store_id)
+    for field, value in values.items():
+        setattr(store, field, value)
+    await db.commit()
+    await db.refresh(store)
+    return store
+
+
+async def register_legacy(db, store):
+    result = await db.execute(queries.store_by_owner_email(store.owner_email))
+    if result.scalar_one_or_none():
+        return None
+    db.add(store)
+    await db.commit()
+    await db.refresh(store)
+    return store
+
+
+async def update_returning(db, store_id, **values):
+    store = await writes.update_store(db, store_id, **values)
+    await db.commit()
+    return store
+
+
+async def register_returning(db, store):
+    store = await writes.insert_unless_exists(db, store, Store.owner_email)
+    await db.commit()
+    return store
+
+
+async def measure(call, iterations: int, statements: list) -> dict:
+    timings = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(min(50, iterations)):
+            await call(db)
+        statements.clear()
+        for _ in range(iterations):
+            db.expunge_all()
+            started = time.perf_counter()
+            await call(db)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "statements": len(statements) / iterations,
+        "p50": statistics.median(timings),
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "ops_per_sec": iterations / (sum(timings) / 1000),
+    }
+
+
+async def run(args) -> int:
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    await cleanup()
+    store_ids = await seed(args.stores)
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    rng = random.Random(7)
+    emails = itertools.count()
+
+    def update_case(update):
+        return lambda db: update(db, rng.choice(store_ids), description=f"Updated {rng.random()}")
+
+    def approve_case(update):
+        return lambda db: update(db, rng.choice(store_ids), is_approved=rng.random() < 0.5)
+
+    def register_case(register):
+        # One in four registrations reuses an email and must be rejected
+        def call(db):
+            number = next(emails)
+            if number % 4 == 0 and number:
+                number -= 1
+            return register(db, new_store(f"{MARKER}-new-{number}@example.com"))
+        return call
+
+    cases = [
+        ("update store", update_case(update_legacy), update_case(update_returning)),
+        ("approve store", approve_case(update_legacy), approve_case(update_returning)),
+        ("register store", register_case(register_legacy), register_case(register_returning)),
+    ]
+
+    print(f"✍️  Single-statement writes: {args.stores} stores, {args.iterations} iterations")
+    try:
+        for name, legacy, returning in cases:
+            before = await measure(legacy, args.iterations, statements)
+            after = await measure(returning, args.iterations, statements)
+            print(
+                f"{name:<15} read-modify-write {before['statements']:.2f} stmts "
+                f"p50 {before['p50']:6.2f} ms p99 {before['p99']:6.2f} ms | "
+                f"returning {after['statements']:.2f} stmts "
+                f"p50 {after['p50']:6.2f} ms p99 {after['p99']:6.2f} ms | "
+                f"x{after['ops_per_sec'] / before['ops_per_sec']:.2f}"
+            )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+        await cleanup()
+        await engine.dispose()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stores", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,49 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 import hashlib
 import secrets
 from datetime import datetime, timedelta
-from jose import jwt
+from decimal import Decimal
 from typing import Dict, Any, Optional
 import json
-from uuid import uuid4
 
-app = FastAPI(title="Collique Delivery API Demo", version="1.0.0")
+from app.core.config import settings
+from app.models import Admin, Store, User
+from app.repositories import JournaledRepository, MemoryRepository
+
+# In-memory "database", indexed by id, email and store rating, and journaled
+# to DEMO_DATA_DIR so registrations survive restarts
+if settings.DEMO_DATA_DIR:
+    repository = JournaledRepository(
+        settings.DEMO_DATA_DIR,
+        fsync_interval=settings.DEMO_FSYNC_INTERVAL_SECONDS,
+        compact_after=settings.DEMO_COMPACT_AFTER_RECORDS
+    )
+else:
+    repository = MemoryRepository()
+
+async def open_repository():
+    await repository.open()
+    if not await repository.get_admin_by_email("admin@colliquedelivery.com"):
+        await repository.add_admin(Admin(
+            name="Admin Principal",
+            email="admin@colliquedelivery.com",
+            password="admin123",
+            role="superadmin",
+            is_active=True
+        ))
+
+async def close_repository():
+    await repository.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_repository()
+    yield
+    await close_repository()
+
+app = FastAPI(title="Collique Delivery API Demo", version="1.0.0", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -19,20 +54,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory "database"
-users_db: Dict[str, Dict] = {}
-stores_db: Dict[str, Dict] = {}
-admins_db: Dict[str, Dict] = {
-    "admin@colliquedelivery.com": {
-        "id": str(uuid4()),
-        "name": "Admin Principal",
-        "email": "admin@colliquedelivery.com",
-        "password": "admin123",
-        "role": "superadmin",
-        "is_active": True
-    }
-}
-
 # Security functions
 SECRET_KEY = "collique_delivery_jwt_secret_2025_jsalasinnovatech"
 ALGORITHM = "HS256"
@@ -58,6 +79,8 @@ def create_access_token(subject: str, expires_delta: timedelta = None) -> str:
     else:
         expire = datetime.utcnow() + timedelta(days=7)
 
+    from jose import jwt  # deferred: not needed until the first login
+
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -101,31 +124,33 @@ async def register_client(request: Dict[str, Any]):
             "message": "Nombre, email y contraseña son requeridos"
         }
 
-    if email in users_db:
+    if await repository.get_user_by_email(email):
         return {
             "success": False,
             "message": "El email ya está registrado"
         }
 
-    user_id = str(uuid4())
-    users_db[email] = {
-        "id": user_id,
-        "name": name,
-        "email": email,
-        "phone": phone,
-        "password": get_password_hash(password),
-        "is_active": True,
-        "created_at": datetime.utcnow().isoformat()
-    }
+    user = await repository.add_user(User(
+        name=name,
+        email=email,
+        phone=phone,
+        password=get_password_hash(password),
+        is_active=True
+    ))
+    if user is None:
+        return {
+            "success": False,
+            "message": "El email ya está registrado"
+        }
 
-    token = create_access_token(f"{user_id}:client")
+    token = create_access_token(f"{user.id}:client")
 
     return {
         "success": True,
         "message": "Usuario registrado exitosamente",
         "data": {
             "user": {
-                "id": user_id,
+                "id": str(user.id),
                 "name": name,
                 "email": email,
                 "phone": phone
@@ -145,30 +170,30 @@ async def login_client(request: Dict[str, Any]):
             "message": "Email y contraseña son requeridos"
         }
 
-    user = users_db.get(email)
-    if not user or not verify_password(password, user["password"]):
+    user = await repository.get_user_by_email(email)
+    if not user or not verify_password(password, user.password):
         return {
             "success": False,
             "message": "Credenciales incorrectas"
         }
 
-    if not user["is_active"]:
+    if not user.is_active:
         return {
             "success": False,
             "message": "Cuenta desactivada. Contacta al soporte."
         }
 
-    token = create_access_token(f"{user['id']}:client")
+    token = create_access_token(f"{user.id}:client")
 
     return {
         "success": True,
         "message": "Login exitoso",
         "data": {
             "user": {
-                "id": user["id"],
-                "name": user["name"],
-                "email": user["email"],
-                "phone": user["phone"]
+                "id": str(user.id),
+                "name": user.name,
+                "email": user.email,
+                "phone": user.phone
             },
             "token": token
         }
@@ -189,37 +214,39 @@ async def register_store(request: Dict[str, Any]):
             "message": "Todos los campos son requeridos"
         }
 
-    if owner_email in stores_db:
+    if await repository.get_store_by_email(owner_email):
         return {
             "success": False,
             "message": "El email ya está registrado"
         }
 
-    store_id = str(uuid4())
-    stores_db[owner_email] = {
-        "id": store_id,
-        "owner_name": owner_name,
-        "owner_email": owner_email,
-        "owner_phone": owner_phone,
-        "password": get_password_hash(password),
-        "store_name": store_name,
-        "description": request.get("description"),
-        "address": address,
-        "delivery_fee": request.get("delivery_fee", 3.00),
-        "delivery_time_min": request.get("delivery_time_min", 20),
-        "delivery_time_max": request.get("delivery_time_max", 40),
-        "rating": 0.0,
-        "is_active": True,
-        "is_approved": False,
-        "created_at": datetime.utcnow().isoformat()
-    }
+    store = await repository.add_store(Store(
+        owner_name=owner_name,
+        owner_email=owner_email,
+        owner_phone=owner_phone,
+        password=get_password_hash(password),
+        store_name=store_name,
+        description=request.get("description"),
+        address=address,
+        delivery_fee=Decimal(str(request.get("delivery_fee", "3.00"))),
+        delivery_time_min=request.get("delivery_time_min", 20),
+        delivery_time_max=request.get("delivery_time_max", 40),
+        rating=Decimal("0.0"),
+        is_active=True,
+        is_approved=False
+    ))
+    if store is None:
+        return {
+            "success": False,
+            "message": "El email ya está registrado"
+        }
 
     return {
         "success": True,
         "message": "Tienda registrada. Pendiente de aprobación por el administrador.",
         "data": {
             "store": {
-                "id": store_id,
+                "id": str(store.id),
                 "store_name": store_name,
                 "owner_email": owner_email,
                 "is_approved": False
@@ -238,38 +265,38 @@ async def login_store(request: Dict[str, Any]):
             "message": "Email y contraseña son requeridos"
         }
 
-    store = stores_db.get(email)
-    if not store or not verify_password(password, store["password"]):
+    store = await repository.get_store_by_email(email)
+    if not store or not verify_password(password, store.password):
         return {
             "success": False,
             "message": "Credenciales incorrectas"
         }
 
-    if not store["is_active"]:
+    if not store.is_active:
         return {
             "success": False,
             "message": "Tienda desactivada. Contacta al administrador."
         }
 
-    if not store["is_approved"]:
+    if not store.is_approved:
         return {
             "success": False,
             "message": "Tu tienda aún no ha sido aprobada. Por favor espera la aprobación del administrador."
         }
 
-    token = create_access_token(f"{store['id']}:store")
+    token = create_access_token(f"{store.id}:store")
 
     return {
         "success": True,
         "message": "Login exitoso",
         "data": {
             "store": {
-                "id": store["id"],
-                "owner_name": store["owner_name"],
-                "store_name": store["store_name"],
-                "address": store["address"],
-                "delivery_fee": store["delivery_fee"],
-                "rating": store["rating"]
+                "id": str(store.id),
+                "owner_name": store.owner_name,
+                "store_name": store.store_name,
+                "address": store.address,
+                "delivery_fee": float(store.delivery_fee),
+                "rating": float(store.rating)
             },
             "token": token
         }
@@ -286,59 +313,61 @@ async def login_admin(request: Dict[str, Any]):
             "message": "Email y contraseña son requeridos"
         }
 
-    admin = admins_db.get(email)
-    if not admin or not verify_password(password, admin["password"]):
+    admin = await repository.get_admin_by_email(email)
+    if not admin or not verify_password(password, admin.password):
         return {
             "success": False,
             "message": "Credenciales incorrectas"
         }
 
-    if not admin["is_active"]:
+    if not admin.is_active:
         return {
             "success": False,
             "message": "Cuenta desactivada"
         }
 
-    token = create_access_token(f"{admin['id']}:admin")
+    token = create_access_token(f"{admin.id}:admin")
 
     return {
         "success": True,
         "message": "Login exitoso",
         "data": {
             "admin": {
-                "id": admin["id"],
-                "name": admin["name"],
-                "email": admin["email"],
-                "role": admin["role"]
+                "id": str(admin.id),
+                "name": admin.name,
+                "email": admin.email,
+                "role": admin.role
             },
             "token": token
         }
     }
 
 @app.get("/api/v1/stores/")
-async def get_stores():
+async def get_stores(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
     approved_stores = [
         {
-            "id": store["id"],
-            "store_name": store["store_name"],
-            "description": store.get("description"),
-            "address": store["address"],
-            "delivery_fee": store["delivery_fee"],
-            "delivery_time_min": store["delivery_time_min"],
-            "delivery_time_max": store["delivery_time_max"],
-            "rating": store["rating"]
+            "id": str(store.id),
+            "store_name": store.store_name,
+            "description": store.description,
+            "address": store.address,
+            "delivery_fee": float(store.delivery_fee),
+            "delivery_time_min": store.delivery_time_min,
+            "delivery_time_max": store.delivery_time_max,
+            "rating": float(store.rating)
         }
-        for store in stores_db.values()
-        if store["is_active"] and store["is_approved"]
+        for store in await repository.list_stores(skip, limit)
     ]
 
     return {
         "success": True,
         "data": approved_stores,
         "pagination": {
-            "skip": 0,
-            "limit": 20,
-            "total": len(approved_stores)
+            "skip": skip,
+            "limit": limit,
+            "total": await repository.count_stores()
         }
     }
 
@@ -346,11 +375,11 @@ async def get_stores():
 async def get_demo_data():
     """Endpoint para mostrar datos de demostración"""
     return {
-        "users_count": len(users_db),
-        "stores_count": len(stores_db),
-        "admins_count": len(admins_db),
-        "sample_users": list(users_db.keys())[:5],
-        "sample_stores": list(stores_db.keys())[:5]
+        "users_count": len(repository.users),
+        "stores_count": len(repository.stores),
+        "admins_count": len(repository.admins),
+        "sample_users": list(repository.users.by_email)[:5],
+        "sample_stores": list(repository.stores.by_email)[:5]
     }
 
 if __name__ == "__main__":
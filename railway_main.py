@@ -8,17 +8,24 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.config import settings
+from app.core.openapi import use_cached_openapi
+from app.middleware.idempotency import IdempotencyMiddleware
+
 # Use demo endpoints for Railway deployment
 from demo_main import (
     root, health_check, register_client, login_client,
-    register_store, login_store, login_admin, get_stores, get_demo_data
+    register_store, login_store, login_admin, get_stores, get_demo_data,
+    open_repository, close_repository
 )
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lightweight lifespan for Railway deployment."""
     print("Starting Collique Delivery API on Railway...")
+    await open_repository()
     yield
+    await close_repository()
     print("Shutting down...")
 
 # Create FastAPI app optimized for Railway
@@ -31,6 +38,13 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Schema written into the image at build time
+if settings.OPENAPI_SCHEMA_FILE:
+    use_cached_openapi(app, settings.OPENAPI_SCHEMA_FILE)
+
+# Replay retried registrations instead of re-hashing passwords
+app.add_middleware(IdempotencyMiddleware)
+
 # CORS for Railway
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Response compression tests: Accept-Encoding negotiation and the compressed
+body cache.
+"""
+import gzip
+
+from app.middleware.compression import CompressedBodyCache, load_codecs, negotiate
+
+AVAILABLE = ["zstd", "br", "gzip"]
+
+
+def test_negotiate_prefers_server_order_on_ties():
+    assert negotiate("gzip, br, zstd", AVAILABLE) == "zstd"
+    assert negotiate("gzip, deflate", AVAILABLE) == "gzip"
+    assert negotiate("deflate", AVAILABLE) is None
+    assert negotiate("", AVAILABLE) is None
+
+
+def test_negotiate_uses_q_values():
+    assert negotiate("zstd;q=0.5, gzip;q=0.9, br;q=0.8", AVAILABLE) == "gzip"
+    assert negotiate("zstd;q=0.5, GZIP", AVAILABLE) == "gzip"
+    assert negotiate("br;q=1.0, zstd;q=1.0", AVAILABLE) == "zstd"
+    # A malformed q-value drops that entry only
+    assert negotiate("zstd;q=high, gzip", AVAILABLE) == "gzip"
+
+
+def test_negotiate_q_zero_refuses_an_encoding():
+    assert negotiate("zstd;q=0, br;q=0, gzip", AVAILABLE) == "gzip"
+    assert negotiate("gzip;q=0", ["gzip"]) is None
+    assert negotiate("*;q=0", AVAILABLE) is None
+
+
+def test_negotiate_wildcard():
+    assert negotiate("*", AVAILABLE) == "zstd"
+    assert negotiate("*;q=0.1, gzip", AVAILABLE) == "gzip"
+    assert negotiate("*, zstd;q=0", AVAILABLE) == "br"
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache = CompressedBodyCache(max_bytes=100)
+    cache.set(b"a", "gzip", b"x" * 40)
+    cache.set(b"b", "gzip", b"x" * 40)
+    assert cache.get(b"a", "gzip") is not None  # "b" is now the oldest
+    cache.set(b"c", "gzip", b"x" * 40)
+
+    assert cache.get(b"b", "gzip") is None
+    assert cache.get(b"a", "gzip") == b"x" * 40
+    assert cache.get(b"c", "gzip") == b"x" * 40
+    assert cache.size == 80
+    assert cache.stats() == {"entries": 2, "bytes": 80, "hits": 3, "misses": 1}
+
+
+def test_cache_keys_by_encoding_and_replaces_entries():
+    cache = CompressedBodyCache(max_bytes=100)
+    cache.set(b"a", "gzip", b"g" * 30)
+    cache.set(b"a", "br", b"b" * 20)
+    cache.set(b"a", "gzip", b"G" * 10)
+
+    assert cache.get(b"a", "gzip") == b"G" * 10
+    assert cache.get(b"a", "br") == b"b" * 20
+    assert cache.size == 30
+
+
+def test_cache_skips_bodies_larger_than_the_budget():
+    cache = CompressedBodyCache(max_bytes=100)
+    cache.set(b"a", "gzip", b"x" * 60)
+    cache.set(b"b", "gzip", b"x" * 101)
+
+    assert cache.get(b"b", "gzip") is None
+    assert cache.get(b"a", "gzip") is not None
+    assert cache.size == 60
+
+
+def test_gzip_codec_round_trip():
+    codec = load_codecs(["gzip"])["gzip"]
+    body = b'{"success": true}' * 100
+    assert gzip.decompress(codec.compress(body)) == body
+
+    stream = codec.stream()
+    streamed = stream.compress(body[:500]) + stream.compress(body[500:]) + stream.flush()
+    assert gzip.decompress(streamed) == body
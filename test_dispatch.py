@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Dispatch planner tests: clustering and route sequencing, without a database.
+
+Orders are placed directly in planner kilometres (``x``/``y``) with seeded
+random coordinates so every run sees the same inputs.
+"""
+import random
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.models import DispatchPlan
+from app.services.dispatch import (
+    DispatchPlanner, PlannerOrder, _distance, cluster_orders, order_route, plan_routes
+)
+
+STORE = uuid4()
+
+
+def _order(n: int, x: float, y: float, ready_at: float = 0.0) -> PlannerOrder:
+    return PlannerOrder(
+        id=uuid4(), order_number=f"ORD-{n}", store_id=STORE,
+        latitude=Decimal("0"), longitude=Decimal("0"), ready_at=ready_at, x=x, y=y
+    )
+
+
+def _random_orders(rng: random.Random, count: int) -> list[PlannerOrder]:
+    return [_order(n, rng.uniform(0, 10), rng.uniform(0, 10)) for n in range(count)]
+
+
+def _length(start, path) -> float:
+    points = ([start] if start is not None else []) + [(stop.x, stop.y) for stop in path]
+    return sum(_distance(a, b) for a, b in zip(points, points[1:]))
+
+
+def _nearest_neighbour_length(start, stops) -> float:
+    remaining = list(stops)
+    current = start
+    total = 0.0
+    if current is None:
+        current = (remaining[0].x, remaining[0].y)
+        remaining.pop(0)
+    while remaining:
+        nearest = min(remaining, key=lambda stop: _distance(current, (stop.x, stop.y)))
+        remaining.remove(nearest)
+        total += _distance(current, (nearest.x, nearest.y))
+        current = (nearest.x, nearest.y)
+    return total
+
+
+def test_route_visits_every_stop_once():
+    rng = random.Random(11)
+    for count in (1, 2, 3, 8, 25):
+        stops = _random_orders(rng, count)
+        for start in ((5.0, 5.0), None):
+            path = order_route(start, stops)
+            assert sorted(stop.id for stop in path) == sorted(stop.id for stop in stops)
+
+
+def test_route_without_store_location_starts_at_first_stop():
+    stops = _random_orders(random.Random(3), 6)
+    assert order_route(None, stops)[0] is stops[0]
+
+
+def test_two_opt_never_lengthens_the_route():
+    rng = random.Random(5)
+    for _ in range(50):
+        stops = _random_orders(rng, rng.randint(3, 12))
+        for start in ((rng.uniform(0, 10), rng.uniform(0, 10)), None):
+            path = order_route(start, stops)
+            assert _length(start, path) <= _nearest_neighbour_length(start, stops) + 1e-9
+
+
+def test_two_opt_removes_a_crossing():
+    # Nearest-neighbour from the origin goes 1 -> 2 -> 3 -> 4 and crosses itself
+    stops = [_order(1, 1, 0), _order(2, 2, 1), _order(3, 2, -1), _order(4, 4, 1)]
+    path = order_route((0.0, 0.0), stops)
+    assert _length((0.0, 0.0), path) < _nearest_neighbour_length((0.0, 0.0), stops)
+
+
+def test_clusters_respect_size_radius_and_time_window():
+    rng = random.Random(9)
+    orders = [_order(n, rng.uniform(0, 5), rng.uniform(0, 5), rng.uniform(0, 1800)) for n in range(200)]
+    batches = cluster_orders(orders, max_batch_size=4, max_radius_km=1.0, time_window_seconds=600)
+
+    assert sorted(order.id for batch in batches for order in batch) == sorted(order.id for order in orders)
+    for batch in batches:
+        seed = batch[0]
+        assert len(batch) <= 4
+        for order in batch[1:]:
+            assert _distance((seed.x, seed.y), (order.x, order.y)) <= 1.0 + 1e-9
+            assert abs(order.ready_at - seed.ready_at) <= 600
+
+
+def test_batch_size_one_gives_single_stop_routes():
+    orders = _random_orders(random.Random(1), 10)
+    assert all(len(batch) == 1 for batch in cluster_orders(orders, 1, 1.0, 600))
+
+
+def test_plan_routes_reports_leg_distances():
+    orders = [
+        PlannerOrder(uuid4(), f"ORD-{n}", STORE, Decimal("-12.05") + Decimal(n) / 1000, Decimal("-77.04"), 0.0)
+        for n in range(3)
+    ]
+    routes = plan_routes(orders, {STORE: (Decimal("-12.05"), Decimal("-77.04"))}, 5, 2.0, 30)
+
+    assert len(routes) == 1
+    stops = routes[0].stops
+    assert [stop.sequence for stop in stops] == [1, 2, 3]
+    assert [stop.order_number for stop in stops] == ["ORD-0", "ORD-1", "ORD-2"]
+    assert routes[0].total_distance_km == round(sum(stop.distance_from_previous_km for stop in stops), 3)
+
+
+def test_explicit_zero_time_window_is_not_replaced_by_the_default():
+    orders = [
+        PlannerOrder(uuid4(), f"ORD-{n}", STORE, Decimal("-12.05"), Decimal("-77.04"), n * 60.0)
+        for n in range(3)
+    ]
+    assert len(plan_routes(orders, {}, 5, 2.0, 0)) == 3
+    assert len(plan_routes(orders, {}, 5, 2.0, 5)) == 1
+
+
+@pytest.mark.parametrize("options", [
+    {"max_batch_size": 0}, {"max_radius_km": 0}, {"max_radius_km": -1.0}, {"time_window_minutes": -1},
+])
+def test_invalid_planner_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        plan_routes([_order(1, 0, 0)], {}, **options)
+
+
+def test_plan_file_is_shared_between_planners(tmp_path):
+    path = tmp_path / "dispatch" / "plan.json"
+    writer, reader = DispatchPlanner(str(path)), DispatchPlanner(str(path))
+    assert reader.latest is None
+
+    orders = [_order(n, n, 0) for n in range(3)]
+    plan = DispatchPlan(
+        planned_at=datetime(2025, 1, 1), planning_ms=1.0, order_count=3,
+        routes=plan_routes(orders, {}, 5, 10.0, 30)
+    )
+    writer._store(plan)
+    assert reader.latest == plan
+
+    replanned = plan.model_copy(update={"planned_at": datetime(2025, 1, 2), "routes": []})
+    reader._store(replanned)
+    assert writer.latest == replanned
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Idempotency-Key middleware tests.
+
+The middleware is called in-process with the in-memory store, in front of a
+small ASGI app that counts how often it runs.
+"""
+import asyncio
+import json
+from typing import Optional
+
+from app.middleware.idempotency import IdempotencyMiddleware
+
+
+class CountingApp:
+    """Echo the request body with ``status``; ``gate`` holds responses until set."""
+
+    def __init__(self, status: int = 201, gate: Optional[asyncio.Event] = None) -> None:
+        self.status = status
+        self.gate = gate
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send) -> None:
+        self.calls += 1
+        message = await receive()
+        if self.gate is not None:
+            await self.gate.wait()
+        await send({
+            "type": "http.response.start",
+            "status": self.status,
+            "headers": [(b"content-type", b"application/json"), (b"x-request", str(self.calls).encode())],
+        })
+        body = json.dumps({"call": self.calls, "echo": message["body"].decode()}).encode()
+        await send({"type": "http.response.body", "body": body})
+
+
+def _middleware(app, **options) -> IdempotencyMiddleware:
+    return IdempotencyMiddleware(
+        app, ttl=60, max_entries=100, max_body_size=1024, max_request_size=1024, wait_timeout=1.0, **options
+    )
+
+
+async def _post(
+    middleware, body: bytes, key: bytes = b"key-1", path: str = "/api/v1/orders/", disconnect: bool = False
+) -> dict:
+    """POST ``body``; with ``disconnect`` the client leaves after sending only part of it."""
+    messages = []
+    incoming = [{"type": "http.request", "body": body, "more_body": disconnect}]
+
+    async def receive():
+        return incoming.pop(0) if incoming else {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(b"idempotency-key", key), (b"authorization", b"Bearer token")],
+    }
+    await middleware(scope, receive, send)
+    if not messages:
+        return {"status": None, "headers": {}, "body": b""}
+    start = messages[0]
+    return {
+        "status": start["status"],
+        "headers": dict(start["headers"]),
+        "body": b"".join(message.get("body", b"") for message in messages[1:]),
+    }
+
+
+def test_repeated_key_replays_the_stored_response():
+    app = CountingApp()
+    middleware = _middleware(app)
+
+    async def run():
+        return await _post(middleware, b'{"a": 1}'), await _post(middleware, b'{"a": 1}')
+
+    first, second = asyncio.run(run())
+    assert app.calls == 1
+    assert second["status"] == first["status"] == 201
+    assert second["body"] == first["body"]
+    assert second["headers"][b"idempotent-replayed"] == b"true"
+    assert second["headers"][b"content-type"] == b"application/json"
+    # Per-response headers are not replayed
+    assert b"x-request" not in second["headers"]
+
+
+def test_key_is_scoped_by_path():
+    app = CountingApp()
+    middleware = _middleware(app)
+
+    async def run():
+        await _post(middleware, b"{}", path="/api/v1/orders/")
+        await _post(middleware, b"{}", path="/api/v1/carts/")
+
+    asyncio.run(run())
+    assert app.calls == 2
+
+
+def test_reused_key_with_a_different_body_is_rejected():
+    app = CountingApp()
+    middleware = _middleware(app)
+
+    async def run():
+        await _post(middleware, b'{"a": 1}')
+        return await _post(middleware, b'{"a": 2}')
+
+    response = asyncio.run(run())
+    assert response["status"] == 422
+    assert app.calls == 1
+
+
+def test_concurrent_duplicate_waits_for_the_first_request():
+    async def run():
+        app = CountingApp(gate=asyncio.Event())
+        middleware = _middleware(app)
+        first = asyncio.create_task(_post(middleware, b"{}"))
+        second = asyncio.create_task(_post(middleware, b"{}"))
+        await asyncio.sleep(0.05)
+        # The duplicate is parked on the in-flight request, not executing
+        assert app.calls == 1 and not second.done()
+        app.gate.set()
+        return app, await first, await second
+
+    app, first, second = asyncio.run(run())
+    assert app.calls == 1
+    assert second["body"] == first["body"]
+    assert second["headers"][b"idempotent-replayed"] == b"true"
+
+
+def test_concurrent_duplicate_times_out_with_409():
+    async def run():
+        app = CountingApp(gate=asyncio.Event())
+        middleware = _middleware(app)
+        middleware.wait_timeout = 0.05
+        first = asyncio.create_task(_post(middleware, b"{}"))
+        await asyncio.sleep(0.01)
+        second = await _post(middleware, b"{}")
+        app.gate.set()
+        await first
+        return second
+
+    assert asyncio.run(run())["status"] == 409
+
+
+def test_server_errors_are_not_stored():
+    app = CountingApp(status=503)
+    middleware = _middleware(app)
+
+    async def run():
+        first = await _post(middleware, b"{}")
+        app.status = 201
+        second = await _post(middleware, b"{}")
+        third = await _post(middleware, b"{}")
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first["status"] == 503
+    assert second["status"] == 201 and b"idempotent-replayed" not in second["headers"]
+    assert third["headers"][b"idempotent-replayed"] == b"true"
+    assert app.calls == 2
+
+
+def test_oversized_request_body_is_refused():
+    app = CountingApp()
+    middleware = _middleware(app)
+
+    response = asyncio.run(_post(middleware, b"x" * 2048))
+    assert response["status"] == 413
+    assert app.calls == 0
+
+
+def test_disconnect_mid_upload_does_not_claim_the_key():
+    app = CountingApp()
+    middleware = _middleware(app)
+
+    async def run():
+        partial = await _post(middleware, b'{"a": ', disconnect=True)
+        return partial, await _post(middleware, b'{"a": 1}')
+
+    partial, retry = asyncio.run(run())
+    assert partial["status"] is None
+    assert retry["status"] == 201
+    assert b"idempotent-replayed" not in retry["headers"]
+    assert app.calls == 1
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+UUIDv7 primary key tests: layout bits and ordering within the process.
+"""
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core import ids
+from app.core.ids import uuid7, uuid7_datetime
+
+
+def test_version_and_variant_bits():
+    for _ in range(1000):
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+
+def test_ids_are_strictly_increasing():
+    values = [uuid7() for _ in range(20000)]
+    assert all(a < b for a, b in zip(values, values[1:]))
+    assert all(a.bytes < b.bytes for a, b in zip(values, values[1:]))
+
+
+def test_counter_overflow_moves_into_the_next_millisecond(monkeypatch):
+    frozen = (ids._last_ms + 1000) * 1_000_000
+    monkeypatch.setattr(ids.time, "time_ns", lambda: frozen)
+    values = [uuid7() for _ in range(3 * (ids._COUNTER_MAX + 1))]
+
+    assert all(a < b for a, b in zip(values, values[1:]))
+    assert values[-1].int >> 80 > frozen // 1_000_000
+
+
+def test_clock_going_backwards_keeps_ordering(monkeypatch):
+    before = uuid7()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 0)
+    after = uuid7()
+    assert after > before
+    assert after.int >> 80 == before.int >> 80 or after.int >> 80 == (before.int >> 80) + 1
+
+
+def test_threads_never_share_an_id():
+    results = [[] for _ in range(8)]
+
+    def generate(out):
+        out.extend(uuid7() for _ in range(2000))
+
+    threads = [threading.Thread(target=generate, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    values = [value for out in results for value in out]
+    assert len(set(values)) == len(values)
+    for out in results:
+        assert out == sorted(out)
+
+
+def test_datetime_round_trip():
+    now = datetime.now(timezone.utc)
+    created = uuid7_datetime(uuid7())
+    assert abs(created - now) < timedelta(seconds=5)
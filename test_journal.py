@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Journaled repository durability tests.
+
+Each test writes through a ``JournaledRepository`` in a temporary
+directory, leaves its files as a crash at some point would, and checks that
+reopening restores every acknowledged write.
+"""
+import asyncio
+import shutil
+from decimal import Decimal
+from pathlib import Path
+
+from app.models import Store, User
+from app.repositories.journal import JOURNAL, OLD_JOURNAL, SNAPSHOT, JournaledRepository, encode
+
+
+def _user(n: int) -> User:
+    return User(name=f"User {n}", email=f"user{n}@example.com", phone="999999999", password="x", is_active=True)
+
+
+def _store(n: int) -> Store:
+    return Store(
+        owner_name=f"Owner {n}",
+        owner_email=f"store{n}@example.com",
+        owner_phone="999999999",
+        password="x",
+        store_name=f"Store {n}",
+        address=f"Address {n}",
+        delivery_fee=Decimal("3.00"),
+        rating=Decimal("4.0"),
+        is_active=True,
+        is_approved=True,
+    )
+
+
+async def _open(data_dir: Path, **options) -> JournaledRepository:
+    repository = JournaledRepository(data_dir, **options)
+    await repository.open()
+    return repository
+
+
+async def _reopened_state(data_dir: Path) -> dict:
+    repository = await _open(data_dir)
+    try:
+        stores = await repository.list_stores(0, 100)
+        return {
+            "users": len(repository.users),
+            "stores": {store.store_name: (store.rating, store.is_open) for store in stores},
+            "store_count": await repository.count_stores(),
+        }
+    finally:
+        await repository.close()
+
+
+def test_replay_applies_records_in_order(tmp_path):
+    async def run():
+        repository = await _open(tmp_path)
+        store = await repository.add_store(_store(1))
+        await repository.update_store(store.id, rating=Decimal("3.5"))
+        await repository.update_store(store.id, rating=Decimal("4.8"), is_open=False)
+        await repository.add_user(_user(1))
+        await repository.close()
+        return await _reopened_state(tmp_path)
+
+    state = asyncio.run(run())
+    assert state["users"] == 1
+    assert state["stores"] == {"Store 1": (Decimal("4.8"), False)}
+
+
+def test_torn_last_line_is_truncated(tmp_path):
+    async def run():
+        repository = await _open(tmp_path)
+        await repository.add_user(_user(1))
+        await repository.close()
+
+        journal = tmp_path / JOURNAL
+        intact_size = journal.stat().st_size
+        with open(journal, "ab") as file:
+            file.write(encode(["add", "users", _user(2).model_dump(mode="json")])[:25])
+
+        repository = await _open(tmp_path)
+        assert journal.stat().st_size == intact_size
+        assert len(repository.users) == 1
+        # New writes start on a clean line
+        await repository.add_user(_user(3))
+        await repository.close()
+        return await _reopened_state(tmp_path)
+
+    assert asyncio.run(run())["users"] == 2
+
+
+def test_replaying_records_twice_is_harmless(tmp_path):
+    async def run():
+        repository = await _open(tmp_path)
+        store = await repository.add_store(_store(1))
+        await repository.update_store(store.id, rating=Decimal("2.5"))
+        await repository.add_user(_user(1))
+        await repository.close()
+
+        journal = tmp_path / JOURNAL
+        journal.write_bytes(journal.read_bytes() * 2)
+        return await _reopened_state(tmp_path)
+
+    state = asyncio.run(run())
+    assert state["users"] == 1
+    assert state["store_count"] == 1
+    assert state["stores"] == {"Store 1": (Decimal("2.5"), True)}
+
+
+def test_crash_before_snapshot_is_written(tmp_path):
+    """The journal was moved aside but no snapshot covers it yet."""
+    async def run():
+        repository = await _open(tmp_path)
+        store = await repository.add_store(_store(1))
+        await repository.add_user(_user(1))
+        await repository.close()
+        (tmp_path / JOURNAL).rename(tmp_path / OLD_JOURNAL)
+        # Writes after the journal switch went to a fresh journal
+        with open(tmp_path / JOURNAL, "wb") as file:
+            file.write(encode(["set", "stores", str(store.id), {"rating": "4.9"}]))
+            file.write(encode(["add", "users", _user(2).model_dump(mode="json")]))
+
+        state = await _reopened_state(tmp_path)
+        # Reopening finished the compaction
+        assert not (tmp_path / OLD_JOURNAL).exists()
+        assert (tmp_path / SNAPSHOT).exists()
+        return state, await _reopened_state(tmp_path)
+
+    state, again = asyncio.run(run())
+    assert state == again
+    assert state["users"] == 2
+    assert state["stores"] == {"Store 1": (Decimal("4.9"), True)}
+
+
+def test_crash_after_snapshot_before_old_journal_is_removed(tmp_path):
+    """The snapshot already covers the old journal, which is replayed again."""
+    async def run():
+        repository = await _open(tmp_path)
+        store = await repository.add_store(_store(1))
+        await repository.update_store(store.id, rating=Decimal("1.5"))
+        await repository.add_user(_user(1))
+        shutil.copy(tmp_path / JOURNAL, tmp_path / "journal.copy")
+        await repository.compact()
+        await repository.add_user(_user(2))
+        await repository.close()
+        (tmp_path / "journal.copy").rename(tmp_path / OLD_JOURNAL)
+        return await _reopened_state(tmp_path)
+
+    state = asyncio.run(run())
+    assert state["users"] == 2
+    assert state["store_count"] == 1
+    assert state["stores"] == {"Store 1": (Decimal("1.5"), True)}
+
+
+def test_background_compaction_keeps_concurrent_writes(tmp_path):
+    async def run():
+        repository = await _open(tmp_path, compact_after=5)
+        await asyncio.gather(*(repository.add_user(_user(n)) for n in range(40)))
+        stores = [await repository.add_store(_store(n)) for n in range(10)]
+        for store in stores:
+            await repository.update_store(store.id, is_open=False)
+        await repository.close()
+        return await _reopened_state(tmp_path)
+
+    state = asyncio.run(run())
+    assert state["users"] == 40
+    assert state["store_count"] == 10
+    assert all(not is_open for _, is_open in state["stores"].values())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Build-time OpenAPI schema tests: the cached file is served only while its
+fingerprint matches the running app.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from app.core.openapi import FINGERPRINT_KEY, fingerprint, use_cached_openapi, write_schema
+
+ROOT = Path(__file__).resolve().parent
+
+
+class Item(BaseModel):
+    name: str
+
+
+def _app() -> FastAPI:
+    app = FastAPI(title="Test", version="1.0.0")
+
+    @app.post("/items", response_model=Item)
+    async def create_item(item: Item):
+        return item
+
+    return app
+
+
+def test_matching_file_is_served_without_the_fingerprint(tmp_path):
+    path = tmp_path / "openapi.json"
+    write_schema(_app(), path)
+    schema = json.loads(path.read_text())
+    schema["info"]["description"] = "from disk"
+    path.write_text(json.dumps(schema))
+
+    app = _app()
+    use_cached_openapi(app, path)
+    served = app.openapi()
+    assert served["info"]["description"] == "from disk"
+    assert FINGERPRINT_KEY not in served
+
+
+def test_stale_file_is_regenerated(tmp_path):
+    path = tmp_path / "openapi.json"
+    write_schema(_app(), path)
+    schema = json.loads(path.read_text())
+    schema[FINGERPRINT_KEY] = "0" * 64
+    schema["info"]["description"] = "from disk"
+    path.write_text(json.dumps(schema))
+
+    app = _app()
+    use_cached_openapi(app, path)
+    assert "description" not in app.openapi()["info"]
+
+
+def test_missing_file_is_regenerated(tmp_path):
+    app = _app()
+    use_cached_openapi(app, tmp_path / "missing.json")
+    assert "/items" in app.openapi()["paths"]
+
+
+def test_route_changes_change_the_fingerprint():
+    app, changed = _app(), _app()
+
+    @changed.get("/items/{name}", response_model=Item)
+    async def get_item(name: str):
+        return Item(name=name)
+
+    assert fingerprint(app) == fingerprint(_app())
+    assert fingerprint(app) != fingerprint(changed)
+    assert fingerprint(app) != fingerprint(FastAPI(title="Test", version="1.0.1"))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_schema_built_from_module_is_used_by_the_script(tmp_path):
+    """The image builds from ``railway_main:app`` but runs ``python railway_main.py``."""
+    path = tmp_path / "openapi.json"
+    subprocess.run(
+        [sys.executable, "-m", "app.core.openapi", "railway_main:app", str(path)], cwd=ROOT, check=True
+    )
+    schema = json.loads(path.read_text())
+    schema["info"]["description"] = "from build"
+    path.write_text(json.dumps(schema))
+
+    port = _free_port()
+    env = {**os.environ, "PORT": str(port), "OPENAPI_SCHEMA_FILE": str(path), "DEMO_DATA_DIR": ""}
+    server = subprocess.Popen(
+        [sys.executable, "railway_main.py"], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/openapi.json", timeout=5) as response:
+                    served = json.load(response)
+                break
+            except OSError:
+                assert server.poll() is None and time.monotonic() < deadline, "server did not start"
+                time.sleep(0.2)
+    finally:
+        server.terminate()
+        server.wait(10)
+
+    assert served["info"]["description"] == "from build"
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Connection pool tests.
+
+``InstrumentedAsyncPool.resize`` and ``validate_idle`` work on private
+``QueuePool`` state, which is why SQLAlchemy is pinned in requirements.txt.
+These tests fail first when an upgrade moves that state, and check resizing
+against a pool of plain in-memory connections (no database needed).
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.pool import InstrumentedAsyncPool
+
+
+class Connection:
+    closed = False
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _pool(size: int, max_overflow: int) -> InstrumentedAsyncPool:
+    return InstrumentedAsyncPool(Connection, pool_size=size, max_overflow=max_overflow, timeout=0.01)
+
+
+def _in_greenlet(fn):
+    return asyncio.run(greenlet_spawn(fn))
+
+
+def test_queue_pool_internals_exist():
+    def run():
+        pool = _pool(2, 3)
+        pool.connect().close()  # creates the lazy asyncio.Queue
+        assert isinstance(pool._pool.maxsize, int)
+        assert isinstance(pool._pool._queue._maxsize, int)
+        assert isinstance(pool._max_overflow, int)
+        assert isinstance(pool._overflow, int)
+        with pool._overflow_lock:
+            pass
+        assert callable(pool._dec_overflow)
+        assert callable(pool._do_return_conn)
+        assert callable(pool._dialect._do_ping_w_event)
+
+    _in_greenlet(run)
+
+
+def test_shrinking_closes_idle_connections_and_keeps_the_limit():
+    def run():
+        pool = _pool(5, 5)
+        held = [pool.connect() for _ in range(5)]
+        raw = [connection.dbapi_connection for connection in held]
+        for connection in held:
+            connection.close()
+        assert pool.checkedin() == 5
+
+        pool.resize(2)
+        assert pool.size() == 2
+        assert pool.checkedin() == 2
+        assert sum(connection.closed for connection in raw) == 3
+        assert pool._max_overflow == 8
+
+        # Still 10 connections at most
+        held = [pool.connect() for _ in range(10)]
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+        for connection in held:
+            connection.close()
+        assert pool.checkedin() == 2
+
+    _in_greenlet(run)
+
+
+def test_growing_keeps_more_idle_connections():
+    def run():
+        pool = _pool(2, 8)
+        pool.connect().close()
+        pool.resize(6)
+        assert pool.size() == 6
+        assert pool._max_overflow == 4
+
+        held = [pool.connect() for _ in range(6)]
+        for connection in held:
+            connection.close()
+        assert pool.checkedin() == 6
+
+    _in_greenlet(run)
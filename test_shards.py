@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Store sharding tests.
+
+Routing, merging and the shard schema are checked without a database. The
+fan-out tests need several local PostgreSQL databases (they may live on the
+same server) and are skipped unless ``TEST_SHARD_DATABASE_URLS`` lists them:
+
+    createdb collique_shard_a && createdb collique_shard_b
+    TEST_SHARD_DATABASE_URLS=postgresql://postgres@localhost/collique_shard_a,postgresql://postgres@localhost/collique_shard_b \\
+        pytest test_shards.py
+"""
+import asyncio
+import os
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (registers every table)
+from app.core.shards import ShardRouter, merge_sorted, merge_sorted_chunks, shard_for_store, shard_metadata
+from app.models import Order
+from app.models.order import PaymentMethod
+from app.services.exports import EXPORT_COLUMNS, build_export_query
+
+TEST_SHARD_DATABASE_URLS = [
+    url.strip() for url in os.getenv("TEST_SHARD_DATABASE_URLS", "").split(",") if url.strip()
+]
+SCHEMA = "shard_tests"
+
+needs_shards = pytest.mark.skipif(
+    len(TEST_SHARD_DATABASE_URLS) < 2, reason="TEST_SHARD_DATABASE_URLS needs at least two databases"
+)
+
+
+def test_stores_spread_evenly_across_shards():
+    stores = [UUID(int=random.getrandbits(128)) for _ in range(3000)]
+    counts = {name: 0 for name in ("a", "b", "c")}
+    for store_id in stores:
+        counts[shard_for_store(store_id, counts)] += 1
+    assert all(800 < count < 1200 for count in counts.values()), counts
+
+
+def test_adding_a_shard_moves_few_stores():
+    stores = [uuid4() for _ in range(3000)]
+    before = {store_id: shard_for_store(store_id, ["a", "b", "c"]) for store_id in stores}
+    after = {store_id: shard_for_store(store_id, ["a", "b", "c", "d"]) for store_id in stores}
+    moved = [store_id for store_id in stores if before[store_id] != after[store_id]]
+
+    assert all(after[store_id] == "d" for store_id in moved)
+    assert len(moved) < len(stores) * 0.33
+
+
+def test_pinned_stores_ignore_hashing():
+    store_id = uuid4()
+    hashed = shard_for_store(store_id, ["a", "b"])
+    pinned = "a" if hashed == "b" else "b"
+    assert shard_for_store(store_id, ["a", "b"], {str(store_id): pinned}) == pinned
+
+
+def test_pins_must_name_a_shard():
+    with pytest.raises(ValueError):
+        ShardRouter({"a": object()}, pins={str(uuid4()): "missing"})
+
+
+def test_merge_sorted_chunks_interleaves_streams():
+    values = sorted(random.sample(range(100_000), 5000))
+    shards = [values[index::3] for index in range(3)]
+
+    async def stream(rows, size):
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+    async def collect():
+        chunks = [chunk async for chunk in merge_sorted_chunks(
+            [stream(rows, size) for rows, size in zip(shards, (7, 100, 1000))], key=lambda value: value
+        )]
+        return [value for chunk in chunks for value in chunk]
+
+    assert asyncio.run(collect()) == values
+    assert merge_sorted(shards, key=lambda value: value) == values
+
+
+def test_shard_schema_drops_foreign_keys_to_the_directory():
+    metadata = shard_metadata(SQLModel.metadata)
+    assert "orders" in metadata.tables and "users" not in metadata.tables
+
+    targets = {
+        foreign_key.target_fullname.split(".")[0]
+        for table in metadata.tables.values()
+        for foreign_key in table.foreign_keys
+    }
+    assert targets <= set(metadata.tables)
+    assert "orders" in targets  # order_items still reference their order
+
+
+def _router() -> ShardRouter:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    return ShardRouter({
+        f"shard{index}": create_async_engine(
+            url.replace("postgresql://", "postgresql+asyncpg://"),
+            connect_args={"server_settings": {"search_path": SCHEMA}},
+        )
+        for index, url in enumerate(TEST_SHARD_DATABASE_URLS)
+    })
+
+
+async def _with_shards(check):
+    router = _router()
+    metadata = shard_metadata(SQLModel.metadata)
+    try:
+        for engine in router.engines.values():
+            async with engine.begin() as conn:
+                await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                await conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+                await conn.run_sync(metadata.create_all)
+        return await check(router)
+    finally:
+        for engine in router.engines.values():
+            async with engine.begin() as conn:
+                await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await router.dispose()
+
+
+async def _seed_orders(router: ShardRouter, stores: list[UUID], per_store: int) -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for store_number, store_id in enumerate(stores):
+        async with router.session(store_id) as db:
+            for number in range(per_store):
+                db.add(Order(
+                    order_number=f"S{store_number:03d}-{number:04d}",
+                    user_id=uuid4(),
+                    store_id=store_id,
+                    delivery_address="Av. Test 123",
+                    subtotal=Decimal("10.00"),
+                    delivery_fee=Decimal("2.00"),
+                    total=Decimal("12.00"),
+                    payment_method=PaymentMethod.CASH,
+                    created_at=start + timedelta(minutes=random.randrange(60 * 24 * 20)),
+                ))
+            await db.commit()
+
+
+@needs_shards
+def test_orders_land_on_their_store_shard_and_fan_out_counts_them_all():
+    stores = [uuid4() for _ in range(12)]
+
+    async def check(router):
+        await _seed_orders(router, stores, 25)
+
+        async def count(db):
+            return (await db.execute(select(func.count()).select_from(Order))).scalar()
+
+        counts = await router.fan_out(count)
+        assert sum(counts) == 12 * 25
+        assert sum(1 for value in counts if value) > 1
+
+        for store_id in stores:
+            async with router.session(store_id) as db:
+                owned = await db.execute(select(func.count()).where(Order.store_id == store_id))
+                assert owned.scalar() == 25
+
+    asyncio.run(_with_shards(check))
+
+
+@needs_shards
+def test_cross_shard_export_is_merged_by_created_at():
+    from app.services.exports import _stream_rows
+
+    stores = [uuid4() for _ in range(8)]
+
+    async def check(router):
+        await _seed_orders(router, stores, 40)
+        query = build_export_query(date(2025, 1, 1), date(2025, 1, 31))
+        streams = [_stream_rows(query, router.session_factories[name]) for name in router.names]
+        created_at = EXPORT_COLUMNS.index("created_at")
+        rows = [
+            row
+            async for chunk in merge_sorted_chunks(streams, key=lambda row: row[created_at])
+            for row in chunk
+        ]
+        assert len(rows) == 8 * 40
+        assert [row[created_at] for row in rows] == sorted(row[created_at] for row in rows)
+
+    asyncio.run(_with_shards(check))
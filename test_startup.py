@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Cold start budget.
+
+Each entry point is imported in a fresh interpreter under
+``python -X importtime``; the best of a few runs must stay within its
+budget, and modules that are only needed after startup (jose and its
+cryptography backend) must not be imported at all. Budgets are in
+milliseconds and can be raised on slow machines:
+
+    STARTUP_BUDGET_RAILWAY_MS=2000 pytest test_startup.py
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent
+RUNS = 3
+
+BUDGETS_MS = {
+    "railway_main": float(os.getenv("STARTUP_BUDGET_RAILWAY_MS", 1500)),
+    "app.main": float(os.getenv("STARTUP_BUDGET_APP_MS", 2000)),
+}
+
+DEFERRED_MODULES = ("jose", "cryptography")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module ``module`` loads."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", list(BUDGETS_MS))
+def test_import_within_budget(module):
+    import_times(module)  # warm the bytecode cache
+    best_ms = min(import_times(module)[module] for _ in range(RUNS)) / 1000
+    assert best_ms <= BUDGETS_MS[module], f"import {module} took {best_ms:.0f} ms"
+
+
+@pytest.mark.parametrize("module", list(BUDGETS_MS))
+def test_token_backend_is_deferred(module):
+    loaded = import_times(module)
+    assert not [name for name in loaded if name.split(".")[0] in DEFERRED_MODULES]
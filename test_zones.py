@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Delivery zone index tests: point-in-polygon and the R-tree, without a database.
+
+Polygons are ``[[lat, lng], ...]`` as stored; the tests use small integer
+coordinates so edge cases are exact.
+"""
+import random
+from uuid import uuid4
+
+from app.services.zones import DeliveryZoneIndex, PreparedZone, RTree
+
+SQUARE = [[0, 0], [0, 10], [10, 10], [10, 0]]
+# A U opening to the north: the notch between lng 4 and 6 is outside
+U_SHAPE = [[0, 0], [0, 10], [10, 10], [10, 6], [3, 6], [3, 4], [10, 4], [10, 0]]
+# A square with a square hole, traced as one ring through a zero-width bridge
+WITH_HOLE = [[0, 0], [0, 10], [10, 10], [10, 0], [5, 0], [3, 3], [7, 3], [7, 7], [3, 7], [3, 3], [5, 0]]
+
+
+def _zone(polygon, store_id=None) -> PreparedZone:
+    return PreparedZone.from_polygon(uuid4(), store_id or uuid4(), "zone", polygon)
+
+
+def _contains(zone: PreparedZone, latitude: float, longitude: float) -> bool:
+    return zone.contains(longitude, latitude)
+
+
+def test_points_inside_and_outside_a_square():
+    zone = _zone(SQUARE)
+    assert _contains(zone, 5, 5)
+    assert _contains(zone, 0.001, 9.999)
+    assert not _contains(zone, -0.001, 5)
+    assert not _contains(zone, 5, 10.001)
+    assert not _contains(zone, 20, 20)
+
+
+def test_ray_through_a_vertex_counts_once():
+    diamond = _zone([[0, 5], [5, 10], [10, 5], [5, 0]])
+    # The horizontal ray from these points passes exactly through the vertices at lat 5
+    assert _contains(diamond, 5, 5)
+    assert _contains(diamond, 5, 0.5)
+    assert not _contains(diamond, 5, -1)
+    assert not _contains(diamond, 5, 11)
+
+
+def test_concave_notch_is_outside():
+    zone = _zone(U_SHAPE)
+    assert _contains(zone, 2, 5)       # below the notch
+    assert _contains(zone, 8, 2)       # left arm
+    assert _contains(zone, 8, 8)       # right arm
+    assert not _contains(zone, 8, 5)   # inside the notch
+    assert not _contains(zone, 3.5, 5)
+
+
+def test_hole_is_outside():
+    zone = _zone(WITH_HOLE)
+    assert _contains(zone, 1, 1)
+    assert _contains(zone, 8, 5)
+    assert _contains(zone, 5, 8.5)
+    assert not _contains(zone, 5, 5)
+    assert not _contains(zone, 4, 6)
+
+
+def test_rtree_matches_a_linear_scan():
+    rng = random.Random(7)
+    zones = []
+    for _ in range(500):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        size = rng.uniform(0.1, 5)
+        zones.append(_zone([[lat, lng], [lat, lng + size], [lat + size, lng + size], [lat + size, lng]]))
+    tree = RTree(zones, node_capacity=8)
+
+    for _ in range(500):
+        x, y = rng.uniform(-180, 180), rng.uniform(-90, 90)
+        expected = {
+            zone.zone_id for zone in zones
+            if zone.bbox[0] <= x <= zone.bbox[2] and zone.bbox[1] <= y <= zone.bbox[3]
+        }
+        assert {zone.zone_id for zone in tree.query_point(x, y)} == expected
+
+
+def test_stores_without_zones_deliver_everywhere():
+    zoned, unzoned = uuid4(), uuid4()
+    index = DeliveryZoneIndex()
+    index.load([_zone(SQUARE, zoned)])
+
+    assert index.stores_delivering_to(5, 5) == {zoned}
+    assert index.is_deliverable(zoned, 5, 5)
+    assert not index.is_deliverable(zoned, 50, 50)
+    assert index.is_deliverable(unzoned, 50, 50)
+    assert index.zoned_stores == {zoned}